@@ -0,0 +1,97 @@
+'''Case entries — «все появления строк дел одним набором массивов»
+
+Общий вход для индексов по делам (CaseTimeline — история
+номера дела, CaseTextIndex — поиск по тексту строк):
+
+strings        — строки дел без повторов
+string_ids     int64 — строка появления (номер в strings)
+weeks          int32 — позиция недели (порядок pkl)
+judges         int32 — номер в judge_names
+categories     int32 — номер в category_names
+
+Одна позиция массивов — одно появление строки в ячейке
+(неделя, судья, категория). CaseStore отдаёт такие массивы
+прямо из своих ячеек (CaseStore.case_entries), обычный
+raw_data — через from_raw_data.
+'''
+
+import numpy as np
+
+from app.domain.count_cube import CASE_LIST_TYPES
+
+
+class CaseEntries:
+    def __init__(self, strings, string_ids, weeks, judges, categories,
+                 week_keys, judge_names, category_names):
+        self.strings = strings
+        self.string_ids = np.asarray(string_ids, dtype=np.int64)
+        self.weeks = np.asarray(weeks, dtype=np.int32)
+        self.judges = np.asarray(judges, dtype=np.int32)
+        self.categories = np.asarray(categories, dtype=np.int32)
+
+        self.week_keys = list(week_keys)
+        self.judge_names = list(judge_names)
+        self.category_names = list(category_names)
+
+    @classmethod
+    def from_raw_data(cls, raw_data):
+        """raw_data из pkl: {week: {judge: {category: [дела]}}}"""
+        strings, string_pos = [], {}
+        judge_names, judge_pos = [], {}
+        category_names, category_pos = [], {}
+
+        string_ids, weeks, judges, categories = [], [], [], []
+
+        for w, week_data in enumerate(raw_data.values()):
+            for judge, judge_data in week_data.items():
+                j = judge_pos.setdefault(judge, len(judge_pos))
+                if j == len(judge_names):
+                    judge_names.append(judge)
+
+                for category, cases in judge_data.items():
+                    c = category_pos.setdefault(category, len(category_pos))
+                    if c == len(category_names):
+                        category_names.append(category)
+
+                    if not isinstance(cases, CASE_LIST_TYPES):
+                        continue
+
+                    for case in cases:
+                        s = string_pos.setdefault(case, len(string_pos))
+                        if s == len(strings):
+                            strings.append(case)
+
+                        string_ids.append(s)
+                        weeks.append(w)
+                        judges.append(j)
+                        categories.append(c)
+
+        return cls(
+            strings, string_ids, weeks, judges, categories,
+            raw_data.keys(), judge_names, category_names,
+        )
+
+    def __len__(self):
+        return len(self.string_ids)
+
+    def week_rank(self, week_index=None):
+        """
+        позиция недели → номер по датам (WeekIndex);
+        неразобранные — в конце, по порядку pkl
+        """
+        rank = np.arange(len(self.week_keys), dtype=np.int64)
+
+        if week_index is None:
+            return rank
+
+        dated = {key: n for n, key in enumerate(week_index.sorted_keys)}
+        undated = len(dated)
+
+        for w, key in enumerate(self.week_keys):
+            n = dated.get(key)
+            if n is None:
+                n = undated
+                undated += 1
+            rank[w] = n
+
+        return rank
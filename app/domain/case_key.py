@@ -0,0 +1,15 @@
+'''Case key — «номер дела из строки дела»
+
+Строка дела: "2-123/2025, истец ..., ответчик ...".
+Номер дела — часть до первой запятой; по нему дела
+сравниваются между категориями и неделями (приостановленные
+в остатке, пришедшие / ушедшие дела, история дела).
+'''
+
+
+def extract_case_key(raw: str) -> str:
+    """Номер дела — часть строки до первой запятой"""
+    raw = raw.strip()
+    if "," in raw:
+        return raw.split(",", 1)[0].strip()
+    return raw
@@ -0,0 +1,197 @@
+'''Case search — «поиск по тексту всех строк дел»
+
+Найти сторону по фамилии или дело по части номера — раньше
+только прокруткой детализации. CaseTextIndex — по всем
+строкам дел одного pkl (CaseEntries):
+
+триграммы  — «ива» → номера строк, где она есть (int32 по возрастанию)
+появления  — строка → (неделя, судья, категория), как CSR:
+             внутри строки новые недели первыми
+
+search(text) — строки со всеми триграммами запроса (пересечение
+от самого короткого списка), затем проверка подстрокой.
+Регистр не важен. Запрос короче трёх символов — проверка
+всех строк подряд.
+
+Триграммы — это секунды на большом pkl, поэтому индекс строится
+не при загрузке суда, а при первом поиске (в фоне, своим потоком);
+в режиме «Все суды» — по индексу на суд, search_courts сводит их.
+'''
+
+from array import array
+from datetime import date
+
+import numpy as np
+
+from app.domain.week_index import parse_week_key
+
+
+GRAM = 3
+HIT_LIMIT = 200
+
+_CHECK_EVERY = 4096  # строк между проверками отмены при построении
+
+
+class CaseHit:
+    """Одно появление найденной строки дела"""
+
+    __slots__ = ("court", "week", "judge", "category", "case")
+
+    def __init__(self, court, week, judge, category, case):
+        self.court = court
+        self.week = week
+        self.judge = judge
+        self.category = category
+        self.case = case
+
+
+class CaseTextIndex:
+    def __init__(self, entries, week_index=None, court=None, token=None):
+        """
+        entries    — CaseEntries
+        week_index — WeekIndex (новые недели первыми); без него — порядок pkl
+        court      — суд в CaseHit
+        token      — CancelToken: проверяется при построении триграмм
+        """
+        self.court = court
+        self.strings = entries.strings
+        self.week_keys = entries.week_keys
+        self.judge_names = entries.judge_names
+        self.category_names = entries.category_names
+
+        self._week_rank = entries.week_rank(week_index)
+
+        order = np.lexsort((
+            entries.categories,
+            entries.judges,
+            -self._week_rank[entries.weeks],
+            entries.string_ids,
+        ))
+        self._weeks = entries.weeks[order]
+        self._judges = entries.judges[order]
+        self._categories = entries.categories[order]
+
+        self._offsets = np.zeros(len(self.strings) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(entries.string_ids, minlength=len(self.strings)),
+            out=self._offsets[1:],
+        )
+
+        self._lower = [case.lower() for case in self.strings]
+        self._grams = self._build_grams(token)
+
+    def _build_grams(self, token):
+        grams = {}
+
+        for s, text in enumerate(self._lower):
+            if token is not None and not s % _CHECK_EVERY:
+                token.check()
+
+            for gram in {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}:
+                postings = grams.get(gram)
+                if postings is None:
+                    postings = grams[gram] = array("i")
+                postings.append(s)
+
+        return {
+            gram: np.frombuffer(postings, dtype=np.intc)
+            for gram, postings in grams.items()
+        }
+
+    def __len__(self):
+        return len(self.strings)
+
+    # ---------- поиск ----------
+
+    def search(self, text, limit=HIT_LIMIT):
+        """
+        (hits, total): до limit появлений (новые недели первыми)
+        и сколько их всего
+        """
+        query = text.strip().lower()
+        if not query:
+            return [], 0
+
+        string_ids = self._matching_strings(query)
+        if not len(string_ids):
+            return [], 0
+
+        starts = self._offsets[string_ids]
+        counts = self._offsets[string_ids + 1] - starts
+
+        # все появления найденных строк (и чья строка)
+        owner = np.repeat(string_ids, counts)
+        found = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+
+        newest = np.argsort(-self._week_rank[self._weeks[found]], kind="stable")[:limit]
+
+        hits = [
+            CaseHit(
+                self.court,
+                self.week_keys[w],
+                self.judge_names[j],
+                self.category_names[c],
+                self.strings[s],
+            )
+            for s, w, j, c in zip(
+                owner[newest].tolist(),
+                self._weeks[found[newest]].tolist(),
+                self._judges[found[newest]].tolist(),
+                self._categories[found[newest]].tolist(),
+            )
+        ]
+
+        return hits, len(found)
+
+    def _matching_strings(self, query):
+        """Номера строк, содержащих query (по возрастанию)"""
+        if len(query) < GRAM:
+            return np.array(
+                [s for s, text in enumerate(self._lower) if query in text],
+                dtype=np.int64,
+            )
+
+        postings = []
+        for gram in {query[i:i + GRAM] for i in range(len(query) - GRAM + 1)}:
+            found = self._grams.get(gram)
+            if found is None:
+                return np.empty(0, dtype=np.int64)
+            postings.append(found)
+
+        postings.sort(key=len)
+
+        string_ids = postings[0]
+        for found in postings[1:]:
+            string_ids = np.intersect1d(string_ids, found, assume_unique=True)
+            if not len(string_ids):
+                break
+
+        string_ids = string_ids.astype(np.int64)
+
+        # все триграммы есть — но не обязательно подряд
+        if len(query) > GRAM:
+            string_ids = string_ids[[query in self._lower[s] for s in string_ids.tolist()]]
+
+        return string_ids
+
+
+def search_courts(indexes, text, limit=HIT_LIMIT):
+    """search по нескольким индексам (судам): (hits, total), новые недели первыми"""
+    hits, total = [], 0
+
+    for index in indexes:
+        court_hits, court_total = index.search(text, limit)
+        hits += court_hits
+        total += court_total
+
+    if len(indexes) > 1:
+        hits.sort(key=lambda hit: _week_start(hit.week), reverse=True)
+
+    return hits[:limit], total
+
+
+def _week_start(week_key):
+    try:
+        return parse_week_key(week_key)[0]
+    except ValueError:
+        return date.min
@@ -0,0 +1,187 @@
+'''Case timeline — «где было дело все недели pkl»
+
+Вопрос «когда дело 2-1234/2025 попало в категорию у судьи
+и когда из неё ушло» — раньше это ручной обход всех недель.
+
+CaseTimeline — номер дела → все появления (неделя, судья, категория).
+Хранится компактно, как CSR:
+
+keys        — номера дел по алфавиту (поиск по началу номера — bisect)
+offsets     int64 [дел + 1] — появления дела k: [offsets[k], offsets[k + 1])
+weeks       int32 — позиция недели (week_index)
+judges      int32 — номер в judge_names
+categories  int32 — номер в category_names
+
+Внутри дела появления отсортированы по датам недель, затем
+по судье и категории — history() и spans() ничего не сортируют.
+
+Строится из CaseEntries (все появления строк дел): номер
+дела разбирается один раз на уникальную строку.
+'''
+
+from bisect import bisect_left
+
+import numpy as np
+
+from app.domain.case_entries import CaseEntries
+from app.domain.case_key import extract_case_key
+
+
+SEARCH_LIMIT = 50
+
+
+class CaseSpan:
+    """Дело подряд идущие недели у судьи в категории"""
+
+    __slots__ = ("judge", "category", "first_week", "last_week", "weeks")
+
+    def __init__(self, judge, category, first_week, last_week, weeks):
+        self.judge = judge
+        self.category = category
+        self.first_week = first_week  # позиция недели
+        self.last_week = last_week
+        self.weeks = weeks            # сколько недель подряд
+
+
+class CaseTimeline:
+    def __init__(self, keys, offsets, weeks, judges, categories,
+                 week_keys, judge_names, category_names, week_rank):
+        self.keys = keys
+        self.offsets = offsets
+        self.weeks = weeks
+        self.judges = judges
+        self.categories = categories
+
+        self.week_keys = week_keys
+        self.judge_names = judge_names
+        self.category_names = category_names
+        self.week_rank = week_rank  # позиция недели → номер по датам
+
+        self._key_pos = {key: k for k, key in enumerate(keys)}
+
+    # ---------- построение ----------
+
+    @classmethod
+    def from_case_entries(cls, entries, week_index=None):
+        """
+        entries — CaseEntries; week_index (WeekIndex) — чтобы
+        упорядочить недели по датам (без него — порядок pkl)
+        """
+        week_rank = entries.week_rank(week_index)
+
+        # строка → номер дела (разные строки одного дела — один номер)
+        string_keys = [extract_case_key(case) for case in entries.strings]
+        case_keys = sorted(set(string_keys))
+        key_pos = {key: k for k, key in enumerate(case_keys)}
+
+        string_key_ids = np.fromiter(
+            (key_pos[key] for key in string_keys),
+            dtype=np.int64,
+            count=len(string_keys),
+        )
+
+        key_ids = string_key_ids[entries.string_ids]
+        weeks, judges, categories = entries.weeks, entries.judges, entries.categories
+
+        order = np.lexsort((categories, judges, week_rank[weeks], key_ids))
+        key_ids, weeks = key_ids[order], weeks[order]
+        judges, categories = judges[order], categories[order]
+
+        # дело дважды в одной ячейке (две строки одного номера) — одно появление
+        unique = np.ones(len(key_ids), dtype=bool)
+        unique[1:] = (
+            (key_ids[1:] != key_ids[:-1])
+            | (weeks[1:] != weeks[:-1])
+            | (judges[1:] != judges[:-1])
+            | (categories[1:] != categories[:-1])
+        )
+
+        offsets = np.zeros(len(case_keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key_ids[unique], minlength=len(case_keys)), out=offsets[1:])
+
+        return cls(
+            case_keys,
+            offsets,
+            weeks[unique],
+            judges[unique],
+            categories[unique],
+            entries.week_keys,
+            entries.judge_names,
+            entries.category_names,
+            week_rank,
+        )
+
+    @classmethod
+    def from_raw_data(cls, raw_data, week_index=None):
+        """raw_data из pkl: {week: {judge: {category: [дела]}}}"""
+        return cls.from_case_entries(CaseEntries.from_raw_data(raw_data), week_index)
+
+    # ---------- запросы ----------
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._key_pos
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """Номера дел: точное совпадение — первым, дальше по началу номера"""
+        text = extract_case_key(text)
+        if not text:
+            return []
+
+        found = [text] if text in self._key_pos else []
+
+        i = bisect_left(self.keys, text)
+        while i < len(self.keys) and len(found) < limit and self.keys[i].startswith(text):
+            if self.keys[i] != text:
+                found.append(self.keys[i])
+            i += 1
+
+        return found
+
+    def history(self, key):
+        """[(позиция недели, судья, категория)] по датам недель"""
+        k = self._key_pos.get(key)
+        if k is None:
+            return []
+
+        start, end = self.offsets[k], self.offsets[k + 1]
+
+        return [
+            (w, self.judge_names[j], self.category_names[c])
+            for w, j, c in zip(
+                self.weeks[start:end].tolist(),
+                self.judges[start:end].tolist(),
+                self.categories[start:end].tolist(),
+            )
+        ]
+
+    def spans(self, key):
+        """
+        [CaseSpan] — когда дело вошло в категорию у судьи и когда
+        вышло: подряд идущие недели (по датам) склеены в один отрезок.
+        Отрезки — по дате входа.
+        """
+        runs = {}  # (судья, категория) → [[первая, последняя, ранг последней, недель]]
+
+        for w, judge, category in self.history(key):
+            rank = int(self.week_rank[w])
+            judge_runs = runs.setdefault((judge, category), [])
+
+            if judge_runs and judge_runs[-1][2] == rank - 1:
+                run = judge_runs[-1]
+                run[1], run[2] = w, rank
+                run[3] += 1
+            else:
+                judge_runs.append([w, w, rank, 1])
+
+        spans = [
+            CaseSpan(judge, category, first, last, weeks)
+            for (judge, category), judge_runs in runs.items()
+            for first, last, _, weeks in judge_runs
+        ]
+        spans.sort(key=lambda span: self.week_rank[span.first_week])
+
+        return spans
+
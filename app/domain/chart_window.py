@@ -0,0 +1,170 @@
+'''Chart window — «что рисовать на графике за выбранные даты»
+
+ChartWindows(week_index).get(date_from, date_to, max_points) → ChartWindow
+
+- недели диапазона ищутся bisect'ом (WeekIndex.overlapping) один раз
+  на диапазон: окно кэшируется, перестройка графика, наведение
+  и клики берут готовое;
+- если недель больше max_points (несколько лет истории), точка
+  графика — месяц, а если и месяцев много — квартал. Точек на оси
+  не больше, чем помещается по ширине, сколько бы лет ни было в pkl.
+
+Значения недель → значение точки (aggregate):
+- потоки за неделю (processor.flows) — сумма недель периода;
+- остальное (остаток, «с начала года», «на начало года») —
+  значение последней недели периода.
+'''
+
+import numpy as np
+
+
+STEP_WEEK = "week"
+STEP_MONTH = "month"
+STEP_QUARTER = "quarter"
+
+WINDOW_CACHE_SIZE = 32
+
+_QUARTERS = ("I", "II", "III", "IV")
+
+
+def _group(end, step):
+    """Точка графика, к которой относится неделя (по дате конца недели)"""
+    if step == STEP_MONTH:
+        return end.year, end.month
+    return end.year, (end.month - 1) // 3
+
+
+def _group_label(group, step):
+    year, part = group
+    if step == STEP_MONTH:
+        return f"{part:02d}.{year}"
+    return f"{_QUARTERS[part]} кв. {year}"
+
+
+class ChartWindow:
+    """
+    Точки графика для диапазона дат.
+
+    weeks     — [(номер в sorted_keys, ключ)] недель диапазона по датам
+    positions — их позиции в CountCube
+    labels    — подписи точек на оси X
+    key       — (с, по, точек максимум) — ключ кэша окна
+    """
+
+    def __init__(self, weeks, positions, ends, step, key=None):
+        self.key = key
+        self.weeks = weeks
+        self.positions = positions
+        self.step = step
+
+        if step == STEP_WEEK:
+            self.starts = list(range(len(weeks)))
+            self.labels = [week_key[-10:] for _, week_key in weeks]
+        else:
+            self.starts = []
+            groups = []
+            for n, end in enumerate(ends):
+                group = _group(end, step)
+                if not groups or groups[-1] != group:
+                    groups.append(group)
+                    self.starts.append(n)
+            self.labels = [_group_label(group, step) for group in groups]
+
+        self.stops = self.starts[1:] + [len(weeks)]
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def aggregated(self):
+        return self.step != STEP_WEEK
+
+    def point_weeks(self, point):
+        """[(номер в sorted_keys, ключ)] недель точки"""
+        return self.weeks[self.starts[point]:self.stops[point]]
+
+    def point_week(self, point):
+        """Последняя неделя точки — к ней ведёт двойной клик по графику"""
+        return self.weeks[self.stops[point] - 1]
+
+    def value_weeks(self, point, flow):
+        """
+        Недели, из которых сложено значение точки (см. aggregate):
+        поток — все недели периода, срез — последняя
+        """
+        if flow:
+            return self.point_weeks(point)
+        return [self.point_week(point)]
+
+    def period(self, point):
+        """«начало - конец» точки: ключ недели или даты месяца / квартала"""
+        first = self.weeks[self.starts[point]][1]
+        last = self.weeks[self.stops[point] - 1][1]
+        if first == last:
+            return first
+        return f"{first.split(' - ')[0]} - {last.split(' - ')[-1]}"
+
+    def aggregate(self, values, flow):
+        """
+        Значения по неделям окна → по точкам.
+        values — список (одна линия) или [[...]] (линия на строку);
+        flow — категория-поток (сумма недель), иначе последняя неделя.
+        """
+        if not self.aggregated:
+            return values
+
+        array = np.asarray(values)
+        if not array.shape[-1]:
+            return values
+
+        if flow:
+            result = np.add.reduceat(array, self.starts, axis=-1)
+        else:
+            result = array[..., np.array(self.stops) - 1]
+
+        return result.tolist()
+
+    def aggregate_series(self, series, flow):
+        """{имя: значения по неделям} → {имя: значения по точкам}"""
+        if not self.aggregated or not series:
+            return series
+
+        values = self.aggregate(list(series.values()), flow)
+        return dict(zip(series, values))
+
+
+class ChartWindows:
+    """Окна графика одного pkl — кэш по (с, по, точек максимум)"""
+
+    def __init__(self, week_index):
+        self.week_index = week_index
+        self._cache = {}
+
+    def get(self, date_from, date_to, max_points):
+        key = (date_from, date_to, max_points)
+        window = self._cache.get(key)
+
+        if window is None:
+            window = self._build(key)
+
+            if len(self._cache) >= WINDOW_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = window
+
+        return window
+
+    def _build(self, key):
+        date_from, date_to, max_points = key
+        index = self.week_index
+        numbers = index.overlapping(date_from, date_to)
+
+        weeks = [(i, index.sorted_keys[i]) for i in numbers]
+        positions = [index.sorted_positions[i] for i in numbers]
+        ends = [index.ends[i] for i in numbers]
+
+        for step in (STEP_WEEK, STEP_MONTH, STEP_QUARTER):
+            window = ChartWindow(weeks, positions, ends, step, key)
+            if len(window) <= max_points:
+                break
+
+        return window
@@ -0,0 +1,180 @@
+'''CountCube — «сколько дел» по неделям, судьям и категориям
+
+counts int32 [неделя × судья × категория] + словари осей.
+Строится один раз на .pkl (StatisticsRepository.load_counts)
+и общий для таблицы, графика и процессоров:
+
+cube.week_matrix(w, categories) → судьи недели × нужные категории
+— процессор считает строки, итоги и производные столбцы
+срезами массива, а не циклом по словарям.
+'''
+
+import numpy as np
+
+
+# ячейка pkl со строками дел; прочие значения (число, None
+# в старых pkl) делами не считаются — как и в детализации
+CASE_LIST_TYPES = (list, tuple)
+
+
+class CountCube:
+    row_title = "Судья"  # заголовок первого столбца таблицы (строки = судьи)
+
+    def __init__(self, weeks, judges, categories, counts, week_order, week_offsets):
+        self.weeks = list(weeks)
+        self.judges = list(judges)
+        self.categories = list(categories)
+
+        self.counts = counts              # int32 [week, judge, category]
+        self.week_order = week_order      # int32 — индексы судей по неделям подряд
+        self.week_offsets = week_offsets  # int64 [weeks + 1]
+
+        self._week_pos = {w: i for i, w in enumerate(self.weeks)}
+        self._judge_pos = {j: i for i, j in enumerate(self.judges)}
+        self._category_pos = {c: i for i, c in enumerate(self.categories)}
+
+    # ---------- построение ----------
+
+    @classmethod
+    def from_raw_data(cls, raw_data):
+        weeks = list(raw_data.keys())
+
+        judges = []
+        judge_pos = {}
+        categories = []
+        category_pos = {}
+
+        for week_data in raw_data.values():
+            for judge, judge_data in week_data.items():
+                if judge not in judge_pos:
+                    judge_pos[judge] = len(judges)
+                    judges.append(judge)
+
+                for category in judge_data:
+                    if category not in category_pos:
+                        category_pos[category] = len(categories)
+                        categories.append(category)
+
+        counts = np.zeros((len(weeks), len(judges), len(categories)), dtype=np.int32)
+        week_order = []
+        week_offsets = [0]
+
+        for w, week_data in enumerate(raw_data.values()):
+            for judge, judge_data in week_data.items():
+                j = judge_pos[judge]
+                week_order.append(j)
+
+                for category, cases in judge_data.items():
+                    if isinstance(cases, CASE_LIST_TYPES):
+                        counts[w, j, category_pos[category]] = len(cases)
+
+            week_offsets.append(len(week_order))
+
+        return cls(
+            weeks, judges, categories, counts,
+            np.array(week_order, dtype=np.int32),
+            np.array(week_offsets, dtype=np.int64),
+        )
+
+    # ---------- доступ ----------
+
+    def keys(self):
+        return list(self.weeks)
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def __contains__(self, week_key):
+        return week_key in self._week_pos
+
+    def week_position(self, week_key):
+        return self._week_pos[week_key]
+
+    def week_judges(self, week_index):
+        """Судьи недели в том же порядке, что и в pkl"""
+        start, end = self.week_offsets[week_index], self.week_offsets[week_index + 1]
+        return [self.judges[j] for j in self.week_order[start:end]]
+
+    def count(self, week_index, judge, category):
+        j = self._judge_pos.get(judge)
+        c = self._category_pos.get(category)
+        if j is None or c is None:
+            return 0
+        return int(self.counts[week_index, j, c])
+
+    def category_counts(self, week_index, category):
+        """{judge: count} для всех судей недели"""
+        c = self._category_pos.get(category)
+        judges = self.week_judges(week_index)
+        if c is None:
+            return {judge: 0 for judge in judges}
+
+        column = self.counts[week_index, :, c]
+        return {judge: int(column[self._judge_pos[judge]]) for judge in judges}
+
+    def series(self, category, judges, week_positions):
+        """{judge: [count по неделям]}"""
+        c = self._category_pos.get(category)
+        result = {}
+
+        for judge in judges:
+            j = self._judge_pos.get(judge)
+            if j is None or c is None:
+                result[judge] = [0] * len(week_positions)
+            else:
+                result[judge] = self.counts[week_positions, j, c].tolist()
+
+        return result
+
+    def category_totals(self, category, week_positions):
+        """[сумма по всем судьям] по неделям"""
+        c = self._category_pos.get(category)
+        if c is None:
+            return [0] * len(week_positions)
+        return self.counts[week_positions, :, c].sum(axis=1).tolist()
+
+    def judges_in_weeks(self, week_positions, category=None):
+        """Судьи, встречающиеся в неделях (с ненулевой категорией, если задана)"""
+        if not len(week_positions):
+            return []
+
+        if category is None:
+            mask = np.zeros(len(self.judges), dtype=bool)
+            for w in week_positions:
+                start, end = self.week_offsets[w], self.week_offsets[w + 1]
+                mask[self.week_order[start:end]] = True
+        else:
+            c = self._category_pos.get(category)
+            if c is None:
+                return []
+            mask = self.counts[week_positions, :, c].any(axis=0)
+
+        return [self.judges[j] for j in np.flatnonzero(mask)]
+
+    # ---------- срезы для процессоров ----------
+
+    def category_indexes(self, categories):
+        """Позиции категорий в кубе; -1 — категории нет в данных"""
+        return np.array(
+            [self._category_pos.get(c, -1) for c in categories],
+            dtype=np.int64,
+        )
+
+    def week_matrix(self, week_index, categories):
+        """
+        (week_key, judges, matrix)
+
+        matrix int32 [судьи недели (порядок pkl) × categories];
+        отсутствующие в данных категории — нули
+        """
+        start, end = self.week_offsets[week_index], self.week_offsets[week_index + 1]
+        judge_idx = self.week_order[start:end]
+        category_idx = self.category_indexes(categories)
+
+        present = category_idx >= 0
+        matrix = np.zeros((len(judge_idx), len(category_idx)), dtype=np.int32)
+        matrix[:, present] = self.counts[week_index][np.ix_(judge_idx, category_idx[present])]
+
+        judges = [self.judges[j] for j in judge_idx.tolist()]
+
+        return self.weeks[week_index], judges, matrix
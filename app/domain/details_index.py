@@ -0,0 +1,73 @@
+'''Details index — «детализация недели без повторных обходов»
+
+Строка «Всего» показывает детализацию столбца по всем судьям.
+Индекс одной недели (для одного процессора) хранит:
+
+(judge, column) → CellDetails: списки дел (уже строки)
+                  + множество уникальных номеров дел
+column          → судьи с делами, по убыванию числа дел
+
+Ячейки считаются при первом обращении и дальше берутся
+из индекса — повторный выбор ячеек/«Всего» недели не
+обходит raw_data заново.
+'''
+
+from app.domain.case_key import extract_case_key
+
+
+class CellDetails:
+    __slots__ = ("judge", "details", "case_keys")
+
+    def __init__(self, judge, details):
+        self.judge = judge
+
+        # [(title, [строки дел])] — CaseList из mmap раскрывается один раз
+        self.details = [(title, list(values)) for title, values in details]
+
+        self.case_keys = frozenset(
+            extract_case_key(case)
+            for _, values in self.details
+            for case in values
+        )
+
+    @property
+    def case_count(self):
+        return len(self.case_keys)
+
+
+class WeekDetailsIndex:
+    def __init__(self, processor, week_index, judges):
+        self.processor = processor
+        self.week_index = week_index
+        self.judges = list(judges)  # порядок как в pkl
+
+        self._cells = {}    # (judge, column) → CellDetails
+        self._columns = {}  # column → [CellDetails]
+
+    def cell(self, judge, column):
+        key = (judge, column)
+
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = CellDetails(judge, self.processor.get_cell_details(
+                judge=judge,
+                column=column,
+                week_index=self.week_index,
+            ))
+            self._cells[key] = cell
+
+        return cell
+
+    def column(self, column):
+        """Судьи, у которых в столбце есть дела — по убыванию числа дел"""
+        cells = self._columns.get(column)
+
+        if cells is None:
+            cells = [
+                cell for cell in (self.cell(judge, column) for judge in self.judges)
+                if cell.case_count
+            ]
+            cells.sort(key=lambda cell: cell.case_count, reverse=True)
+            self._columns[column] = cells
+
+        return cells
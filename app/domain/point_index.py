@@ -0,0 +1,72 @@
+'''Point index — «кто стоит за точкой графика»
+
+Клик по точке графика — это вопрос «у каких судей ровно N дел
+категории на этой неделе». Вместо обхода всех судей на каждый клик:
+
+PointIndex(counts, weeks) — одна точка (неделя / месяц / квартал) и категория:
+counts          — {судья: значение} (порядок pkl)
+weeks           — ключи недель, из которых сложено значение:
+                  поток за месяц / квартал — все недели периода,
+                  срез — только последняя (детализация берёт дела
+                  ровно этих недель, и их число сходится со значением)
+judges_with(n)  — судьи ровно с n делами — поиск в словаре
+judges          — судьи с делами (порядок pkl)
+ranked          — они же по убыванию числа дел
+
+Строится при первом клике по точке и лежит в кэше графика
+рядом с сериями; в сигнал point_clicked уходит готовым — панель
+детализации не пересчитывает судей заново.
+
+WeekCases(week_data) — category → judge → строки дел одной недели
+(уже без префикса «2.123-») для панели детализации.
+'''
+
+import re
+
+
+_CASE_PREFIX_RE = re.compile(r"\d\.\d{3}-")
+
+
+def normalize_case_line(raw):
+    """
+    Удаляет ТОЛЬКО префикс вида '2.123-' (цифра + точка + 3 цифры + дефис).
+    Если такого шаблона нет — строка возвращается без изменений.
+    """
+    return _CASE_PREFIX_RE.sub("", raw, count=1)
+
+
+class PointIndex:
+    def __init__(self, counts, weeks=()):
+        self.counts = counts
+        self.weeks = list(weeks)
+
+        self._by_count = {}
+        for judge, count in counts.items():
+            self._by_count.setdefault(count, []).append(judge)
+
+        self.judges = [judge for judge, count in counts.items() if count > 0]
+        self.ranked = sorted(self.judges, key=counts.__getitem__, reverse=True)
+
+    @classmethod
+    def from_week(cls, cube, week_index, category, week_key):
+        return cls(cube.category_counts(week_index, category), [week_key])
+
+    def judges_with(self, count):
+        return self._by_count.get(count, [])
+
+
+class WeekCases:
+    def __init__(self, week_data):
+        self._week_data = week_data  # {judge: {category: [дела]}}
+        self._lines = {}             # category → {judge: [строки]}
+
+    def lines(self, category, judge):
+        by_judge = self._lines.setdefault(category, {})
+
+        lines = by_judge.get(judge)
+        if lines is None:
+            cases = self._week_data.get(judge, {}).get(category, [])
+            lines = [normalize_case_line(case) for case in cases]
+            by_judge[judge] = lines
+
+        return lines
@@ -0,0 +1,170 @@
+'''RegionCube — «все суды области в одном кубе»
+
+Один и тот же тип .pkl (например, result4_with_2.pkl)
+из папок всех судов складывается в один CountCube:
+
+counts int32 [неделя × (суд, судья) × категория]
+
+- недели — объединение недель всех судов, по датам;
+- судья — пара (суд, судья): однофамильцы из разных
+  судов не складываются; подпись — "Суд / Судья";
+- категории — объединение категорий всех судов.
+
+by_court() — тот же куб, свёрнутый по судьям:
+[неделя × суд × категория]. Процессоры строят по нему
+сводную таблицу, где строки — суды (row_title = "Суд").
+'''
+
+import numpy as np
+
+from app.domain.count_cube import CountCube
+from app.domain.week_index import WeekIndex
+
+
+COURT_COLUMN = "Суд"
+
+
+def judge_label(court, judge):
+    return f"{court} / {judge}"
+
+
+class RegionCube(CountCube):
+    def __init__(self, weeks, judges, categories, counts, week_order, week_offsets,
+                 courts, judge_courts, judge_names):
+        super().__init__(weeks, judges, categories, counts, week_order, week_offsets)
+
+        self.courts = list(courts)
+        self.judge_courts = judge_courts    # int32 [судьи] — номер суда
+        self.judge_names = list(judge_names)  # имя судьи без суда
+
+        self._by_court = None
+
+    def court_judges(self, court):
+        """Подписи судей одного суда"""
+        k = self.courts.index(court)
+        return [self.judges[j] for j in np.flatnonzero(self.judge_courts == k)]
+
+    def by_court(self):
+        """CountCube [неделя × суд × категория]; строится один раз"""
+        if self._by_court is None:
+            self._by_court = self._collapse_judges()
+        return self._by_court
+
+    def _collapse_judges(self):
+        weeks, courts, categories = len(self.weeks), len(self.courts), len(self.categories)
+
+        counts = np.zeros((weeks, courts, categories), dtype=np.int32)
+        for k in range(courts):
+            members = np.flatnonzero(self.judge_courts == k)
+            if len(members):
+                counts[:, k, :] = self.counts[:, members, :].sum(axis=1)
+
+        # суд попадает в неделю, если в ней есть хотя бы один его судья
+        week_order = []
+        week_offsets = [0]
+
+        for w in range(weeks):
+            start, end = self.week_offsets[w], self.week_offsets[w + 1]
+            present = np.unique(self.judge_courts[self.week_order[start:end]])
+            week_order.extend(present.tolist())
+            week_offsets.append(len(week_order))
+
+        cube = CountCube(
+            self.weeks, self.courts, self.categories, counts,
+            np.array(week_order, dtype=np.int32),
+            np.array(week_offsets, dtype=np.int64),
+        )
+        cube.row_title = COURT_COLUMN
+
+        return cube
+
+
+class RegionCubeBuilder:
+    """
+    Собирает RegionCube из кубов отдельных судов.
+
+    Кубы судов приходят в любом порядке (по мере загрузки);
+    общий массив выделяется один раз в build(), кубы судов
+    освобождаются по мере копирования.
+    """
+
+    def __init__(self):
+        self._cubes = {}  # суд → CountCube
+
+    def __len__(self):
+        return len(self._cubes)
+
+    def add(self, court, cube):
+        self._cubes[court] = cube
+
+    def build(self, courts=None):
+        """courts — порядок судов (по умолчанию — по алфавиту)"""
+        courts = [c for c in (courts or sorted(self._cubes)) if c in self._cubes]
+
+        weeks = self._merged_weeks(courts)
+        week_pos = {w: i for i, w in enumerate(weeks)}
+
+        categories = []
+        category_pos = {}
+        judges, judge_courts, judge_names = [], [], []
+        judge_offsets = [0]
+
+        for k, court in enumerate(courts):
+            cube = self._cubes[court]
+
+            for category in cube.categories:
+                if category not in category_pos:
+                    category_pos[category] = len(categories)
+                    categories.append(category)
+
+            for judge in cube.judges:
+                judges.append(judge_label(court, judge))
+                judge_courts.append(k)
+                judge_names.append(judge)
+
+            judge_offsets.append(len(judges))
+
+        counts = np.zeros((len(weeks), len(judges), len(categories)), dtype=np.int32)
+        week_judges = [[] for _ in weeks]
+
+        for k, court in enumerate(courts):
+            cube = self._cubes.pop(court)
+            offset = judge_offsets[k]
+
+            w_idx = np.array([week_pos[w] for w in cube.weeks], dtype=np.int64)
+            c_idx = np.array([category_pos[c] for c in cube.categories], dtype=np.int64)
+            j_idx = np.arange(offset, offset + len(cube.judges))
+
+            counts[np.ix_(w_idx, j_idx, c_idx)] = cube.counts
+
+            for w in range(len(cube.weeks)):
+                start, end = cube.week_offsets[w], cube.week_offsets[w + 1]
+                week_judges[w_idx[w]].extend((cube.week_order[start:end] + offset).tolist())
+
+        week_order = [j for week in week_judges for j in week]
+        week_offsets = np.cumsum([0] + [len(week) for week in week_judges])
+
+        return RegionCube(
+            weeks, judges, categories, counts,
+            np.array(week_order, dtype=np.int32),
+            np.asarray(week_offsets, dtype=np.int64),
+            courts,
+            np.array(judge_courts, dtype=np.int32),
+            judge_names,
+        )
+
+    def _merged_weeks(self, courts):
+        """Недели всех судов — по датам; неразобранные ключи — в конце"""
+        keys = []
+        seen = set()
+
+        for court in courts:
+            for week_key in self._cubes[court].weeks:
+                if week_key not in seen:
+                    seen.add(week_key)
+                    keys.append(week_key)
+
+        index = WeekIndex(keys)
+        dated = set(index.sorted_keys)
+
+        return index.sorted_keys + [k for k in keys if k not in dated]
@@ -0,0 +1,75 @@
+'''Week delta — «что изменилось по делам с прошлой недели»
+
+Числа (сколько стало больше / меньше) считает processor.build_delta.
+Здесь — какие именно дела пришли и ушли:
+
+WeekCaseDelta(week_data, base_week_data).category(category)
+→ {судья: CaseChanges(added, removed)}
+
+Номера дел (extract_case_key) обеих недель по категории
+собираются за один проход по всем судьям; результат
+кэшируется — повторный выбор ячеек недели не обходит
+строки дел заново.
+'''
+
+from app.domain.case_key import extract_case_key
+
+
+class CaseChanges:
+    __slots__ = ("added", "removed")
+
+    def __init__(self, added, removed):
+        self.added = added      # [номер дела] — появились в категории
+        self.removed = removed  # [номер дела] — ушли из категории
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+
+_NO_CHANGES = CaseChanges([], [])
+
+
+class WeekCaseDelta:
+    def __init__(self, week_data, base_week_data):
+        self._week_data = week_data            # {judge: {category: [дела]}}
+        self._base_week_data = base_week_data
+        self._categories = {}                  # category → {judge: CaseChanges}
+
+    def category(self, category):
+        changes = self._categories.get(category)
+
+        if changes is None:
+            changes = self._diff(category)
+            self._categories[category] = changes
+
+        return changes
+
+    def cell(self, judge, category):
+        return self.category(category).get(judge, _NO_CHANGES)
+
+    def _diff(self, category):
+        current = _case_keys(self._week_data, category)
+        base = _case_keys(self._base_week_data, category)
+
+        changes = {}
+
+        for judge in current.keys() | base.keys():
+            now = current.get(judge, frozenset())
+            before = base.get(judge, frozenset())
+
+            if now != before:
+                changes[judge] = CaseChanges(sorted(now - before), sorted(before - now))
+
+        return changes
+
+
+def _case_keys(week_data, category):
+    """{судья: номера дел категории}"""
+    keys = {}
+
+    for judge, judge_data in week_data.items():
+        cases = judge_data.get(category)
+        if cases:
+            keys[judge] = frozenset(extract_case_key(case) for case in cases)
+
+    return keys
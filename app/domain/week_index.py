@@ -0,0 +1,116 @@
+'''WeekIndex — «недели одного pkl: порядок и даты»
+
+Ключ недели — строка "01.01.2025 - 07.01.2025".
+Индекс строится один раз на загруженный pkl:
+
+keys              — ключи в порядке pkl (позиции = week_index, CountCube)
+position(key)     — позиция ключа
+sorted_positions  — позиции в порядке дат
+sorted_keys       — ключи в порядке дат
+dates(pos)        — (начало, конец) как date
+find(date)        — неделя с датой (или ближайшая) — bisect
+previous(pos)     — позиция недели, предыдущей по датам
+overlapping(a, b) — отсортированные номера недель, пересекающих [a, b]
+
+Ключи, которые не разбираются как даты, остаются в keys,
+но не участвуют в сортировке и поиске по дате.
+'''
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+DATE_FORMAT = "%d.%m.%Y"
+
+
+def parse_week_key(week_key):
+    """(start, end) как date; ValueError — если ключ не разбирается"""
+    start_str, end_str = week_key.split(" - ")
+    return (
+        datetime.strptime(start_str, DATE_FORMAT).date(),
+        datetime.strptime(end_str, DATE_FORMAT).date(),
+    )
+
+
+class WeekIndex:
+    def __init__(self, week_keys):
+        self.keys = list(week_keys)
+        self._pos = {key: i for i, key in enumerate(self.keys)}
+
+        self._dates = {}
+        for i, key in enumerate(self.keys):
+            try:
+                self._dates[i] = parse_week_key(key)
+            except ValueError:
+                continue
+
+        self.sorted_positions = sorted(self._dates, key=lambda i: self._dates[i][0])
+        self.sorted_keys = [self.keys[i] for i in self.sorted_positions]
+        self._rank = {pos: n for n, pos in enumerate(self.sorted_positions)}
+
+        # в порядке дат — для bisect
+        self.starts = [self._dates[i][0] for i in self.sorted_positions]
+        self.ends = [self._dates[i][1] for i in self.sorted_positions]
+
+        self._ends_sorted = all(a <= b for a, b in zip(self.ends, self.ends[1:]))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, position):
+        return self.keys[position]
+
+    def __contains__(self, week_key):
+        return week_key in self._pos
+
+    def position(self, week_key):
+        """Позиция недели в pkl; None — если такой нет"""
+        return self._pos.get(week_key)
+
+    def dates(self, position):
+        return self._dates.get(position)
+
+    def previous(self, position):
+        """Позиция предыдущей по датам недели; None — если это первая"""
+        rank = self._rank.get(position)
+        if not rank:
+            return None
+        return self.sorted_positions[rank - 1]
+
+    def sorted_dates(self):
+        """[(start, end)] в порядке дат"""
+        return list(zip(self.starts, self.ends))
+
+    def find(self, day):
+        """
+        Позиция недели, в которую попадает day.
+        Если такой нет — ближайшей (при равенстве — более ранней).
+        None — если дат нет вообще.
+        """
+        if not self.starts:
+            return None
+
+        i = bisect_right(self.starts, day) - 1
+
+        if i >= 0 and day <= self.ends[i]:
+            return self.sorted_positions[i]
+
+        candidates = [k for k in (i, i + 1) if 0 <= k < len(self.starts)]
+
+        def distance(k):
+            if day < self.starts[k]:
+                return (self.starts[k] - day).days
+            return (day - self.ends[k]).days
+
+        closest = min(candidates, key=distance)
+        return self.sorted_positions[closest]
+
+    def overlapping(self, date_from, date_to):
+        """Номера в sorted_keys для недель, пересекающих [date_from, date_to]"""
+        hi = bisect_right(self.starts, date_to)
+
+        if self._ends_sorted:
+            lo = bisect_left(self.ends, date_from, 0, hi)
+            return list(range(lo, hi))
+
+        return [i for i in range(hi) if self.ends[i] >= date_from]
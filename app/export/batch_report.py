@@ -0,0 +1,275 @@
+'''Batch report — «таблицы по всем судам без окна»
+
+Тот же путь, что и в MainWindow, но без Qt:
+
+StatisticsRepository.load_counts → ProcessorFactory → build
+(все недели — build_all, одним проходом) → save_table_to_word / save_table_to_excel
+
+Каждый суд обрабатывается в своём процессе (ProcessPoolExecutor):
+суды не ждут друг друга, память pkl освобождается вместе с процессом.
+
+Файлы: <out_dir>/<суд>/<специализация>_<инстанция>_<неделя>.docx|.xlsx
+
+combine=True — один .docx на суд и специализацию, в нём раздел
+на каждую неделю: <специализация>_<инстанция>_<первая>…<последняя>.docx
+(.xlsx — один файл, лист на неделю).
+'''
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from app.constants.pkl_mapping import PKL_MAPPING
+from app.domain.pkl_selector import select_pkl_for_context
+from app.domain.week_index import DATE_FORMAT, WeekIndex
+from app.export.excel_exporter import save_table_to_excel, save_weeks_to_excel
+from app.export.word_exporter import build_weeks_document, save_table_to_word
+from app.factory.processor_factory import ProcessorFactory
+from app.repository.bases_repository import BasesRepository
+from app.repository.statistics import StatisticsRepository
+
+
+FORMATS = ("docx", "xlsx")
+
+WEEKS_LAST = "last"
+WEEKS_ALL = "all"
+
+CANCEL_POLL_SECONDS = 0.2
+
+
+class ReportJob:
+    """Задание одного суда — передаётся в процесс пула"""
+
+    def __init__(self, base_dir, court, contexts, weeks, formats, out_dir, combine=False):
+        self.base_dir = base_dir
+        self.court = court
+        self.contexts = contexts  # [(specialization, instance)]
+        self.weeks = weeks        # ["last"] / ["all"] / номера / даты / ключи недель
+        self.formats = formats
+        self.out_dir = out_dir
+        self.combine = combine    # все недели — в один файл
+
+
+class ReportResult:
+    def __init__(self, court):
+        self.court = court
+        self.files = []
+        self.errors = []  # [(что, сообщение)]
+
+
+def all_contexts():
+    """Все пары (specialization, instance) из PKL_MAPPING"""
+    pairs = []
+    for info in PKL_MAPPING.values():
+        pair = (info.specialization, info.instance)
+        if pair not in pairs:
+            pairs.append(pair)
+    return pairs
+
+
+def select_weeks(week_index, selectors):
+    """
+    Позиции недель по селекторам:
+
+    "last" — последняя неделя, "all" — все недели,
+    "-2" / "5" — номер недели (отрицательный — с конца),
+    "05.03.2024" — неделя с этой датой (или ближайшая),
+    "04.03.2024 - 10.03.2024" — именно эта неделя (если есть)
+    """
+    positions = []
+
+    for selector in selectors:
+        if selector == WEEKS_ALL:
+            candidates = list(week_index.sorted_positions)
+        elif selector == WEEKS_LAST:
+            candidates = week_index.sorted_positions[-1:]
+        else:
+            candidates = [_select_week(week_index, selector)]
+
+        for pos in candidates:
+            if pos is not None and pos not in positions:
+                positions.append(pos)
+
+    return positions
+
+
+def _select_week(week_index, selector):
+    if " - " in selector:
+        return week_index.position(selector)
+
+    try:
+        day = datetime.strptime(selector, DATE_FORMAT).date()
+    except ValueError:
+        pass
+    else:
+        return week_index.find(day)
+
+    try:
+        n = int(selector)
+    except ValueError:
+        raise ValueError(f"Непонятная неделя: {selector!r}")
+
+    sorted_positions = week_index.sorted_positions
+    if not -len(sorted_positions) <= n < len(sorted_positions):
+        return None
+    return sorted_positions[n]
+
+
+def report_file_name(specialization, instance, week_key, fmt):
+    week = week_key.replace(" - ", "-").replace(" ", "_")
+    return f"{specialization}_{instance}_{week}.{fmt}"
+
+
+def combined_file_name(specialization, instance, first_week, last_week, fmt):
+    first = first_week.split(" - ")[0]
+    last = last_week.split(" - ")[-1]
+    return f"{specialization}_{instance}_{first}-{last}.{fmt}"
+
+
+def run_court(job):
+    """Все отчёты одного суда — выполняется в процессе пула"""
+    bases_repo = BasesRepository(job.base_dir)
+    stats_repo = StatisticsRepository()
+
+    result = ReportResult(job.court)
+    pkl_files = bases_repo.get_pkl_files(job.court)
+
+    court_dir = os.path.join(job.out_dir, job.court)
+
+    for specialization, instance in job.contexts:
+        pkl_name = select_pkl_for_context(pkl_files, specialization, instance)
+        if not pkl_name:
+            continue
+
+        what = f"{specialization}/{instance}"
+
+        try:
+            counts, context = stats_repo.load_counts(
+                bases_repo.get_pkl_path(job.court, pkl_name)
+            )
+            processor = ProcessorFactory.get(context)
+            week_positions = select_weeks(WeekIndex(counts.keys()), job.weeks)
+        except Exception as e:
+            result.errors.append((what, str(e)))
+            continue
+
+        if not week_positions:
+            continue
+
+        os.makedirs(court_dir, exist_ok=True)
+
+        # ошибка построения — в errors этой специализации,
+        # отчёты остальных специализаций суда не теряются
+        try:
+            tables = _week_tables(job, counts, processor, week_positions)
+
+            if job.combine:
+                _write_combined(job, result, court_dir, counts, processor,
+                                specialization, instance, week_positions, tables)
+                continue
+        except Exception as e:
+            result.errors.append((what, str(e)))
+            continue
+
+        for w in week_positions:
+            table_data = tables[w]
+
+            for fmt in job.formats:
+                path = os.path.join(
+                    court_dir,
+                    report_file_name(specialization, instance, table_data["week"], fmt)
+                )
+
+                try:
+                    if fmt == "docx":
+                        save_table_to_word(table_data, processor, job.court, path)
+                    else:
+                        save_table_to_excel(
+                            table_data, path,
+                            title=f"{job.court} ({specialization}) — {table_data['week']}"
+                        )
+                except Exception as e:
+                    result.errors.append((f"{what} {table_data['week']} {fmt}", str(e)))
+                else:
+                    result.files.append(path)
+
+    return result
+
+
+def _week_tables(job, counts, processor, week_positions):
+    """{позиция недели: table_data} — все недели одним build_all, отдельные — по одной"""
+    if WEEKS_ALL in job.weeks:
+        tables = processor.build_all(counts)["tables"]
+        return {w: tables[w] for w in week_positions}
+
+    return {w: processor.build(counts, w) for w in week_positions}
+
+
+def _write_combined(job, result, court_dir, counts, processor,
+                    specialization, instance, week_positions, tables):
+    """Все недели суда и специализации — в один файл на формат"""
+    what = f"{specialization}/{instance}"
+    title = f"{job.court} ({specialization})"
+
+    first_week = counts.weeks[week_positions[0]]
+    last_week = counts.weeks[week_positions[-1]]
+
+    for fmt in job.formats:
+        path = os.path.join(
+            court_dir,
+            combined_file_name(specialization, instance, first_week, last_week, fmt)
+        )
+
+        try:
+            if fmt == "docx":
+                week_tables = [tables[w] for w in week_positions]
+                build_weeks_document(week_tables, processor, job.court).save(path)
+            else:
+                save_weeks_to_excel(counts, processor, week_positions, path,
+                                    title=title, tables=tables)
+        except Exception as e:
+            result.errors.append((f"{what} {fmt}", str(e)))
+        else:
+            result.files.append(path)
+
+
+def generate_reports(jobs, max_workers=None, on_result=None, is_cancelled=None):
+    """
+    Выполняет задания судов в процессах.
+    on_result(ReportResult) — по мере готовности судов.
+    is_cancelled() → True — ещё не начатые суды отменяются,
+    результаты уже запущенных не ждём.
+    """
+    results = []
+
+    if not jobs:
+        return results
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(run_court, job): job.court for job in jobs}
+    pending = set(futures)
+    cancelled = False
+
+    try:
+        while pending and not cancelled:
+            # короткое ожидание — чтобы отмена срабатывала и посреди долгого суда
+            done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = ReportResult(futures[future])
+                    result.errors.append(("суд", str(e)))
+
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+            cancelled = is_cancelled is not None and is_cancelled()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=not cancelled)
+
+    return results
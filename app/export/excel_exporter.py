@@ -0,0 +1,152 @@
+'''Excel exporter — «строки сразу в файл»
+
+Книга создаётся в режиме write_only: строки листа берутся из
+итератора и сразу уходят в файл, в памяти не копятся ни ячейки,
+ни весь лист. Детализация «Всего» на десятки тысяч строк и книга
+«все недели pkl» пишутся с постоянным расходом памяти.
+
+Sheet(title, rows) — лист; rows — итератор строк (списков значений).
+Bold(value) — значение жирным шрифтом.
+'''
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from app.domain.week_index import WeekIndex
+
+
+SHEET_TITLE_MAX = 31
+_SHEET_TITLE_FORBIDDEN = str.maketrans({c: "_" for c in "[]:*?/\\"})
+
+_BOLD = Font(bold=True)
+
+
+class Bold:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Sheet:
+    def __init__(self, title, rows, freeze=None, widths=None):
+        self.title = title
+        self.rows = rows            # итератор строк
+        self.freeze = freeze        # "B4" — закрепить строки/столбцы
+        self.widths = widths or {}  # {"A": 30}
+
+
+def write_xlsx(path, sheets):
+    """Пишет листы (итератор Sheet) в .xlsx потоково"""
+    wb = Workbook(write_only=True)
+    titles = set()
+
+    for sheet in sheets:
+        ws = wb.create_sheet(title=_unique_title(sheet.title, titles))
+
+        if sheet.freeze:
+            ws.freeze_panes = sheet.freeze
+        for column, width in sheet.widths.items():
+            ws.column_dimensions[column].width = width
+
+        for row in sheet.rows:
+            ws.append([_cell(ws, value) for value in row])
+
+    # пустая книга openpyxl не сохраняет
+    if not titles:
+        wb.create_sheet()
+
+    wb.save(path)
+    return path
+
+
+def _cell(ws, value):
+    if not isinstance(value, Bold):
+        return value
+
+    cell = WriteOnlyCell(ws, value=value.value)
+    cell.font = _BOLD
+    return cell
+
+
+def _unique_title(title, titles):
+    base = str(title).translate(_SHEET_TITLE_FORBIDDEN)[:SHEET_TITLE_MAX] or "Лист"
+    title, n = base, 1
+
+    while title in titles:
+        n += 1
+        suffix = f" ({n})"
+        title = base[:SHEET_TITLE_MAX - len(suffix)] + suffix
+
+    titles.add(title)
+    return title
+
+
+# ---------- таблица (processor.build) ----------
+
+def table_sheet(table_data, sheet_title, title=None):
+    """Лист с таблицей недели: [заголовок], шапка, строки, «Всего»"""
+    header_row = 3 if title else 1
+
+    return Sheet(
+        sheet_title,
+        _table_sheet_rows(table_data, title),
+        freeze=f"B{header_row + 1}",
+        widths={"A": 30},
+    )
+
+
+def _table_sheet_rows(table_data, title):
+    if title:
+        yield [Bold(title)]
+        yield []
+
+    yield [Bold(header.replace("\n", " ")) for header in table_data["columns"]]
+
+    for values in table_data.get("rows", []):
+        yield values
+
+    if table_data.get("total"):
+        yield [Bold(value) for value in table_data["total"]]
+
+
+def save_table_to_excel(table_data, path, title=None):
+    """table_data (processor.build) → .xlsx: шапка, строки, «Всего»"""
+    return write_xlsx(path, [table_sheet(table_data, "Таблица", title)])
+
+
+def save_all_weeks_to_excel(counts, processor, path, title=None, progress=None, tables=None):
+    """
+    Все недели pkl — по листу на неделю (по датам).
+    Таблица недели строится, только когда до её листа дошла запись
+    (если нет готовых tables — processor.build_all(...)["tables"]).
+    """
+    positions = WeekIndex(counts.keys()).sorted_positions
+    return save_weeks_to_excel(counts, processor, positions, path, title, progress, tables)
+
+
+def save_weeks_to_excel(counts, processor, positions, path, title=None, progress=None, tables=None):
+    """
+    Недели с позициями positions — по листу на неделю.
+    tables — готовые таблицы по позициям недель (build_all) или None.
+    """
+
+    def sheets():
+        for n, w in enumerate(positions, start=1):
+            table_data = tables[w] if tables is not None else processor.build(counts, w)
+            week = table_data["week"]
+
+            yield table_sheet(table_data, week, f"{title} — {week}" if title else None)
+
+            if progress is not None:
+                progress(n, len(positions))
+
+    return write_xlsx(path, sheets())
+
+
+# ---------- детализация ----------
+
+def save_lines_to_excel(lines, path, title="Детализация"):
+    """Строки текста (итератор) → один столбец листа"""
+    return write_xlsx(path, [Sheet(title, ([line] for line in lines))])
@@ -1,16 +1,21 @@
 from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.section import WD_ORIENTATION
+from docx.shared import Inches
+from docx.enum.section import WD_ORIENTATION, WD_SECTION
 from datetime import datetime
-import os
 
+from app.export.docx_table import add_table
 from app.export.word_templates import WORD_district_first_TEMPLATES, WORD_TEMPLATES
 
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.shared import Pt
 
+def table_rows(table_data):
+    """Строки table_data (processor.build) + строка «Всего»"""
+    rows = list(table_data.get("rows", []))
+    if table_data.get("total"):
+        rows.append(table_data["total"])
+    return rows
 
-def export_model_to_word(model, processor, court, week):
+
+def word_template(processor):
     template_key = processor.word_template_key
     if not template_key:
         raise ValueError("У процессора не задан word_template_key")
@@ -23,14 +28,61 @@ def export_model_to_word(model, processor, court, week):
 
     tpl = templates.get(specialization)
 
-    merges = tpl.get("merge", []) if tpl else []
-
     if not tpl:
         raise ValueError(
             f"Нет Word-шаблона для specialization={specialization}, "
             f"processor={processor.__class__.__name__}"
         )
 
+    return tpl
+
+
+def build_word_document(columns, rows, processor, court, week, progress=None):
+    """
+    Документ Word с таблицей — без Qt:
+
+    columns  — заголовки столбцов
+    rows     — строки таблицы (последняя — «Всего»)
+    progress — progress(готово строк, всего строк)
+    """
+    tpl = word_template(processor)
+
+    document = new_document()
+    add_week_table(document, tpl, columns, rows, processor, court, week, progress=progress)
+
+    return document
+
+
+def build_weeks_document(tables, processor, court, progress=None):
+    """
+    Один документ на несколько недель: раздел (с новой страницы)
+    на каждую table_data из tables.
+
+    progress — progress(готово недель, всего недель)
+    """
+    tpl = word_template(processor)
+    tables = list(tables)
+
+    document = new_document()
+
+    for n, table_data in enumerate(tables, start=1):
+        if n > 1:
+            # новый раздел наследует альбомный лист и поля предыдущего
+            document.add_section(WD_SECTION.NEW_PAGE)
+
+        add_week_table(
+            document, tpl,
+            table_data["columns"], table_rows(table_data),
+            processor, court, table_data.get("week", ""),
+        )
+
+        if progress is not None:
+            progress(n, len(tables))
+
+    return document
+
+
+def new_document():
     document = Document()
 
     # --- Альбомный лист ---
@@ -42,69 +94,40 @@ def export_model_to_word(model, processor, court, week):
     for attr in ("left_margin", "right_margin", "top_margin", "bottom_margin"):
         setattr(section, attr, Inches(0.5))
 
+    return document
+
+
+def add_week_table(document, tpl, columns, rows, processor, court, week, progress=None):
+    """Заголовок недели + таблица по шаблону tpl в конец документа"""
+    specialization = processor.get_specialization()
+
     # --- Заголовок ---
     document.add_paragraph(f"{court} ({specialization}) — {week}")
 
-    rows = model.rowCount()
-    cols = model.columnCount()
-
-    table = document.add_table(rows=1, cols=cols)
-    table.style = "Table Grid"
-
-    # --- Шапка ---
-    for c in range(cols):
-        headers = tpl.get("headers") if tpl else None
-
-        for c in range(cols):
-            if headers and c < len(headers):
-                table.cell(0, c).text = headers[c]
-            else:
-                table.cell(0, c).text = model.headerData(c, 1)
-
-
-
-    # --- Данные ---
-    for r in range(rows):
-        row = table.add_row().cells
-        for c in range(cols):
-            cell = row[c]
-            cell.text = str(model.data(model.index(r, c)))
-
-            p = cell.paragraphs[0]
-
-            # 🔥 ВЫРАВНИВАНИЕ
-            if c == 0:
-                p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT  # первый столбец
-            else:
-                p.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-
-    # --- Объединения столбцов ---
-    if tpl:
-        for (r1, c1), (r2, c2), text in tpl["merge"]:
-            cell = table.cell(r1, c1)
-            cell.merge(table.cell(r2, c2))
-            cell.text = text
-
-    # Жирная первая строка
-    for cell in table.rows[0].cells:
-        for p in cell.paragraphs:
-            p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            for run in p.runs:
-                run.font.size = Pt(9)
-                run.bold = True
-
-    # --- Шрифт ---
-    for row in table.rows:
-        for cell in row.cells:
-            for run in cell.paragraphs[0].runs:
-                run.font.size = Pt(8)
-
-    # --- Жирная последняя строка ---
-    for cell in table.rows[-1].cells:
-        for run in cell.paragraphs[0].runs:
-            run.bold = True
-
-    # --- Сохранение ---
-    filename = f"big_table_{datetime.now():%d.%m.%Y.%H.%M.%S}.docx"
-    document.save(filename)
-    os.startfile(filename)
+    # --- Таблица: шапка (с объединениями из шаблона) + строки ---
+    headers = tpl.get("headers")
+
+    header = [
+        headers[c] if headers and c < len(headers) else columns[c]
+        for c in range(len(columns))
+    ]
+
+    add_table(document, header, rows, tpl["merge"], progress=progress)
+
+
+def save_table_to_word(table_data, processor, court, path, progress=None):
+    """table_data (processor.build) → .docx по пути path"""
+    document = build_word_document(
+        table_data["columns"],
+        table_rows(table_data),
+        processor,
+        court,
+        table_data.get("week", ""),
+        progress=progress,
+    )
+    document.save(path)
+    return path
+
+
+def word_file_name():
+    return f"big_table_{datetime.now():%d.%m.%Y.%H.%M.%S}.docx"
@@ -10,60 +10,74 @@ Processor — «как превратить данные в таблицу»
 посчитать
 
 вернуть структуру для таблицы
-'''
-from app.processors.gpk_first_district import GPKFirstDistrictProcessor
-from app.processors.ap1_first_district import AP1FirstDistrictProcessor
-from app.processors.kas_appeal_regional import KASAppealRegionalProcessor
-from app.processors.kas_first_regional import KASFirstRegionalProcessor
-from app.processors.m_aos_first_district import MAOSFirstDistrictProcessor
-from app.processors.u1_first_district import U1FirstDistrictProcessor
-from app.processors.m_u1_first_district import MU1FirstDistrictProcessor
-from app.processors.ap_first_district import APFirstDistrictProcessor
-from app.processors.kas_first_district import KASFirstDistrictProcessor
-
-from app.processors.gpk_first_regional import GPKFirstRegionalProcessor
-from app.processors.gpk_appeal_regional import GPKAppealRegionalProcessor
 
+Реестр:
 
+модуль процессора регистрирует класс через @register_processor(key),
+key = DataContext.as_key(). Модули импортируются только при первом
+запросе своего контекста (PROCESSOR_MODULES), экземпляр процессора
+создаётся один раз и переиспользуется.
+'''
+import importlib
 
-class ProcessorFactory:
 
-    @staticmethod
-    def get(context):
-        key = context.as_key()
+# ключ контекста → модуль процессора (импортируется лениво)
+PROCESSOR_MODULES = {
+    ("GPK", "first", "district"): "app.processors.gpk_first_district",
+    ("KAS", "first", "district"): "app.processors.kas_first_district",
+    ("AP", "first", "district"): "app.processors.ap_first_district",
+    ("AP1", "first", "district"): "app.processors.ap1_first_district",
+    ("U1", "first", "district"): "app.processors.u1_first_district",
+    ("M_U1", "first", "district"): "app.processors.m_u1_first_district",
+    ("GPK", "first", "regional"): "app.processors.gpk_first_regional",
+    ("GPK", "appeal", "regional"): "app.processors.gpk_appeal_regional",
+    ("KAS", "first", "regional"): "app.processors.kas_first_regional",
+    ("KAS", "appeal", "regional"): "app.processors.kas_appeal_regional",
+    ("M_AOS", "first", "regional"): "app.processors.m_aos_first_district",
+}
 
-        if key == ("GPK", "first", "district"):
-            return GPKFirstDistrictProcessor()
+_registry = {}   # key → класс процессора
+_instances = {}  # key → экземпляр
 
-        if key == ("KAS", "first", "district"):
-            return KASFirstDistrictProcessor()
 
-        if key == ("AP", "first", "district"):
-            return APFirstDistrictProcessor()
+def register_processor(*keys):
+    """Декоратор класса процессора: регистрирует его под ключами контекста"""
+    def decorator(cls):
+        for key in keys:
+            _registry[key] = cls
+        return cls
+    return decorator
 
-        if key == ("AP1", "first", "district"):
-            return AP1FirstDistrictProcessor()
 
-        if key == ("U1", "first", "district"):
-            return U1FirstDistrictProcessor()
+class ProcessorFactory:
 
-        if key == ("M_U1", "first", "district"):
-            return MU1FirstDistrictProcessor()
+    @staticmethod
+    def get(context):
+        """Общий экземпляр процессора для контекста"""
+        key = context.as_key()
 
-        if key == ("GPK", "first", "regional"):
-            return GPKFirstRegionalProcessor()
+        processor = _instances.get(key)
+        if processor is None:
+            processor = ProcessorFactory.processor_class(context)()
+            _instances[key] = processor
 
-        if key == ("GPK", "appeal", "regional"):
-            return GPKAppealRegionalProcessor()
+        return processor
 
-        if key == ("KAS", "first", "regional"):
-            return KASFirstRegionalProcessor()
+    @staticmethod
+    def create(context):
+        """Новый экземпляр — если нужен процессор со своим raw_data"""
+        return ProcessorFactory.processor_class(context)()
 
-        if key == ("KAS", "appeal", "regional"):
-            return KASAppealRegionalProcessor()
+    @staticmethod
+    def processor_class(context):
+        key = context.as_key()
 
-        if key == ("M_AOS", "first", "regional"):
-            return MAOSFirstDistrictProcessor()
+        cls = _registry.get(key)
+        if cls is None and key in PROCESSOR_MODULES:
+            importlib.import_module(PROCESSOR_MODULES[key])
+            cls = _registry.get(key)
 
+        if cls is None:
+            raise ValueError("Нет процессора для контекста: %s" % (key,))
 
-        raise ValueError("Нет процессора для контекста: %s" % (key,))
+        return cls
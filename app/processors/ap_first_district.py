@@ -1,6 +1,9 @@
+from app.factory.processor_factory import register_processor
 from app.processors.base import BaseProcessor
+from app.processors.columns import Count, Pair
 
 
+@register_processor(("AP", "first", "district"))
 class APFirstDistrictProcessor(BaseProcessor):
     """
     АП — 1 инстанция — районный суд
@@ -8,182 +11,90 @@ class APFirstDistrictProcessor(BaseProcessor):
     word_template_key = "district_first"
     specialization = "AP"
 
-    COLUMN_TO_CATEGORY = {
-        # Служебный столбец
-        "Судья": None,
-
-        # Рассмотрено
-        "Рассм.\nза неделю":
-            "Рассмотрено за неделю",
-
-        "Рассм.\nс начала года":
-            "Рассмотрено с начала года",
-
-        # Рассмотрено с нарушением срока
-        "Рассм. с наруш.\nсрока в неделю":
-            "Рассмотрено с нарушением за неделю",
-
-        "Наруш. с наруш.\nсрока с начала года":
-            "Рассмотрено с нарушением с начала года",
-
-        # Передано
-        "Передано\nза неделю":
-            "Передано за неделю",
-
-        "Передано\nс начала года":
-            "Передано с начала года",
-
-        # Остаток
-        "Остаток":
-            "Остаток",
-
-        # Сроки рассмотрения (основные)
-        "От 2 до 6 месяцев\nсейчас (в тек. году)":
-            "От 2 до 6 месяцев",
-
-        "От 6 месяцев\nдо 1 года":
-            "От 6 месяцев до 1 года",
-
-        "От 1 года\nдо 2 лет":
-            "От 1 года до 2 лет",
-
-        "Свыше двух лет (всего/год)":
-            "Свыше двух лет",
-
-        # Канцелярия
-        "Не сдано в канц.\nсвыше срока":
-            "Не сдано в канц. свыше срока",
-
-        "Нарушений сдачи в канц.\nс нач. года":
-            "Нарушений сдачи в канц. с нач. года",
-    }
-
-    COLUMN_TO_INCLUDED_CATEGORY = {
-        "От 2 до 6 месяцев\nсейчас (в тек. году)":
-            "От 2 до 6 месяцев (рассмотренные в текущем году)",
-
-        "От 6 месяцев\nдо 1 года":
-            "От 6 месяцев до 1 года (рассмотренные в текущем году)",
-
-        "От 1 года\nдо 2 лет":
-            "От 1 года до 2 лет (рассмотренные в текущем году)",
-
-        "Свыше двух лет (всего/год)":
-            "Свыше двух лет (рассмотренные в текущем году)",
-    }
-
-    def __init__(self):
-        self.columns = [
-            "Судья",
-            "Рассм.\nза неделю",
-            "Рассм.\nс начала года",
-            "Рассм. с наруш.\nсрока в неделю",
-            "Наруш. с наруш.\nсрока с начала года",
-            "Передано\nза неделю",
-            "Передано\nс начала года",
-            "Остаток",
+    # категории, которые реально лежат в pkl
+    categories = [
+        "Рассмотрено за неделю",
+        "Рассмотрено с начала года",
+        "Рассмотрено с нарушением за неделю",
+        "Рассмотрено с нарушением с начала года",
+        "Передано за неделю",
+        "Передано с начала года",
+        "Остаток",
+        "От 2 до 6 месяцев",
+        "От 2 до 6 месяцев (рассмотренные в текущем году)",
+        "От 6 месяцев до 1 года",
+        "От 6 месяцев до 1 года (рассмотренные в текущем году)",
+        "От 1 года до 2 лет",
+        "От 1 года до 2 лет (рассмотренные в текущем году)",
+        "Свыше двух лет",
+        "Свыше двух лет (рассмотренные в текущем году)",
+        "Не сдано в канц. свыше срока",
+        "Нарушений сдачи в канц. с нач. года",
+    ]
+
+    # потоки за неделю: точка графика за месяц / квартал — сумма недель
+    flows = [
+        "Рассмотрено за неделю",
+        "Рассмотрено с нарушением за неделю",
+        "Передано за неделю",
+    ]
+
+    # порядок столбцов = порядок значений в строке (после "Судья")
+    COLUMNS = [
+        Count(
+            "Рассм.\nза неделю", "Рассмотрено за неделю",
+            tooltip="Количество рассмотренных\nдел за отчётную неделю",
+        ),
+        Count(
+            "Рассм.\nс начала года", "Рассмотрено с начала года",
+            tooltip="Количество рассмотренных\nдел с начала календарного года",
+        ),
+        Count(
+            "Рассм. с наруш.\nсрока в неделю", "Рассмотрено с нарушением за неделю",
+            tooltip="Количество дел, рассмотренных\nс нарушением срока за неделю",
+        ),
+        Count(
+            "Наруш. с наруш.\nсрока с начала года", "Рассмотрено с нарушением с начала года",
+            tooltip="Количество дел, рассмотренных\nс нарушением срока с начала года",
+        ),
+        Count(
+            "Передано\nза неделю", "Передано за неделю",
+            tooltip="Количество дел, переданных\nсудье за неделю",
+        ),
+        Count(
+            "Передано\nс начала года", "Передано с начала года",
+            tooltip="Количество дел, переданных\nсудье с начала года",
+        ),
+        Count(
+            "Остаток", "Остаток",
+            tooltip="Остаток дел на конец\nотчётной недели",
+        ),
+        Pair(
             "От 2 до 6 месяцев\nсейчас (в тек. году)",
+            "От 2 до 6 месяцев", "От 2 до 6 месяцев (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения от 2 до 6 месяцев:\nкол-во таких дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Pair(
             "От 6 месяцев\nдо 1 года",
+            "От 6 месяцев до 1 года", "От 6 месяцев до 1 года (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения от 6 месяцев до 1 года:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Pair(
             "От 1 года\nдо 2 лет",
+            "От 1 года до 2 лет", "От 1 года до 2 лет (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения от 1 года до 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Pair(
             "Свыше двух лет (всего/год)",
-            "Не сдано в канц.\nсвыше срока",
-            "Нарушений сдачи в канц.\nс нач. года",
-        ]
-
-        self.categories = [
-            "Рассмотрено за неделю",
-            "Рассмотрено с начала года",
-            "Рассмотрено с нарушением за неделю",
-            "Рассмотрено с нарушением с начала года",
-            "Передано за неделю",
-            "Передано с начала года",
-            "Остаток",
-            "От 2 до 6 месяцев",
-            "От 2 до 6 месяцев (рассмотренные в текущем году)",
-            "От 6 месяцев до 1 года",
-            "От 6 месяцев до 1 года (рассмотренные в текущем году)",
-            "От 1 года до 2 лет",
-            "От 1 года до 2 лет (рассмотренные в текущем году)",
-            "Свыше двух лет",
-            "Свыше двух лет (рассмотренные в текущем году)",
-            "Не сдано в канц. свыше срока",
-            "Нарушений сдачи в канц. с нач. года",
-        ]
-
-    def build(self, raw_data, week_index):
-        self.raw_data = raw_data
-        self.week_index = week_index
-        weeks = list(raw_data.keys())
-        week_key = weeks[week_index]
-        week_data = raw_data[week_key]
-
-        totals = {c: 0 for c in self.categories}
-        rows = []
-
-        for judge, judge_data in week_data.items():
-            values = {c: 0 for c in self.categories}
-            for category, cases in judge_data.items():
-                if category in values:
-                    values[category] = len(cases)
-                    totals[category] += len(cases)
-
-            rows.append(self._format_row(judge, values))
-
-        return {
-            "week": week_key,
-            "columns": self.columns,
-            "rows": rows,
-            "total": self._build_total_row(totals),
-            "tooltips": [
-                "",
-                "Количество рассмотренных\nдел за отчётную неделю",
-                "Количество рассмотренных\nдел с начала календарного года",
-                "Количество дел, рассмотренных\nс нарушением срока за неделю",
-                "Количество дел, рассмотренных\nс нарушением срока с начала года",
-                "Количество дел, переданных\nсудье за неделю",
-                "Количество дел, переданных\nсудье с начала года",
-                "Остаток дел на конец\nотчётной недели",
-                "Дела со сроком рассмотрения от 2 до 6 месяцев:\nкол-во таких дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения от 6 месяцев до 1 года:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения от 1 года до 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения свыше 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Количество дел, не сданных в канцелярию\nсвыше установленного срока\nв этой неделе",
-                "Количество нарушений сроков\nсдачи дел в канцелярию\nс начала года",
-            ],
-        }
-
-    def _format_row(self, j, v):
-        return [
-            j,
-            v["Рассмотрено за неделю"],
-            v["Рассмотрено с начала года"],
-            v["Рассмотрено с нарушением за неделю"],
-            v["Рассмотрено с нарушением с начала года"],
-            v["Передано за неделю"],
-            v["Передано с начала года"],
-            v["Остаток"],
-            f'{v["От 2 до 6 месяцев"]} ({v["От 2 до 6 месяцев (рассмотренные в текущем году)"]})',
-            f'{v["От 6 месяцев до 1 года"]} ({v["От 6 месяцев до 1 года (рассмотренные в текущем году)"]})',
-            f'{v["От 1 года до 2 лет"]} ({v["От 1 года до 2 лет (рассмотренные в текущем году)"]})',
-            f'{v["Свыше двух лет"]} ({v["Свыше двух лет (рассмотренные в текущем году)"]})',
-            v["Не сдано в канц. свыше срока"],
-            v["Нарушений сдачи в канц. с нач. года"],
-        ]
-
-    def _build_total_row(self, t):
-        return [
-            "Всего",
-            t["Рассмотрено за неделю"],
-            t["Рассмотрено с начала года"],
-            t["Рассмотрено с нарушением за неделю"],
-            t["Рассмотрено с нарушением с начала года"],
-            t["Передано за неделю"],
-            t["Передано с начала года"],
-            t["Остаток"],
-            f'{t["От 2 до 6 месяцев"]} ({t["От 2 до 6 месяцев (рассмотренные в текущем году)"]})',
-            f'{t["От 6 месяцев до 1 года"]} ({t["От 6 месяцев до 1 года (рассмотренные в текущем году)"]})',
-            f'{t["От 1 года до 2 лет"]} ({t["От 1 года до 2 лет (рассмотренные в текущем году)"]})',
-            f'{t["Свыше двух лет"]} ({t["Свыше двух лет (рассмотренные в текущем году)"]})',
-            t["Не сдано в канц. свыше срока"],
-            t["Нарушений сдачи в канц. с нач. года"],
-        ]
+            "Свыше двух лет", "Свыше двух лет (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения свыше 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Count(
+            "Не сдано в канц.\nсвыше срока", "Не сдано в канц. свыше срока",
+            tooltip="Количество дел, не сданных в канцелярию\nсвыше установленного срока\nв этой неделе",
+        ),
+        Count(
+            "Нарушений сдачи в канц.\nс нач. года", "Нарушений сдачи в канц. с нач. года",
+            tooltip="Количество нарушений сроков\nсдачи дел в канцелярию\nс начала года",
+        ),
+    ]
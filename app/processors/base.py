@@ -1,16 +1,67 @@
 import re
+from collections.abc import Sequence
+from functools import lru_cache
+
+import numpy as np
+
+from app.domain.count_cube import CASE_LIST_TYPES, CountCube
+from app.processors.table_engine import compile_table
 
 
 class BaseProcessor:
     COLUMN_TO_CATEGORY = {}
     COLUMN_TO_INCLUDED_CATEGORY = {}
 
-    columns = []
+    # описание таблицы (app.processors.columns) — компилируется
+    # один раз при объявлении класса, см. __init_subclass__
+    COLUMNS = []
     categories = []
+    flows = []  # категории-потоки «за неделю» (остальные — срез на конец недели)
+
+    # выводятся из COLUMNS
+    columns = []
+    tooltips = None
+    _table = None
+
+    raw_data = None  # строки дел для детализации (get_cell_details)
+    _week_keys = None
+    _week_keys_source = None
 
     word_template_key = None
     specialization = None  # ← ВАЖНО
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if "COLUMNS" not in vars(cls):
+            return
+
+        cls._table = compile_table(cls.COLUMNS, cls.categories)
+        cls.columns = cls._table.columns
+        cls.tooltips = cls._table.tooltips
+
+        # явно заданная в классе детализация важнее выведенной из COLUMNS
+        if "COLUMN_TO_CATEGORY" not in vars(cls):
+            cls.COLUMN_TO_CATEGORY = cls._table.column_to_category
+        if "COLUMN_TO_INCLUDED_CATEGORY" not in vars(cls):
+            cls.COLUMN_TO_INCLUDED_CATEGORY = cls._table.column_to_included_category
+
+        # столбцы без детализации добираются нечётким сопоставлением;
+        # всё это — один раз на класс, переключение недель строк не сравнивает
+        missing = [c for c in cls.columns if c not in cls.COLUMN_TO_CATEGORY]
+        if missing:
+            fuzzy = cls._fuzzy_mapping(tuple(cls.columns), tuple(cls.categories))
+            cls.COLUMN_TO_CATEGORY = dict(
+                cls.COLUMN_TO_CATEGORY,
+                **{column: fuzzy[column] for column in missing}
+            )
+
+        cls.validate_mapping(cls.columns)
+
+        unknown = set(cls.flows) - set(cls.categories)
+        if unknown:
+            raise ValueError(f"Потоки не из categories: {unknown}")
+
     def get_specialization(self):
         if not self.specialization:
             raise NotImplementedError(
@@ -19,20 +70,159 @@ class BaseProcessor:
         return self.specialization
 
     def build(self, raw_data, week_index):
+        self._bind(raw_data, week_index)
+        week_key, judges, matrix = self._week_matrix(raw_data, week_index)
+
+        return self._build_week(week_key, judges, matrix, self._row_title(raw_data))
+
+    def build_all(self, raw_data, token=None):
+        """
+        Все недели за один проход по данным:
+
+        {
+            "weeks":  [week_key, ...],           # порядок как в pkl
+            "tables": [table_data, ...],         # то же, что build()
+        }
+
+        Таблицы недель берут отсюда окно (переключение недель)
+        и экспорт всех недель. Ряды графика — из самого CountCube
+        (series / category_totals), здесь они не повторяются.
+        token (CancelToken) проверяется между неделями.
+        """
+        self._bind(raw_data)
+
+        row_title = self._row_title(raw_data)
+        weeks, tables = [], []
+
+        for week_key, judges, matrix in self._iter_week_matrices(raw_data):
+            if token is not None:
+                token.check()
+
+            weeks.append(week_key)
+            tables.append(self._build_week(week_key, judges, matrix, row_title))
+
+        return {
+            "weeks": weeks,
+            "tables": tables,
+        }
+
+    def build_delta(self, data, week_index, base_week_index):
+        """
+        Разница недели week_index с неделей base_week_index
+        по главным числам столбцов (у "12 (3)" — по 12):
+
+        {
+            "week":      week_key,
+            "base_week": base_week_key,
+            "rows":      {судья: [None, Δ, ...]},  # по столбцам таблицы
+            "total":     [None, Δ, ...],
+        }
+
+        По CountCube — два среза массива и одно умножение матриц:
+        достаточно быстро, чтобы пересчитывать в GUI без пула.
+        """
+        self._bind(data)
+
+        week_key, judges, matrix = self._week_matrix(data, week_index)
+        base_week_key, base_judges, base_matrix = self._week_matrix(data, base_week_index)
+
+        rows, total = self._table.build_deltas(judges, matrix, base_judges, base_matrix)
+
+        return {
+            "week": week_key,
+            "base_week": base_week_key,
+            "rows": rows,
+            "total": total,
+        }
+
+    # ---------- таблица недели ----------
+
+    def _build_week(self, week_key, judges, matrix, row_title=None):
+        """
+        matrix int [судьи × self.categories] → table_data
+
+        row_title — заголовок первого столбца, если строки
+        не судьи (например, суды в сводке по области)
+        """
+        rows, total = self._table.build_rows(judges, matrix)
+
+        columns = self.columns
+        if row_title and row_title != columns[0]:
+            columns = [row_title] + columns[1:]
+
+        table = {
+            "week": week_key,
+            "columns": columns,
+            "rows": rows,
+            "total": total,
+        }
+
+        if self.tooltips is not None:
+            table["tooltips"] = self.tooltips
+
+        return table
+
+    # ---------- источник данных ----------
+
+    def attach_raw_data(self, raw_data):
+        """
+        Источник строк дел для детализации,
+        если таблица строилась по CountCube
+        """
         self.raw_data = raw_data
-        self.week_index = week_index
 
-        self.COLUMN_TO_CATEGORY = self.build_column_to_category(
-            self.columns,
-            self.categories
-        )
+    def _bind(self, data, week_index=None):
+        if week_index is not None:
+            self.week_index = week_index
+
+        # CountCube содержит только количества — строки дел
+        # для детализации подключаются через attach_raw_data
+        if not isinstance(data, CountCube):
+            self.raw_data = data
 
-        self.validate_mapping(self.columns)
+    @staticmethod
+    def _row_title(data):
+        return data.row_title if isinstance(data, CountCube) else None
 
-        return self._build_table()
+    def _week_matrix(self, data, week_index):
+        """
+        (week_key, judges, matrix [судьи × self.categories])
 
-    def validate_mapping(self, columns):
-        missing = set(columns) - set(self.COLUMN_TO_CATEGORY)
+        data — CountCube или raw_data из pkl
+        """
+        if isinstance(data, CountCube):
+            return data.week_matrix(week_index, self.categories)
+
+        week_key = list(data.keys())[week_index]
+
+        return (week_key,) + self._count_matrix(data[week_key])
+
+    def _iter_week_matrices(self, data):
+        """_week_matrix для всех недель подряд — без повторного поиска ключа"""
+        if isinstance(data, CountCube):
+            for w in range(len(data)):
+                yield data.week_matrix(w, self.categories)
+            return
+
+        for week_key, week_data in data.items():
+            yield (week_key,) + self._count_matrix(week_data)
+
+    def _count_matrix(self, week_data):
+        judges = list(week_data.keys())
+        matrix = np.zeros((len(judges), len(self.categories)), dtype=np.int32)
+
+        for i, judge in enumerate(judges):
+            judge_data = week_data[judge]
+            for k, category in enumerate(self.categories):
+                cases = judge_data.get(category)
+                if isinstance(cases, CASE_LIST_TYPES):
+                    matrix[i, k] = len(cases)
+
+        return judges, matrix
+
+    @classmethod
+    def validate_mapping(cls, columns):
+        missing = set(columns) - set(cls.COLUMN_TO_CATEGORY)
         if missing:
             raise ValueError(f"Нет mapping для столбцов: {missing}")
 
@@ -41,10 +231,7 @@ class BaseProcessor:
         if not base_category:
             return []
 
-        weeks = list(self.raw_data.keys())
-        week_key = weeks[week_index]
-        week_data = self.raw_data.get(week_key, {})
-        judge_data = week_data.get(judge)
+        judge_data = self._week_data(week_index).get(judge)
 
         if not judge_data:
             return []
@@ -53,14 +240,14 @@ class BaseProcessor:
 
         # Основная категория
         base_values = judge_data.get(base_category, [])
-        if isinstance(base_values, list):
+        if self._is_case_list(base_values):
             result.append(("Всего", base_values))
 
         # В т.ч. рассмотренные в текущем году
         included_category = self.COLUMN_TO_INCLUDED_CATEGORY.get(column)
         if included_category:
             included_values = judge_data.get(included_category, [])
-            if isinstance(included_values, list):
+            if self._is_case_list(included_values):
                 if column == "Без движения\nсейчас (за год)":
                     result.append(("Оставленные без движения в текущем году", included_values))
                 else:
@@ -68,22 +255,41 @@ class BaseProcessor:
 
         return result
 
+    def _week_data(self, week_index):
+        """Данные недели из raw_data; список ключей недель строится один раз"""
+        if self._week_keys_source is not self.raw_data:
+            self._week_keys = list(self.raw_data.keys())
+            self._week_keys_source = self.raw_data
+
+        return self.raw_data.get(self._week_keys[week_index], {})
+
+    @staticmethod
+    def _is_case_list(values):
+        # list из pkl или CaseList из mmap-хранилища
+        return isinstance(values, Sequence) and not isinstance(values, str)
+
     @staticmethod
     def normalize(text: str) -> str:
         return re.sub(r"\s+", " ", text.replace("\n", " ").lower()).strip()
 
     def build_column_to_category(self, columns, categories):
+        return dict(self._fuzzy_mapping(tuple(columns), tuple(categories)))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _fuzzy_mapping(columns, categories):
+        """Нечёткое сопоставление столбец → категория (один раз на набор)"""
         mapping = {"Судья": None}
 
         normalized_categories = {
-            self.normalize(cat): cat for cat in categories
+            BaseProcessor.normalize(cat): cat for cat in categories
         }
 
         for col in columns:
             if col == "Судья":
                 continue
 
-            norm_col = self.normalize(col)
+            norm_col = BaseProcessor.normalize(col)
             matched = None
 
             for norm_cat, original_cat in normalized_categories.items():
@@ -93,4 +299,4 @@ class BaseProcessor:
 
             mapping[col] = matched
 
-        return mapping
\ No newline at end of file
+        return mapping
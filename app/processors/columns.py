@@ -0,0 +1,86 @@
+'''Columns — «из чего состоит столбец таблицы»
+
+Процессор описывает таблицу списком COLUMNS:
+
+Count("Остаток", "Остаток")                       → 12
+Pair("От 2 до 6 мес.", "От 2 до 6 месяцев",
+     "От 2 до 6 месяцев (рассмотренные в текущем году)")  → "12 (3)"
+Slash("Обжаловано", "Обжаловано", "Отменено")     → "12 / 3"
+
+Вместо имени категории можно указать разность:
+Diff("Остаток", "Приостановлено дел")             → Остаток − Приостановлено
+
+Столбец "Судья" добавляется движком сам (table_engine).
+'''
+
+
+class Diff:
+    """minuend − subtrahends (по категориям)"""
+
+    def __init__(self, minuend, *subtrahends):
+        self.minuend = minuend
+        self.subtrahends = subtrahends
+
+    def terms(self):
+        """[(category, коэффициент), ...]"""
+        return [(self.minuend, 1)] + [(c, -1) for c in self.subtrahends]
+
+    @property
+    def base_category(self):
+        return self.minuend
+
+
+class Column:
+    """Базовый столбец: заголовок, значения, подсказка"""
+
+    def __init__(self, title, *values, tooltip=None):
+        self.title = title
+        self.values = values  # категории или Diff
+        self.tooltip = tooltip
+
+    def format(self, *numbers):
+        raise NotImplementedError
+
+    @property
+    def base_category(self):
+        """Категория для детализации («Всего»)"""
+        return _base_category(self.values[0])
+
+    @property
+    def included_category(self):
+        """Вторая категория для детализации (если есть)"""
+        return None
+
+
+class Count(Column):
+    def __init__(self, title, value, tooltip=None):
+        super().__init__(title, value, tooltip=tooltip)
+
+    def format(self, a):
+        return a
+
+
+class Pair(Column):
+    """"a (b)" — например, «сейчас (рассмотренные в текущем году)»"""
+
+    def __init__(self, title, value, extra, tooltip=None):
+        super().__init__(title, value, extra, tooltip=tooltip)
+
+    def format(self, a, b):
+        return f"{a} ({b})"
+
+    @property
+    def included_category(self):
+        extra = self.values[1]
+        return extra if isinstance(extra, str) else None
+
+
+class Slash(Pair):
+    """"a / b" """
+
+    def format(self, a, b):
+        return f"{a} / {b}"
+
+
+def _base_category(value):
+    return value if isinstance(value, str) else value.base_category
@@ -1,7 +1,10 @@
+from app.factory.processor_factory import register_processor
 from app.processors.base import BaseProcessor
+from app.processors.columns import Count
 import re
 
 
+@register_processor(("KAS", "appeal", "regional"))
 class KASAppealRegionalProcessor(BaseProcessor):
     """
     ГПК — апелляционная инстанция — областной суд
@@ -9,129 +12,51 @@ class KASAppealRegionalProcessor(BaseProcessor):
     word_template_key = "regional_appeal"
     specialization = "KAS"
 
-    COLUMN_TO_CATEGORY = {
-        "Судья": None,
-        "Передано\nза неделю": "Передано за неделю",
-        "Передано\nс начала года": "Передано с начала года",
-        "Приостановлено\nдел": "Приостановлено дел",
-        "Рассм. дел\nза неделю": "Рассмотрено за неделю",
-        "Рассм. дел\nс начала года": "Рассмотрено с начала года",
-        'Рассмотрено\nс наруш. срока\nза неделю': 'Рассмотрено с нарушением срока за неделю',
-        'Рассмотрено\nс наруш. срока\nс начала года': 'Рассмотрено с нарушением срока с начала года',
-        "Наруш. мотивир.\nв неделю": "Нарушение мотивировки в неделю",
-        "Наруш. мотивир.\nс начала года": "Нарушений изготовления мотивировки с начала года",
-        "От 2 до 6 мес.": "От 2 до 6 месяцев",
-        "От 6 месяцев\nдо 1 года": "От 6 месяцев до 1 года",
-        "Свыше года": "Свыше года",
-        "Не сдано в канц.\nсвыше срока": "Не сдано в канц. свыше срока",
-        "Нарушений\nсдачи в канц.\nс нач. года": "Нарушений сдачи в канц. с нач. года",
-        "Нарушение сдачи\nв экспедицию\nза неделю": "Нарушение сдачи в экспедицию за неделю",
-        "Нарушение сдачи\nв экспедицию\nс начала года": "Нарушение сдачи в экспедицию с начала года",
-    }
-
-    def __init__(self):
-        self.columns = [
-            "Судья",
-            "Передано\nза неделю",
-            "Передано\nс начала года",
-            'Приостановлено\nдел',
-            "Рассм. дел\nза неделю",
-            "Рассм. дел\nс начала года",
-            'Рассмотрено\nс наруш. срока\nза неделю',
-            'Рассмотрено\nс наруш. срока\nс начала года',
-            'Наруш. мотивир.\nв неделю',
-            "Наруш. мотивир.\nс начала года",
-            "От 2 до 6 мес.",
-            "От 6 месяцев\nдо 1 года",
-            "Свыше года",
-            "Не сдано в канц.\nсвыше срока",
-            "Нарушений\nсдачи в канц.\nс нач. года",
-            "Нарушение сдачи\nв экспедицию\nза неделю",
-            "Нарушение сдачи\nв экспедицию\nс начала года",
-        ]
-
-        self.categories = [
-            "Передано за неделю",
-            "Передано с начала года",
-            'Приостановлено дел',
-            "Рассмотрено за неделю",
-            "Рассмотрено с начала года",
-            'Рассмотрено с нарушением срока за неделю',
-            'Рассмотрено с нарушением срока с начала года',
-            'Нарушение мотивировки в неделю',
-            "Нарушений изготовления мотивировки с начала года",
-            "От 2 до 6 месяцев",
-            "От 6 месяцев до 1 года",
-            "Свыше года",
-            "Не сдано в канц. свыше срока",
-            "Нарушений сдачи в канц. с нач. года",
-            "Нарушение сдачи в экспедицию за неделю",
-            "Нарушение сдачи в экспедицию с начала года",
-        ]
-
-    def build(self, raw_data, week_index):
-        self.raw_data = raw_data
-        self.week_index = week_index
-        weeks = list(raw_data.keys())
-        week_key = weeks[week_index]
-        week_data = raw_data[week_key]
-
-        totals = self._init_counter()
-        rows = []
-
-        for judge, judge_data in week_data.items():
-            row, totals = self._process_judge(judge, judge_data, totals)
-            rows.append(row)
-
-        return {
-            "week": week_key,
-            "columns": self.columns,
-            "rows": rows,
-            "total": self._build_total_row(totals),
-        }
-
-    def _init_counter(self):
-        return {name: 0 for name in self.categories}
-
-    def _process_judge(self, judge, judge_data, totals):
-        values = self._init_counter()
-
-        for category, cases in judge_data.items():
-            if category in values:
-                count = len(cases)
-                values[category] = count
-                totals[category] += count
-
-        return self._format_row(judge, values), totals
-
-    def _format_row(self, judge, values: dict):
-        return [judge] + [values.get(cat, 0) for cat in self.categories]
-
-    def _build_total_row(self, total: dict):
-        return ["Всего"] + [total.get(cat, 0) for cat in self.categories]
-
-    # def _format_row(self, j, v):
-    #     return [
-    #         j,
-    #         v["Поступило за неделю"],
-    #         v["Поступило с начала года"],
-    #         v["Рассмотрено за неделю"],
-    #         v["Рассмотрено с начала года"],
-    #         v["Остаток"],
-    #         v["Свыше трех месяцев"],
-    #         v["Свыше шести месяцев"],
-    #         v["Свыше одного года"],
-    #     ]
-    #
-    # def _build_total_row(self, t):
-    #     return [
-    #         "Всего",
-    #         t["Поступило за неделю"],
-    #         t["Поступило с начала года"],
-    #         t["Рассмотрено за неделю"],
-    #         t["Рассмотрено с начала года"],
-    #         t["Остаток"],
-    #         t["Свыше трех месяцев"],
-    #         t["Свыше шести месяцев"],
-    #         t["Свыше одного года"],
-    #     ]
+    # категории, которые реально лежат в pkl
+    categories = [
+        "Передано за неделю",
+        "Передано с начала года",
+        "Приостановлено дел",
+        "Рассмотрено за неделю",
+        "Рассмотрено с начала года",
+        "Рассмотрено с нарушением срока за неделю",
+        "Рассмотрено с нарушением срока с начала года",
+        "Нарушение мотивировки в неделю",
+        "Нарушений изготовления мотивировки с начала года",
+        "От 2 до 6 месяцев",
+        "От 6 месяцев до 1 года",
+        "Свыше года",
+        "Не сдано в канц. свыше срока",
+        "Нарушений сдачи в канц. с нач. года",
+        "Нарушение сдачи в экспедицию за неделю",
+        "Нарушение сдачи в экспедицию с начала года",
+    ]
+
+    # потоки за неделю: точка графика за месяц / квартал — сумма недель
+    flows = [
+        "Передано за неделю",
+        "Рассмотрено за неделю",
+        "Рассмотрено с нарушением срока за неделю",
+        "Нарушение мотивировки в неделю",
+        "Нарушение сдачи в экспедицию за неделю",
+    ]
+
+    # порядок столбцов = порядок значений в строке (после "Судья")
+    COLUMNS = [
+        Count("Передано\nза неделю", "Передано за неделю"),
+        Count("Передано\nс начала года", "Передано с начала года"),
+        Count("Приостановлено\nдел", "Приостановлено дел"),
+        Count("Рассм. дел\nза неделю", "Рассмотрено за неделю"),
+        Count("Рассм. дел\nс начала года", "Рассмотрено с начала года"),
+        Count("Рассмотрено\nс наруш. срока\nза неделю", "Рассмотрено с нарушением срока за неделю"),
+        Count("Рассмотрено\nс наруш. срока\nс начала года", "Рассмотрено с нарушением срока с начала года"),
+        Count("Наруш. мотивир.\nв неделю", "Нарушение мотивировки в неделю"),
+        Count("Наруш. мотивир.\nс начала года", "Нарушений изготовления мотивировки с начала года"),
+        Count("От 2 до 6 мес.", "От 2 до 6 месяцев"),
+        Count("От 6 месяцев\nдо 1 года", "От 6 месяцев до 1 года"),
+        Count("Свыше года", "Свыше года"),
+        Count("Не сдано в канц.\nсвыше срока", "Не сдано в канц. свыше срока"),
+        Count("Нарушений\nсдачи в канц.\nс нач. года", "Нарушений сдачи в канц. с нач. года"),
+        Count("Нарушение сдачи\nв экспедицию\nза неделю", "Нарушение сдачи в экспедицию за неделю"),
+        Count("Нарушение сдачи\nв экспедицию\nс начала года", "Нарушение сдачи в экспедицию с начала года"),
+    ]
@@ -1,6 +1,9 @@
+from app.factory.processor_factory import register_processor
 from app.processors.base import BaseProcessor
+from app.processors.columns import Count
 
 
+@register_processor(("M_AOS", "first", "regional"))
 class MAOSFirstDistrictProcessor(BaseProcessor):
     """
     М_У1 — 1 инстанция — районный / городской суд
@@ -8,106 +11,76 @@ class MAOSFirstDistrictProcessor(BaseProcessor):
     word_template_key = "regional_first"
     specialization = "M_AOS"
 
-    COLUMN_TO_CATEGORY = {
-        # Служебный столбец
-        "Судья": None,
-        "Остаток на\nначало года": "Остаток на начало года",
-        "Передано\nза неделю": "Передано за неделю",
-        "Передано\nс начала года": "Передано с начала года",
-        "Рассм.\nза неделю": "Рассмотрено за неделю",
-        "Рассм.\nс начала года": "Рассмотрено с начала года",
-        "Остаток": "Остаток",
-        "От 1 до 2 месяцев\nсейчас (рассм. в тек. году)": "От 1 до 2 месяцев",
-        "От 2 до 3 месяцев\nсейчас (рассм. в тек. году)": "От 2 до 3 месяцев",
-        "От 3 до 4 месяцев\nсейчас (рассм. в тек. году)": "От 3 до 4 месяцев",
-        "Свыше 4 месяцев\nсейчас (рассм. в тек. году)": "Свыше 4 месяцев",
-        "Не сдано в канц.\nсвыше срока": "Не сдано в канц. свыше срока",
-        "Нарушений сдачи в канц.\nс нач. года": "Нарушений сдачи в канц. с нач. года",
-    }
+    # категории, которые реально лежат в pkl
+    categories = [
+        "Остаток на начало года",
+        "Передано за неделю",
+        "Передано с начала года",
+        "Рассмотрено за неделю",
+        "Рассмотрено с начала года",
+        "Остаток",
+        "От 1 до 2 месяцев",
+        "От 2 до 3 месяцев",
+        "От 3 до 4 месяцев",
+        "Свыше 4 месяцев",
+        "Не сдано в канц. свыше срока",
+        "Нарушений сдачи в канц. с нач. года",
+    ]
 
-    # COLUMN_TO_INCLUDED_CATEGORY = {
-    #     "От 1 до 2 месяцев\nсейчас (рассм. в тек. году)": "От 1 до 2 месяцев (рассмотренные в текущем году)",
-    #     "От 2 до 3 месяцев\nсейчас (рассм. в тек. году)": "От 2 до 3 месяцев (рассмотренные в текущем году)",
-    #     "От 3 до 4 месяцев\nсейчас (рассм. в тек. году)": "От 3 до 4 месяцев (рассмотренные в текущем году)",
-    #     "Свыше 4 месяцев\nсейчас (рассм. в тек. году)": "Свыше 4 месяцев (рассмотренные в текущем году)",
-    # }
+    # потоки за неделю: точка графика за месяц / квартал — сумма недель
+    flows = [
+        "Передано за неделю",
+        "Рассмотрено за неделю",
+    ]
 
-    def __init__(self):
-        self.columns = [
-            "Судья",
-            "Остаток на\nначало года",
-            "Передано\nза неделю",
-            "Передано\nс начала года",
-            "Рассм.\nза неделю",
-            "Рассм.\nс начала года",
-            "Остаток",
-            "От 1 до 2 месяцев\nсейчас (рассм. в тек. году)",
-            "От 2 до 3 месяцев\nсейчас (рассм. в тек. году)",
-            "От 3 до 4 месяцев\nсейчас (рассм. в тек. году)",
-            "Свыше 4 месяцев\nсейчас (рассм. в тек. году)",
-            "Не сдано в канц.\nсвыше срока",
-            "Нарушений сдачи в канц.\nс нач. года",
-        ]
-
-        self.categories = [
-            "Остаток на начало года",
-            "Передано за неделю",
-            "Передано с начала года",
-            "Рассмотрено за неделю",
-            "Рассмотрено с начала года",
-            "Остаток",
-            "От 1 до 2 месяцев",
-            "От 2 до 3 месяцев",
-            "От 3 до 4 месяцев",
-            "Свыше 4 месяцев",
-            "Не сдано в канц. свыше срока",
-            "Нарушений сдачи в канц. с нач. года",
-        ]
-
-    def build(self, raw_data, week_index):
-        self.raw_data = raw_data
-        self.week_index = week_index
-        week_key = list(raw_data.keys())[week_index]
-        week_data = raw_data[week_key]
-
-        totals = {c: 0 for c in self.categories}
-        rows = []
-
-        for judge, judge_data in week_data.items():
-            values = {c: 0 for c in self.categories}
-
-            for category, cases in judge_data.items():
-                if category in values:
-                    count = len(cases)
-                    values[category] = count
-                    totals[category] += count
-
-            rows.append(self._format_row(judge, values))
-
-        return {
-            "week": week_key,
-            "columns": self.columns,
-            "rows": rows,
-            "total": self._build_total_row(totals),
-            "tooltips": [
-                "",
-                'Остаток дел на начало года',
-                "Количество дел, переданных\nсудье за неделю",
-                "Количество дел, переданных\nсудье с начала года",
-                "Количество рассмотренных\nдел за отчётную неделю",
-                "Количество рассмотренных\nдел с начала календарного года",
-                "Остаток дел на конец\nотчётной недели",
-                "Дела со сроком рассмотрения от 2 до 6 месяцев:\nкол-во таких дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения от 6 месяцев до 1 года:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения от 1 года до 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения свыше 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Количество дел, не сданных в канцелярию\nсвыше установленного срока\nв этой неделе",
-                "Количество нарушений сроков\nсдачи дел в канцелярию\nс начала года",
-            ],
-        }
-
-    def _format_row(self, judge, values: dict):
-        return [judge] + [values.get(cat, 0) for cat in self.categories]
-
-    def _build_total_row(self, total: dict):
-        return ["Всего"] + [total.get(cat, 0) for cat in self.categories]
+    # порядок столбцов = порядок значений в строке (после "Судья")
+    COLUMNS = [
+        Count(
+            "Остаток на\nначало года", "Остаток на начало года",
+            tooltip="Остаток дел на начало года",
+        ),
+        Count(
+            "Передано\nза неделю", "Передано за неделю",
+            tooltip="Количество дел, переданных\nсудье за неделю",
+        ),
+        Count(
+            "Передано\nс начала года", "Передано с начала года",
+            tooltip="Количество дел, переданных\nсудье с начала года",
+        ),
+        Count(
+            "Рассм.\nза неделю", "Рассмотрено за неделю",
+            tooltip="Количество рассмотренных\nдел за отчётную неделю",
+        ),
+        Count(
+            "Рассм.\nс начала года", "Рассмотрено с начала года",
+            tooltip="Количество рассмотренных\nдел с начала календарного года",
+        ),
+        Count(
+            "Остаток", "Остаток",
+            tooltip="Остаток дел на конец\nотчётной недели",
+        ),
+        Count(
+            "От 1 до 2 месяцев\nсейчас (рассм. в тек. году)", "От 1 до 2 месяцев",
+            tooltip="Дела со сроком рассмотрения от 2 до 6 месяцев:\nкол-во таких дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Count(
+            "От 2 до 3 месяцев\nсейчас (рассм. в тек. году)", "От 2 до 3 месяцев",
+            tooltip="Дела со сроком рассмотрения от 6 месяцев до 1 года:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Count(
+            "От 3 до 4 месяцев\nсейчас (рассм. в тек. году)", "От 3 до 4 месяцев",
+            tooltip="Дела со сроком рассмотрения от 1 года до 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Count(
+            "Свыше 4 месяцев\nсейчас (рассм. в тек. году)", "Свыше 4 месяцев",
+            tooltip="Дела со сроком рассмотрения свыше 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Count(
+            "Не сдано в канц.\nсвыше срока", "Не сдано в канц. свыше срока",
+            tooltip="Количество дел, не сданных в канцелярию\nсвыше установленного срока\nв этой неделе",
+        ),
+        Count(
+            "Нарушений сдачи в канц.\nс нач. года", "Нарушений сдачи в канц. с нач. года",
+            tooltip="Количество нарушений сроков\nсдачи дел в канцелярию\nс начала года",
+        ),
+    ]
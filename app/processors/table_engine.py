@@ -0,0 +1,139 @@
+'''Table engine — «COLUMNS → строки таблицы»
+
+Описание столбцов (app.processors.columns) компилируется
+один раз на класс процессора:
+
+- все числа таблицы = matrix @ coefficients, где
+  coefficients int [категория × число] — ±1 для каждого
+  слагаемого (категория, разность);
+- на каждый столбец — готовая функция форматирования,
+  которая берёт свои числа из строки по позиции.
+
+Строка таблицы = [судья] + [f(values) for f in formatters],
+без поиска по словарям.
+'''
+
+from operator import itemgetter
+
+import numpy as np
+
+from app.processors.columns import Count
+
+
+JUDGE_COLUMN = "Судья"
+TOTAL_LABEL = "Всего"
+
+
+class CompiledTable:
+    def __init__(self, columns, categories):
+        self.specs = list(columns)
+        self.categories = list(categories)
+
+        category_pos = {}
+        for i, category in enumerate(self.categories):
+            category_pos.setdefault(category, i)
+
+        terms = []       # для каждого числа — [(позиция категории, коэффициент)]
+        formatters = []
+        starts = []      # первое (главное) число каждого столбца
+
+        for spec in self.specs:
+            start = len(terms)
+            starts.append(start)
+
+            for value in spec.values:
+                value_terms = [(value, 1)] if isinstance(value, str) else value.terms()
+
+                for category, _ in value_terms:
+                    if category not in category_pos:
+                        raise ValueError(
+                            f"Столбец {spec.title!r}: категории {category!r} нет в categories"
+                        )
+
+                terms.append([(category_pos[c], k) for c, k in value_terms])
+
+            formatters.append(self._formatter(spec, start))
+
+        self.coefficients = np.zeros((len(self.categories), len(terms)), dtype=np.int32)
+        for n, value_terms in enumerate(terms):
+            for c, k in value_terms:
+                self.coefficients[c, n] += k
+
+        self.formatters = formatters
+
+        # главное число столбца (у "12 (3)" — 12) — для разницы недель
+        self.main_coefficients = self.coefficients[:, starts]
+
+        self.columns = [JUDGE_COLUMN] + [spec.title for spec in self.specs]
+
+        tooltips = [spec.tooltip for spec in self.specs]
+        self.tooltips = (
+            None if all(t is None for t in tooltips)
+            else [""] + [t or "" for t in tooltips]
+        )
+
+        self.column_to_category = {JUDGE_COLUMN: None}
+        self.column_to_included_category = {}
+
+        for spec in self.specs:
+            self.column_to_category[spec.title] = spec.base_category
+            if spec.included_category:
+                self.column_to_included_category[spec.title] = spec.included_category
+
+    @staticmethod
+    def _formatter(spec, start):
+        if isinstance(spec, Count):
+            return itemgetter(start)
+
+        fmt = spec.format
+        count = len(spec.values)
+        return lambda values: fmt(*values[start:start + count])
+
+    def build_rows(self, judges, matrix):
+        """
+        matrix int [судьи × categories] →
+        (rows, total) в виде, который ждёт TableModel
+        """
+        values = np.vstack([matrix, matrix.sum(axis=0)]) @ self.coefficients
+        values = values.tolist()
+
+        formatters = self.formatters
+
+        rows = [
+            [judge] + [f(row) for f in formatters]
+            for judge, row in zip(judges, values)
+        ]
+        total = [TOTAL_LABEL] + [f(values[-1]) for f in formatters]
+
+        return rows, total
+
+    def build_deltas(self, judges, matrix, base_judges, base_matrix):
+        """
+        Разница главных чисел столбцов: неделя − базовая неделя.
+
+        → ({судья: [None, Δ, Δ, ...]}, [None, Δ итога, ...]);
+        None — в столбце "Судья". Судьи, которых нет в базовой
+        неделе, сравниваются с нулём.
+        """
+        base_pos = {judge: i for i, judge in enumerate(base_judges)}
+
+        aligned = np.zeros_like(matrix)
+        for i, judge in enumerate(judges):
+            j = base_pos.get(judge)
+            if j is not None:
+                aligned[i] = base_matrix[j]
+
+        diff = np.vstack([
+            matrix - aligned,
+            matrix.sum(axis=0) - base_matrix.sum(axis=0),
+        ]) @ self.main_coefficients
+        diff = diff.tolist()
+
+        rows = {judge: [None] + row for judge, row in zip(judges, diff)}
+        total = [None] + diff[-1]
+
+        return rows, total
+
+
+def compile_table(columns, categories):
+    return CompiledTable(columns, categories)
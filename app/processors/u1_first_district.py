@@ -1,6 +1,10 @@
+from app.domain.case_key import extract_case_key
+from app.factory.processor_factory import register_processor
 from app.processors.base import BaseProcessor
+from app.processors.columns import Count, Diff, Pair
 
 
+@register_processor(("U1", "first", "district"))
 class U1FirstDistrictProcessor(BaseProcessor):
     """
     У1 — 1 инстанция — районный / городской суд
@@ -8,25 +12,17 @@ class U1FirstDistrictProcessor(BaseProcessor):
 
     def get_cell_details(self, judge, column, week_index):
         if column == "Остаток":
-            week_key = list(self.raw_data.keys())[week_index]
-            week_data = self.raw_data.get(week_key, {})
-            judge_data = week_data.get(judge, {})
+            judge_data = self._week_data(week_index).get(judge, {})
 
             rest_cases = judge_data.get("Остаток", []) or []
             suspended_cases = judge_data.get("Приостановлено дел", []) or []
             suspended_army_cases = judge_data.get("Приостановлено дел из-за призыва", []) or []
 
-            def extract_case_key(raw: str) -> str:
-                raw = raw.strip()
-                if "," in raw:
-                    return raw.split(",", 1)[0].strip()
-                return raw
-
             # объединяем все приостановленные по номеру дела, а не по полной строке
             suspended_all = []
             suspended_keys = set()
 
-            for case in suspended_cases + suspended_army_cases:
+            for case in list(suspended_cases) + list(suspended_army_cases):
                 key = extract_case_key(case)
                 if key not in suspended_keys:
                     suspended_all.append(case)
@@ -48,209 +44,102 @@ class U1FirstDistrictProcessor(BaseProcessor):
     word_template_key = "district_first"
     specialization = "U1"
 
-    COLUMN_TO_CATEGORY = {
-        # Служебный столбец
-        "Судья": None,
-
-        # Остатки / движение
-        "Остаток на\nначало года":
-            "Остаток на начало года",
-
-        "Передано\nза неделю":
-            "Передано за неделю",
-
-        "Передано\nс начала года":
-            "Передано с начала года",
-
-        "Рассм.\nза неделю":
-            "Рассмотрено за неделю",
-
-        "Рассм.\nс начала года":
-            "Рассмотрено с начала года",
-
-        "Окончено с\nнаруш. срока":
-            "Окончено с нарушением срока",
-
-        "Остаток":
+    # категории, которые реально лежат в pkl
+    categories = [
+        "Остаток на начало года",
+        "Передано за неделю",
+        "Передано с начала года",
+        "Рассмотрено за неделю",
+        "Рассмотрено с начала года",
+        "Окончено с нарушением срока",
+        "Остаток",
+        "Приостановлено дел",
+        "Приостановлено дел из-за призыва",
+        "От 2 до 6 месяцев",
+        "От 2 до 6 месяцев (рассмотренные в текущем году)",
+        "От 6 месяцев до 1 года",
+        "От 6 месяцев до 1 года (рассмотренные в текущем году)",
+        "От 1 года до 2 лет",
+        "От 1 года до 2 лет (рассмотренные в текущем году)",
+        "Свыше двух лет",
+        "Свыше двух лет (рассмотренные в текущем году)",
+        "Не сдано в канц. свыше срока",
+        "Нарушений сдачи в канц. с нач. года",
+    ]
+
+    # потоки за неделю: точка графика за месяц / квартал — сумма недель
+    flows = [
+        "Передано за неделю",
+        "Рассмотрено за неделю",
+        "Окончено с нарушением срока",
+    ]
+
+    # порядок столбцов = порядок значений в строке (после "Судья")
+    COLUMNS = [
+        Count(
+            "Остаток на\nначало года", "Остаток на начало года",
+            tooltip="Остаток дел на начало года",
+        ),
+        Count(
+            "Передано\nза неделю", "Передано за неделю",
+            tooltip="Количество дел, переданных\nсудье за неделю",
+        ),
+        Count(
+            "Передано\nс начала года", "Передано с начала года",
+            tooltip="Количество дел, переданных\nсудье с начала года",
+        ),
+        Count(
+            "Рассм.\nза неделю", "Рассмотрено за неделю",
+            tooltip="Количество рассмотренных\nдел за отчётную неделю",
+        ),
+        Count(
+            "Рассм.\nс начала года", "Рассмотрено с начала года",
+            tooltip="Количество рассмотренных\nдел с начала календарного года",
+        ),
+        Count(
+            "Окончено с\nнаруш. срока", "Окончено с нарушением срока",
+            tooltip="Количество дел, оконченных\nс нарушением срока в этой неделе",
+        ),
+        Pair(
             "Остаток",
-
-        # Приостановленные
-        "Приостановлено дел":
-            "Приостановлено дел",
-
-        "Приостановлено\nиз-за воен. призыва":
-            "Приостановлено дел из-за призыва",
-
-        # Сроки рассмотрения (основные)
-        "От 2 до 6 месяцев\nсейчас (в тек. году)":
-            "От 2 до 6 месяцев",
-
-        "От 6 месяцев\nдо 1 года":
-            "От 6 месяцев до 1 года",
-
-        "От 1 года\nдо 2 лет":
-            "От 1 года до 2 лет",
-
-        "Свыше двух лет (всего/год)":
-            "Свыше двух лет",
-
-        # Канцелярия
-        "Не сдано в канц.\nсвыше срока":
-            "Не сдано в канц. свыше срока",
-
-        "Нарушений сдачи в канц.\nс нач. года":
-            "Нарушений сдачи в канц. с нач. года",
-    }
-
-    COLUMN_TO_INCLUDED_CATEGORY = {
-        "От 2 до 6 месяцев\nсейчас (в тек. году)":
-            "От 2 до 6 месяцев (рассмотренные в текущем году)",
-
-        "От 6 месяцев\nдо 1 года":
-            "От 6 месяцев до 1 года (рассмотренные в текущем году)",
-
-        "От 1 года\nдо 2 лет":
-            "От 1 года до 2 лет (рассмотренные в текущем году)",
-
-        "Свыше двух лет (всего/год)":
-            "Свыше двух лет (рассмотренные в текущем году)",
-    }
-
-    def __init__(self):
-        self.columns = [
-            "Судья",
-            "Остаток на\nначало года",
-            "Передано\nза неделю",
-            "Передано\nс начала года",
-            "Рассм.\nза неделю",
-            "Рассм.\nс начала года",
-            "Окончено с\nнаруш. срока",
             "Остаток",
-            "Приостановлено дел",
-            "Приостановлено\nиз-за воен. призыва",
+            Diff("Остаток", "Приостановлено дел", "Приостановлено дел из-за призыва"),
+            tooltip="Остаток дел на конец отчётной недели\n(остаток без приостановленных)",
+        ),
+        Count(
+            "Приостановлено дел", "Приостановлено дел",
+            tooltip="Количество приостановленных дел\n(без учета военного призыва)",
+        ),
+        Count(
+            "Приостановлено\nиз-за воен. призыва", "Приостановлено дел из-за призыва",
+            tooltip="Количество дел, приостановленных\nтолько из-за военного призыва",
+        ),
+        Pair(
             "От 2 до 6 месяцев\nсейчас (в тек. году)",
+            "От 2 до 6 месяцев", "От 2 до 6 месяцев (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения от 2 до 6 месяцев:\nкол-во таких дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Pair(
             "От 6 месяцев\nдо 1 года",
+            "От 6 месяцев до 1 года", "От 6 месяцев до 1 года (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения от 6 месяцев до 1 года:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Pair(
             "От 1 года\nдо 2 лет",
+            "От 1 года до 2 лет", "От 1 года до 2 лет (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения от 1 года до 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Pair(
             "Свыше двух лет (всего/год)",
-            "Не сдано в канц.\nсвыше срока",
-            "Нарушений сдачи в канц.\nс нач. года",
-        ]
-
-        self.categories = [
-            "Остаток на начало года",
-            "Передано за неделю",
-            "Передано с начала года",
-            "Рассмотрено за неделю",
-            "Рассмотрено с начала года",
-            "Окончено с нарушением срока",
-            "Остаток",
-            "Приостановлено дел",
-            "Приостановлено дел из-за призыва",
-            "От 2 до 6 месяцев",
-            "От 2 до 6 месяцев (рассмотренные в текущем году)",
-            "От 6 месяцев до 1 года",
-            "От 6 месяцев до 1 года (рассмотренные в текущем году)",
-            "От 1 года до 2 лет",
-            "От 1 года до 2 лет (рассмотренные в текущем году)",
-            "Свыше двух лет",
-            "Свыше двух лет (рассмотренные в текущем году)",
-            "Не сдано в канц. свыше срока",
-            "Нарушений сдачи в канц. с нач. года",
-        ]
-
-    def build(self, raw_data, week_index):
-        self.raw_data = raw_data
-        self.week_index = week_index
-        week_key = list(raw_data.keys())[week_index]
-        week_data = raw_data[week_key]
-
-        totals = {c: 0 for c in self.categories}
-        rows = []
-
-        for judge, judge_data in week_data.items():
-            values = {c: 0 for c in self.categories}
-
-            for category, cases in judge_data.items():
-                if category in values:
-                    count = len(cases)
-                    values[category] = count
-                    totals[category] += count
-
-            rows.append(self._format_row(judge, values))
-
-        return {
-            "week": week_key,
-            "columns": self.columns,
-            "rows": rows,
-            "total": self._build_total_row(totals),
-            "tooltips": [
-                "",
-                'Остаток дел на начало года',
-                "Количество дел, переданных\nсудье за неделю",
-                "Количество дел, переданных\nсудье с начала года",
-                "Количество рассмотренных\nдел за отчётную неделю",
-                "Количество рассмотренных\nдел с начала календарного года",
-                "Количество дел, оконченных\nс нарушением срока в этой неделе",
-                "Остаток дел на конец отчётной недели\n(остаток без приостановленных)",
-                "Количество приостановленных дел\n(без учета военного призыва)",
-                "Количество дел, приостановленных\nтолько из-за военного призыва",
-                "Дела со сроком рассмотрения от 2 до 6 месяцев:\nкол-во таких дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения от 6 месяцев до 1 года:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения от 1 года до 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Дела со сроком рассмотрения свыше 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
-                "Количество дел, не сданных в канцелярию\nсвыше установленного срока\nв этой неделе",
-                "Количество нарушений сроков\nсдачи дел в канцелярию\nс начала года",
-            ],
-        }
-
-    def _format_row(self, j, v):
-        rest_without_suspended = (
-                v["Остаток"]
-                - v["Приостановлено дел"]
-                - v["Приостановлено дел из-за призыва"]
-        )
-
-        return [
-            j,
-            v["Остаток на начало года"],
-            v["Передано за неделю"],
-            v["Передано с начала года"],
-            v["Рассмотрено за неделю"],
-            v["Рассмотрено с начала года"],
-            v["Окончено с нарушением срока"],
-            f'{v["Остаток"]} ({rest_without_suspended})',
-            v["Приостановлено дел"],
-            v["Приостановлено дел из-за призыва"],
-            f'{v["От 2 до 6 месяцев"]} ({v["От 2 до 6 месяцев (рассмотренные в текущем году)"]})',
-            f'{v["От 6 месяцев до 1 года"]} ({v["От 6 месяцев до 1 года (рассмотренные в текущем году)"]})',
-            f'{v["От 1 года до 2 лет"]} ({v["От 1 года до 2 лет (рассмотренные в текущем году)"]})',
-            f'{v["Свыше двух лет"]} ({v["Свыше двух лет (рассмотренные в текущем году)"]})',
-            v["Не сдано в канц. свыше срока"],
-            v["Нарушений сдачи в канц. с нач. года"],
-        ]
-
-    def _build_total_row(self, t):
-        total_rest_without_suspended = (
-                t["Остаток"]
-                - t["Приостановлено дел"]
-                - t["Приостановлено дел из-за призыва"]
-        )
-
-        return [
-            "Всего",
-            t["Остаток на начало года"],
-            t["Передано за неделю"],
-            t["Передано с начала года"],
-            t["Рассмотрено за неделю"],
-            t["Рассмотрено с начала года"],
-            t["Окончено с нарушением срока"],
-            f'{t["Остаток"]} ({total_rest_without_suspended})',
-            t["Приостановлено дел"],
-            t["Приостановлено дел из-за призыва"],
-            f'{t["От 2 до 6 месяцев"]} ({t["От 2 до 6 месяцев (рассмотренные в текущем году)"]})',
-            f'{t["От 6 месяцев до 1 года"]} ({t["От 6 месяцев до 1 года (рассмотренные в текущем году)"]})',
-            f'{t["От 1 года до 2 лет"]} ({t["От 1 года до 2 лет (рассмотренные в текущем году)"]})',
-            f'{t["Свыше двух лет"]} ({t["Свыше двух лет (рассмотренные в текущем году)"]})',
-            t["Не сдано в канц. свыше срока"],
-            t["Нарушений сдачи в канц. с нач. года"],
-        ]
+            "Свыше двух лет", "Свыше двух лет (рассмотренные в текущем году)",
+            tooltip="Дела со сроком рассмотрения свыше 2 лет:\nкол-во дел на конец недели\n(кол-во таких дел, рассмотренных с 01 января по текущую неделю)",
+        ),
+        Count(
+            "Не сдано в канц.\nсвыше срока", "Не сдано в канц. свыше срока",
+            tooltip="Количество дел, не сданных в канцелярию\nсвыше установленного срока\nв этой неделе",
+        ),
+        Count(
+            "Нарушений сдачи в канц.\nс нач. года", "Нарушений сдачи в канц. с нач. года",
+            tooltip="Количество нарушений сроков\nсдачи дел в канцелярию\nс начала года",
+        ),
+    ]
@@ -3,6 +3,10 @@ from typing import List, Set
 from app.constants.pkl_mapping import PKL_MAPPING
 
 
+# псевдо-суд: сводка по всем судам (app.repository.region)
+ALL_COURTS = "Все суды"
+
+
 class BasesRepository:
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
@@ -18,7 +22,13 @@ class BasesRepository:
         ])
 
     def get_pkl_files(self, court_name: str) -> List[str]:
-        """Список .pkl файлов для суда"""
+        """Список .pkl файлов для суда (для ALL_COURTS — всех судов)"""
+        if court_name == ALL_COURTS:
+            return sorted({
+                f for court in self.get_courts()
+                for f in self.get_pkl_files(court)
+            })
+
         court_dir = os.path.join(self.base_dir, court_name)
         if not os.path.exists(court_dir):
             return []
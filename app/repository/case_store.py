@@ -0,0 +1,387 @@
+'''Case store — «строки дел без повторов, через mmap»
+
+Одно и то же дело ("2-123/2025, ...") повторяется в pkl
+десятки раз: по неделям и по категориям. Файл-спутник
+хранит каждую строку один раз, а ячейки
+(неделя, судья, категория) — как списки номеров строк:
+
+result4_with_2.pkl
+result4_with_2.pkl.cases   ← таблица строк + номера дел по ячейкам
+
+Файл открывается через mmap: в память попадают только
+те страницы, которые реально читаются, а CaseStore
+возвращает представления (views) без копирования массивов.
+
+CaseStore ведёт себя как raw_data:
+store[week_key][judge][category] → CaseList (len / итерация / индекс)
+
+case_entries() — все появления строк дел (CaseEntries) прямо
+по массивам ячеек — для истории дел и поиска по тексту.
+'''
+
+import mmap
+import pickle
+import struct
+from array import array
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from app.domain.case_entries import CaseEntries
+from app.domain.count_cube import CASE_LIST_TYPES
+from app.repository.count_cache import sidecar_writer, source_signature
+
+
+STORE_SUFFIX = ".cases"
+STORE_VERSION = 1
+
+_MAGIC = b"AKCS"
+# magic, version, mtime_ns, size, meta_offset, meta_length
+_HEADER = struct.Struct("<4sIqqQQ")
+
+_ABSENT = -1  # категории нет у судьи в этой неделе
+
+
+def store_path_for(pkl_path):
+    return pkl_path + STORE_SUFFIX
+
+
+# ---------- запись ----------
+
+def write_case_store(raw_data, path, signature):
+    weeks = list(raw_data.keys())
+
+    judges, judge_pos = [], {}
+    categories, category_pos = [], {}
+
+    for week_data in raw_data.values():
+        for judge, judge_data in week_data.items():
+            if judge not in judge_pos:
+                judge_pos[judge] = len(judges)
+                judges.append(judge)
+            for category in judge_data:
+                if category not in category_pos:
+                    category_pos[category] = len(categories)
+                    categories.append(category)
+
+    shape = (len(weeks), len(judges), len(categories))
+    cell_start = np.zeros(shape, dtype=np.uint32)
+    cell_length = np.full(shape, _ABSENT, dtype=np.int32)
+
+    string_ids = {}
+    string_offsets = array("Q", [0])
+    blob = bytearray()
+    case_ids = array("I")
+    week_order = []
+
+    for w, week_data in enumerate(raw_data.values()):
+        order = []
+
+        for judge, judge_data in week_data.items():
+            j = judge_pos[judge]
+            order.append(j)
+
+            for category, cases in judge_data.items():
+                # не список дел — ячейка пустая (_ABSENT), как без категории
+                if not isinstance(cases, CASE_LIST_TYPES):
+                    continue
+
+                c = category_pos[category]
+                cell_start[w, j, c] = len(case_ids)
+                cell_length[w, j, c] = len(cases)
+
+                for case in cases:
+                    case_id = string_ids.get(case)
+                    if case_id is None:
+                        case_id = len(string_ids)
+                        string_ids[case] = case_id
+                        blob += case.encode("utf-8")
+                        string_offsets.append(len(blob))
+                    case_ids.append(case_id)
+
+        week_order.append(order)
+
+    sections = [
+        ("blob", bytes(blob), np.uint8, len(blob)),
+        ("string_offsets", string_offsets.tobytes(), np.uint64, len(string_offsets)),
+        ("case_ids", case_ids.tobytes(), np.uint32, len(case_ids)),
+        ("cell_start", cell_start.tobytes(), np.uint32, cell_start.size),
+        ("cell_length", cell_length.tobytes(), np.int32, cell_length.size),
+    ]
+
+    with sidecar_writer(path) as f:
+        f.write(b"\0" * _HEADER.size)
+
+        layout = {}
+        for name, data, dtype, count in sections:
+            # выравнивание по 8 байт — np.frombuffer по mmap без копий
+            f.write(b"\0" * (-f.tell() % 8))
+            layout[name] = (f.tell(), np.dtype(dtype).str, count)
+            f.write(data)
+
+        meta = pickle.dumps({
+            "weeks": weeks,
+            "judges": judges,
+            "categories": categories,
+            "week_order": week_order,
+            "layout": layout,
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+
+        meta_offset = f.tell()
+        f.write(meta)
+
+        f.seek(0)
+        f.write(_HEADER.pack(
+            _MAGIC, STORE_VERSION,
+            signature[0], signature[1],
+            meta_offset, len(meta),
+        ))
+
+
+def case_store_is_current(path, signature):
+    """Есть ли актуальный файл (проверяется только заголовок)"""
+    try:
+        with open(path, "rb") as f:
+            magic, version, mtime_ns, size, _, _ = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return False
+
+    return (
+        magic == _MAGIC
+        and version == STORE_VERSION
+        and (mtime_ns, size) == tuple(signature)
+    )
+
+
+# ---------- чтение ----------
+
+class CaseList(Sequence):
+    """Список дел одной ячейки: строки декодируются при обращении"""
+
+    __slots__ = ("_store", "case_ids")
+
+    def __init__(self, store, case_ids):
+        self._store = store
+        self.case_ids = case_ids  # view на uint32 в mmap
+
+    def __len__(self):
+        return len(self.case_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.case_string(i) for i in self.case_ids[index].tolist()]
+        return self._store.case_string(int(self.case_ids[index]))
+
+    def __iter__(self):
+        case_string = self._store.case_string
+        for case_id in self.case_ids.tolist():
+            yield case_string(case_id)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, CaseList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "CaseList(%d)" % len(self)
+
+
+class JudgeCases(Mapping):
+    """category → CaseList для одного судьи в одной неделе"""
+
+    __slots__ = ("_store", "_w", "_j")
+
+    def __init__(self, store, w, j):
+        self._store = store
+        self._w = w
+        self._j = j
+
+    def __getitem__(self, category):
+        c = self._store._category_pos.get(category)
+        if c is None:
+            raise KeyError(category)
+
+        cases = self._store.cell(self._w, self._j, c)
+        if cases is None:
+            raise KeyError(category)
+        return cases
+
+    def __iter__(self):
+        lengths = self._store._cell_length[self._w, self._j]
+        categories = self._store.categories
+        for c in np.flatnonzero(lengths != _ABSENT).tolist():
+            yield categories[c]
+
+    def __len__(self):
+        return int((self._store._cell_length[self._w, self._j] != _ABSENT).sum())
+
+
+class WeekCases(Mapping):
+    """judge → JudgeCases для одной недели"""
+
+    __slots__ = ("_store", "_w", "_judges")
+
+    def __init__(self, store, w):
+        self._store = store
+        self._w = w
+        self._judges = store._week_judges[w]  # judge → j, в порядке pkl
+
+    def __getitem__(self, judge):
+        return JudgeCases(self._store, self._w, self._judges[judge])
+
+    def __iter__(self):
+        return iter(self._judges)
+
+    def __len__(self):
+        return len(self._judges)
+
+    def __contains__(self, judge):
+        return judge in self._judges
+
+
+class CaseStore(Mapping):
+    """week_key → WeekCases поверх mmap-файла"""
+
+    def __init__(self, path):
+        self.path = path
+
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+
+        _, _, _, _, meta_offset, meta_length = _HEADER.unpack_from(self._mm, 0)
+        meta = pickle.loads(self._mm[meta_offset:meta_offset + meta_length])
+
+        self.weeks = meta["weeks"]
+        self.judges = meta["judges"]
+        self.categories = meta["categories"]
+
+        self._week_pos = {w: i for i, w in enumerate(self.weeks)}
+        self._category_pos = {c: i for i, c in enumerate(self.categories)}
+        self._week_judges = [
+            {self.judges[j]: j for j in order}
+            for order in meta["week_order"]
+        ]
+
+        arrays = {
+            name: np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=offset)
+            for name, (offset, dtype, count) in meta["layout"].items()
+        }
+
+        shape = (len(self.weeks), len(self.judges), len(self.categories))
+
+        self._blob_offset = meta["layout"]["blob"][0]
+        self._string_offsets = arrays["string_offsets"]
+        self._case_ids = arrays["case_ids"]
+        self._cell_start = arrays["cell_start"].reshape(shape)
+        self._cell_length = arrays["cell_length"].reshape(shape)
+
+    @classmethod
+    def open(cls, path, signature):
+        """CaseStore; None — если файла нет, он битый или устарел"""
+        if not case_store_is_current(path, signature):
+            return None
+
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            return None
+
+    def close(self):
+        # массивы-представления держат mmap — сначала отпускаем их
+        self._string_offsets = self._case_ids = None
+        self._cell_start = self._cell_length = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # на mmap ещё ссылаются CaseList — закроется сборщиком мусора
+            pass
+        self._file.close()
+
+    # ---------- Mapping ----------
+
+    def __getitem__(self, week_key):
+        return WeekCases(self, self._week_pos[week_key])
+
+    def __iter__(self):
+        return iter(self.weeks)
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def __contains__(self, week_key):
+        return week_key in self._week_pos
+
+    # ---------- ячейки и строки ----------
+
+    def cell(self, w, j, c):
+        """CaseList ячейки или None, если категории нет"""
+        length = int(self._cell_length[w, j, c])
+        if length == _ABSENT:
+            return None
+
+        start = int(self._cell_start[w, j, c])
+        return CaseList(self, self._case_ids[start:start + length])
+
+    def case_string(self, case_id):
+        start = self._blob_offset + int(self._string_offsets[case_id])
+        end = self._blob_offset + int(self._string_offsets[case_id + 1])
+        return self._mm[start:end].decode("utf-8")
+
+    @property
+    def string_count(self):
+        return len(self._string_offsets) - 1
+
+    # ---------- все появления ----------
+
+    def case_entries(self):
+        """CaseEntries всех недель — без обхода ячеек в Python"""
+        lengths = self._cell_length
+        filled = lengths > 0
+
+        weeks, judges, categories = np.nonzero(filled)
+        starts = self._cell_start[filled].astype(np.int64)
+        counts = lengths[filled].astype(np.int64)
+
+        # ячейка каждого появления и его место внутри ячейки
+        cell_of = np.repeat(np.arange(len(counts)), counts)
+        inside = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        return CaseEntries(
+            [self.case_string(i) for i in range(self.string_count)],
+            self._case_ids[starts[cell_of] + inside],
+            weeks[cell_of],
+            judges[cell_of],
+            categories[cell_of],
+            self.weeks,
+            self.judges,
+            self.categories,
+        )
+
+
+def load_case_store(pkl_path, load_raw_data):
+    """
+    CaseStore для .pkl.
+
+    Если файла нет или он устарел — .pkl распаковывается
+    (load_raw_data) и файл строится заново. Если записать
+    рядом с .pkl нельзя — возвращается обычный raw_data.
+    """
+    signature = source_signature(pkl_path)
+    path = store_path_for(pkl_path)
+
+    store = CaseStore.open(path, signature)
+    if store is not None:
+        return store
+
+    raw_data = load_raw_data()
+    try:
+        write_case_store(raw_data, path, signature)
+    except OSError:
+        return raw_data
+
+    store = CaseStore.open(path, signature)
+    return store if store is not None else raw_data
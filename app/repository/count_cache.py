@@ -0,0 +1,129 @@
+'''Count cache — «сколько дел, без самих дел»
+
+Таблица и график используют только len(cases) по
+(неделя, судья, категория). Чтобы не распаковывать
+весь .pkl с сетевого диска при каждом открытии суда,
+рядом с .pkl сохраняется файл-спутник:
+
+result4_with_2.pkl
+result4_with_2.pkl.counts.npz   ← плотный массив счётчиков
+
+Внутри:
+counts     int32 [неделя × судья × категория]
+weeks / judges / categories — словари осей (строки)
+week_order — порядок судей внутри каждой недели (как в pkl)
+source     — mtime / size исходного .pkl
+
+Если .pkl изменился (mtime или размер) — кэш пересобирается.
+'''
+
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.domain.count_cube import CountCube
+
+
+CACHE_SUFFIX = ".counts.npz"
+CACHE_VERSION = 1
+
+
+def source_signature(pkl_path):
+    """(mtime_ns, size) исходного файла — признак актуальности кэшей"""
+    st = os.stat(pkl_path)
+    return st.st_mtime_ns, st.st_size
+
+
+def cache_path_for(pkl_path):
+    return pkl_path + CACHE_SUFFIX
+
+
+@contextmanager
+def sidecar_writer(path):
+    """
+    Файл для записи спутника .pkl (кэш, недели, строки дел).
+
+    Пишется во временный файл и подменяет path целиком — соседний
+    процесс никогда не прочитает недописанный файл. Один спутник
+    могут строить одновременно GUI, пул и процессы пакетного
+    экспорта — у каждого свой .tmp; при ошибке он удаляется.
+    """
+    tmp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_count_cube(path, signature):
+    """Читает кэш; None — если файла нет, он битый или устарел"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            if int(npz["version"]) != CACHE_VERSION:
+                return None
+            if tuple(int(x) for x in npz["source"]) != tuple(signature):
+                return None
+
+            return CountCube(
+                npz["weeks"].tolist(),
+                npz["judges"].tolist(),
+                npz["categories"].tolist(),
+                npz["counts"],
+                npz["week_order"],
+                npz["week_offsets"],
+            )
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_count_cube(cube, path, signature):
+    with sidecar_writer(path) as f:
+        np.savez(
+            f,
+            version=np.array(CACHE_VERSION),
+            source=np.array(signature, dtype=np.int64),
+            weeks=np.array(cube.weeks, dtype=str),
+            judges=np.array(cube.judges, dtype=str),
+            categories=np.array(cube.categories, dtype=str),
+            counts=cube.counts,
+            week_order=cube.week_order,
+            week_offsets=cube.week_offsets,
+        )
+
+
+def load_count_cache(pkl_path, load_raw_data):
+    """
+    Возвращает CountCube для .pkl.
+
+    load_raw_data — функция, распаковывающая .pkl;
+    вызывается только если кэша нет или он устарел.
+    """
+    signature = source_signature(pkl_path)
+    path = cache_path_for(pkl_path)
+
+    cube = read_count_cube(path, signature)
+    if cube is not None:
+        return cube
+
+    cube = CountCube.from_raw_data(load_raw_data())
+
+    try:
+        write_count_cube(cube, path, signature)
+    except OSError:
+        # папка суда может быть только для чтения — работаем без кэша
+        pass
+
+    return cube
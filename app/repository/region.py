@@ -0,0 +1,111 @@
+'''Region — «один тип .pkl по всем судам сразу»
+
+RegionRepository.load_counts("result4_with_2.pkl") →
+RegionCube по всем папкам bases/, где такой файл есть.
+
+Память:
+- из каждого суда берётся только CountCube (количества);
+  строки дел в основной процесс не попадают;
+- суды с актуальным кэшем счётчиков (.counts.npz)
+  читаются сразу, без распаковки .pkl;
+- остальные .pkl распаковываются в отдельных процессах
+  (не больше max_workers одновременно) — процесс отдаёт
+  назад только куб и освобождает память pkl;
+- кубы судов складываются в общий массив по мере
+  готовности (RegionCubeBuilder).
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.domain.region_cube import RegionCubeBuilder
+from app.repository.count_cache import cache_path_for, read_count_cube, source_signature
+from app.repository.statistics import StatisticsRepository
+
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def load_court_counts(pkl_path):
+    """CountCube одного .pkl — выполняется в процессе пула"""
+    counts, _ = StatisticsRepository().load_counts(pkl_path)
+    return counts
+
+
+def default_max_workers():
+    return max(1, min(DEFAULT_MAX_WORKERS, (os.cpu_count() or 2) - 1))
+
+
+class RegionRepository:
+    def __init__(self, bases_repo, max_workers=None):
+        self.bases_repo = bases_repo
+        self.max_workers = max_workers or default_max_workers()
+
+    def court_paths(self, pkl_name):
+        """[(суд, путь к pkl)] — суды, у которых есть такой файл"""
+        return [
+            (court, self.bases_repo.get_pkl_path(court, pkl_name))
+            for court in self.bases_repo.get_courts()
+            if pkl_name in self.bases_repo.get_pkl_files(court)
+        ]
+
+    def signature(self, pkl_name):
+        """Признак актуальности сводки: (суд, mtime_ns, size) всех файлов"""
+        return tuple(
+            (court,) + source_signature(path)
+            for court, path in self.court_paths(pkl_name)
+        )
+
+    def load_counts(self, pkl_name, token=None, progress=None):
+        """
+        RegionCube по всем судам с файлом pkl_name
+
+        token    — CancelToken: проверяется после каждого суда
+        progress — progress(готово, всего), вызывается из того же потока
+        """
+        paths = self.court_paths(pkl_name)
+        builder = RegionCubeBuilder()
+
+        def done(court, cube):
+            builder.add(court, cube)
+            if progress is not None:
+                progress(len(builder), len(paths))
+
+        # 1. кэш счётчиков актуален — pkl не нужен
+        pending = []
+        for court, path in paths:
+            if token is not None:
+                token.check()
+
+            cube = read_count_cube(cache_path_for(path), source_signature(path))
+            if cube is None:
+                pending.append((court, path))
+            else:
+                done(court, cube)
+
+        # 2. остальные суды — распаковка pkl в процессах
+        if pending:
+            self._load_in_processes(pending, done, token)
+
+        return builder.build([court for court, _ in paths])
+
+    def _load_in_processes(self, pending, done, token):
+        executor = ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending)))
+        futures = {}
+
+        try:
+            futures = {
+                executor.submit(load_court_counts, path): court
+                for court, path in pending
+            }
+
+            for future in as_completed(futures):
+                if token is not None:
+                    token.check()
+                done(futures[future], future.result())
+
+        finally:
+            # при отмене/ошибке — не ждём ещё не начатые суды
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
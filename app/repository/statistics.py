@@ -15,23 +15,128 @@ Repository:
 не знает, что такое GPK
 не знает, как строится таблица
 он просто возвращает данные + контекст
+
+load_counts — то же самое, но вместо строк дел
+возвращает CountCube (только количества), который
+кэшируется рядом с .pkl и не требует распаковки pkl.
+
+Режимы load():
+MODE_FULL  — весь pkl в память (как раньше)
+MODE_WEEKS — pkl режется на недели, неделя читается
+             при первом обращении (WeekChunkStore, LRU)
+MODE_MMAP  — строки дел без повторов в mmap-файле,
+             ячейки отдаются представлениями (CaseStore)
+
+load_case_entries — все появления строк дел (CaseEntries) для
+истории дел и поиска; вызывается в фоне — открывает свои
+данные и закрывает их.
 '''
 
 import os
 import pickle
 from app.constants.pkl_mapping import get_pkl_info
+from app.domain.case_entries import CaseEntries
 from app.domain.context import DataContext
+from app.repository.count_cache import load_count_cache, source_signature
+from app.repository.case_store import (
+    CaseStore,
+    case_store_is_current,
+    load_case_store,
+    store_path_for,
+    write_case_store,
+)
+from app.repository.week_chunks import (
+    DEFAULT_MAX_WEEKS,
+    chunks_path_for,
+    load_week_chunks,
+    read_week_index,
+    write_week_chunks,
+)
+
+
+MODE_FULL = "full"
+MODE_WEEKS = "weeks"
+MODE_MMAP = "mmap"
 
 
 class StatisticsRepository:
 
+    def __init__(self, mode=MODE_FULL, max_cached_weeks=DEFAULT_MAX_WEEKS):
+        if mode not in (MODE_FULL, MODE_WEEKS, MODE_MMAP):
+            raise ValueError("Неизвестный режим загрузки: %s" % mode)
+
+        self.mode = mode
+        self.max_cached_weeks = max_cached_weeks
+
     def load(self, pkl_path):
+        return self._load_raw_data(pkl_path), self._context_for(pkl_path)
+
+    def load_counts(self, pkl_path):
+        counts = load_count_cache(
+            pkl_path,
+            lambda: self._read_pkl_for_counts(pkl_path)
+        )
+
+        return counts, self._context_for(pkl_path)
+
+    def load_case_entries(self, pkl_path):
+        """CaseEntries для .pkl"""
+        raw_data = self._load_raw_data(pkl_path)
+
+        if isinstance(raw_data, CaseStore):
+            try:
+                return raw_data.case_entries()
+            finally:
+                raw_data.close()
+
+        return CaseEntries.from_raw_data(raw_data)
+
+    def _load_raw_data(self, pkl_path):
+        read_pkl = lambda: self._read_pkl(pkl_path)
+
+        if self.mode == MODE_WEEKS:
+            raw_data = load_week_chunks(
+                pkl_path,
+                read_pkl,
+                max_weeks=self.max_cached_weeks,
+            )
+        elif self.mode == MODE_MMAP:
+            raw_data = load_case_store(pkl_path, read_pkl)
+        else:
+            raw_data = read_pkl()
+
+        return raw_data
+
+    def _read_pkl_for_counts(self, pkl_path):
+        raw_data = self._read_pkl(pkl_path)
+
+        # pkl уже распакован ради счётчиков — заодно строим файл-спутник
+        # со строками дел, чтобы детализация потом не распаковывала его снова
+        signature = source_signature(pkl_path)
+
+        try:
+            if self.mode == MODE_WEEKS:
+                path = chunks_path_for(pkl_path)
+                if read_week_index(path, signature) is None:
+                    write_week_chunks(raw_data, path, signature)
+
+            elif self.mode == MODE_MMAP:
+                path = store_path_for(pkl_path)
+                if not case_store_is_current(path, signature):
+                    write_case_store(raw_data, path, signature)
+        except OSError:
+            pass
+
+        return raw_data
+
+    @staticmethod
+    def _read_pkl(pkl_path):
         with open(pkl_path, "rb") as f:
-            raw_data = pickle.load(f)
+            return pickle.load(f)
 
+    @staticmethod
+    def _context_for(pkl_path):
         pkl_name = os.path.basename(pkl_path)
         pkl_info = get_pkl_info(pkl_name)
 
-        context = DataContext.from_pkl_info(pkl_info)
-
-        return raw_data, context
+        return DataContext.from_pkl_info(pkl_info)
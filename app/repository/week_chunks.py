@@ -0,0 +1,141 @@
+'''Week chunks — «строки дел по одной неделе»
+
+Детализации нужны строки дел только одной недели.
+.pkl один раз разрезается на куски по неделям:
+
+result4_with_2.pkl
+result4_with_2.pkl.weeks   ← [неделя 1][неделя 2]...[индекс][offset индекса]
+
+Индекс — список (week_key, offset, length) + mtime / size .pkl.
+WeekChunkStore ведёт себя как raw_data (dict неделя → данные),
+но читает неделю с диска при первом обращении и держит
+в памяти не больше max_weeks последних недель (LRU).
+'''
+
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from app.repository.count_cache import sidecar_writer, source_signature
+
+
+CHUNKS_SUFFIX = ".weeks"
+CHUNKS_VERSION = 1
+
+DEFAULT_MAX_WEEKS = 8
+
+_FOOTER = struct.Struct("<Q")
+
+
+def chunks_path_for(pkl_path):
+    return pkl_path + CHUNKS_SUFFIX
+
+
+def write_week_chunks(raw_data, path, signature):
+    index = []
+
+    with sidecar_writer(path) as f:
+        for week_key, week_data in raw_data.items():
+            chunk = pickle.dumps(week_data, protocol=pickle.HIGHEST_PROTOCOL)
+            index.append((week_key, f.tell(), len(chunk)))
+            f.write(chunk)
+
+        index_offset = f.tell()
+        pickle.dump(
+            {"version": CHUNKS_VERSION, "source": tuple(signature), "weeks": index},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        f.write(_FOOTER.pack(index_offset))
+
+
+def read_week_index(path, signature):
+    """Индекс недель; None — если файла нет, он битый или устарел"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            f.seek(-_FOOTER.size, os.SEEK_END)
+            (index_offset,) = _FOOTER.unpack(f.read(_FOOTER.size))
+            f.seek(index_offset)
+            index = pickle.load(f)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError, struct.error):
+        return None
+
+    if index.get("version") != CHUNKS_VERSION:
+        return None
+    if tuple(index.get("source", ())) != tuple(signature):
+        return None
+
+    return index["weeks"]
+
+
+class WeekChunkStore(Mapping):
+    def __init__(self, path, week_index, max_weeks=DEFAULT_MAX_WEEKS):
+        self.path = path
+        self.max_weeks = max_weeks
+
+        # week_key → (offset, length), порядок недель как в pkl
+        self._offsets = OrderedDict(
+            (week_key, (offset, length)) for week_key, offset, length in week_index
+        )
+        self._loaded = OrderedDict()
+
+    def __getitem__(self, week_key):
+        if week_key in self._loaded:
+            self._loaded.move_to_end(week_key)
+            return self._loaded[week_key]
+
+        offset, length = self._offsets[week_key]
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            week_data = pickle.loads(f.read(length))
+
+        self._loaded[week_key] = week_data
+        while len(self._loaded) > self.max_weeks:
+            self._loaded.popitem(last=False)
+
+        return week_data
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __contains__(self, week_key):
+        return week_key in self._offsets
+
+    def keys(self):
+        return self._offsets.keys()
+
+
+def load_week_chunks(pkl_path, load_raw_data, max_weeks=DEFAULT_MAX_WEEKS):
+    """
+    WeekChunkStore для .pkl.
+
+    Если файла с кусками нет или он устарел — .pkl распаковывается
+    (load_raw_data) и режется заново. Если записать рядом с .pkl
+    нельзя — возвращается обычный raw_data.
+    """
+    signature = source_signature(pkl_path)
+    path = chunks_path_for(pkl_path)
+
+    week_index = read_week_index(path, signature)
+
+    if week_index is None:
+        raw_data = load_raw_data()
+        try:
+            write_week_chunks(raw_data, path, signature)
+        except OSError:
+            return raw_data
+
+        week_index = read_week_index(path, signature)
+        if week_index is None:
+            return raw_data
+
+    return WeekChunkStore(path, week_index, max_weeks=max_weeks)
@@ -5,11 +5,20 @@ from PyQt5.QtWidgets import (
     QDateEdit
 )
 from PyQt5.QtGui import QColor
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.cm as cm
-from datetime import datetime
+import numpy as np
+from app.domain.chart_window import ChartWindows
+from app.domain.point_index import PointIndex
+from app.domain.week_index import WeekIndex
+
+
+SERIES_CACHE_SIZE = 256  # (категория, диапазон недель) — сколько серий держать
+HOVER_RADIUS = 6         # pt — как picker у линий
+POINT_WIDTH = 16         # px на точку оси X — больше точек недели собираются в месяцы / кварталы
+MIN_POINTS = 26
 
 
 class ClickableLabel(QLabel):
@@ -60,19 +69,39 @@ class GraphWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self.raw_data = None
+        self.counts = None
         self.processor = None
         self.weeks = []
+        self.weeks_index = WeekIndex([])
+        self._windows = ChartWindows(self.weeks_index)
+        self._week_pos = []
         self._week_dates = []
         self.judge_colors = {}
         self.category_colors = {}
         self._user_range_selected = False
         self._hover_annotation = None
+        self._hover_point = None       # (подпись, номер точки) под курсором
+        self._hover_background = None  # снимок фигуры без подсказки (blit)
+        self._hover_labels = []        # подписи видимых линий
+        self._hover_values = np.zeros((0, 0))  # их значения [линия × неделя]
+        self._plot_window = None       # ChartWindow, по которому построен график
         self._pan_start = None
         self._pan_xlim = None
         self._pan_ylim = None
         self._dark_mode = False
 
+        self._lines = {}          # подпись → Line2D текущего графика
+        self._series_cache = {}   # (категория, недели) → {судья: значения}
+        self._totals_cache = {}   # (категория, недели) → сумма по судьям
+        self._point_cache = {}    # (категория, недели, точка) → PointIndex
+        self._rebuild_pending = False
+
+        # все перерисовки за такт цикла событий — одна
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(0)
+        self._redraw_timer.timeout.connect(self._flush_chart)
+
         self._init_ui()
 
     # ---------------- UI ---------------
@@ -88,6 +117,7 @@ class GraphWidget(QWidget):
         left_panel.addWidget(self.compare_mode)
 
         self.category_combo = QComboBox()
+        self.category_combo.currentIndexChanged.connect(self._fill_judges)
         self.category_combo.currentIndexChanged.connect(self.update_chart)
         left_panel.addWidget(self.category_combo)
 
@@ -124,6 +154,7 @@ class GraphWidget(QWidget):
         self.canvas.mpl_connect("button_press_event", self._on_press)
         self.canvas.mpl_connect("button_release_event", self._on_release)
         self.canvas.mpl_connect("motion_notify_event", self._on_pan_motion)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
 
         layout.addLayout(left_panel, 1)
         layout.addWidget(self.canvas, 5)
@@ -132,30 +163,25 @@ class GraphWidget(QWidget):
 
     def apply_light_style(self):
         self._dark_mode = False
-
-        self.figure.patch.set_facecolor("#ffffff")
-
-        if hasattr(self, "ax"):
-            self.ax.set_facecolor("#ffffff")
-
-            self.ax.tick_params(colors="#2b2b2b")
-            self.ax.xaxis.label.set_color("#2b2b2b")
-            self.ax.yaxis.label.set_color("#2b2b2b")
-            self.ax.title.set_color("#2b2b2b")
-
-            for spine in self.ax.spines.values():
-                spine.set_color("#cccccc")
-
-            self.ax.grid(True, color="#dddddd", alpha=0.6)
-
+        self._apply_style()
         self.canvas.draw_idle()
 
     def apply_dark_style(self):
         self._dark_mode = True
+        self._apply_style()
+        self.canvas.draw_idle()
 
-        self.figure.patch.set_facecolor("#2b2b2b")
+    def _apply_style(self):
+        """Цвета фигуры и осей по текущей теме (без перерисовки)"""
+        if self._dark_mode:
+            self.figure.patch.set_facecolor("#2b2b2b")
+        else:
+            self.figure.patch.set_facecolor("#ffffff")
 
-        if hasattr(self, "ax"):
+        if not hasattr(self, "ax"):
+            return
+
+        if self._dark_mode:
             self.ax.set_facecolor("#2f3133")
 
             self.ax.tick_params(colors="#e6e6e6")
@@ -167,8 +193,18 @@ class GraphWidget(QWidget):
                 spine.set_color("#555555")
 
             self.ax.grid(True, color="#444444", alpha=0.5)
+        else:
+            self.ax.set_facecolor("#ffffff")
 
-        self.canvas.draw_idle()
+            self.ax.tick_params(colors="#2b2b2b")
+            self.ax.xaxis.label.set_color("#2b2b2b")
+            self.ax.yaxis.label.set_color("#2b2b2b")
+            self.ax.title.set_color("#2b2b2b")
+
+            for spine in self.ax.spines.values():
+                spine.set_color("#cccccc")
+
+            self.ax.grid(True, color="#dddddd", alpha=0.6)
 
     def _toggle_all_generic(self, state, target_list):
 
@@ -187,7 +223,7 @@ class GraphWidget(QWidget):
             widget.checkbox.setChecked(checked)
             widget.checkbox.blockSignals(False)
 
-        self.update_chart()
+        self._update_visibility()
 
     def _add_bottom_controls(self, target_list, mode="judges"):
 
@@ -198,7 +234,7 @@ class GraphWidget(QWidget):
 
             total_widget.color_label.hide()
             total_widget.checkbox.setChecked(True)
-            total_widget.checkbox.stateChanged.connect(self.update_chart)
+            total_widget.checkbox.stateChanged.connect(self._update_visibility)
 
             total_item.setSizeHint(total_widget.sizeHint())
             target_list.addItem(total_item)
@@ -224,18 +260,18 @@ class GraphWidget(QWidget):
         if not hasattr(self, "ax"):
             return
 
-        week_indexes = self._get_filtered_weeks()
-        if not week_indexes:
+        if not self._plot_window:
             return
 
         # --- Сброс X ---
-        self.ax.set_xlim(0, len(week_indexes) - 1)
+        self.ax.set_xlim(0, len(self._plot_window) - 1)
 
         # --- Сброс Y ---
         y_values = []
 
         for line in self.ax.get_lines():
-            y_values.extend(line.get_ydata())
+            if line.get_visible():
+                y_values.extend(line.get_ydata())
 
         if y_values:
             y_min = min(y_values)
@@ -330,85 +366,152 @@ class GraphWidget(QWidget):
 
         self.canvas.draw_idle()
 
+    # ---------------- HOVER ----------------
+    #
+    # Подсказка рисуется поверх снимка фигуры (blit): движение мыши
+    # не перерисовывает график. Точка под курсором ищется по номеру
+    # недели (x — целые 0..n-1): сравниваются только точки двух
+    # ближайших столбцов, а не все линии целиком.
+
+    def _on_draw(self, event):
+        # после любой полной отрисовки — новый снимок (подсказка animated,
+        # в снимок не попадает) и подсказка поверх
+        self._hover_background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+        if self._hover_annotation is not None and self._hover_annotation.get_visible():
+            self.figure.draw_artist(self._hover_annotation)
+
+    def _update_hover_index(self):
+        """Значения видимых линий — для поиска точки под курсором"""
+        lines = [
+            (label, line) for label, line in self._lines.items()
+            if line.get_visible()
+        ]
+
+        self._hover_labels = [label for label, _ in lines]
+        self._hover_values = np.array(
+            [line.get_ydata() for _, line in lines],
+            dtype=float
+        ).reshape(len(lines), len(self._plot_window or ()))
+
+    def _find_hover_point(self, event):
+        """(номер линии, номер недели) ближайшей точки в радиусе HOVER_RADIUS"""
+        if not self._hover_labels or event.xdata is None:
+            return None
+
+        n = self._hover_values.shape[1]
+        left = int(np.floor(event.xdata))
+        columns = [i for i in (left, left + 1) if 0 <= i < n]
+        if not columns:
+            return None
+
+        lines = len(self._hover_labels)
+        xs = np.repeat(columns, lines)
+        ys = self._hover_values[:, columns].T.ravel()
+
+        points = self.ax.transData.transform(np.column_stack([xs, ys]))
+        distances = np.hypot(points[:, 0] - event.x, points[:, 1] - event.y)
+
+        best = int(np.argmin(distances))
+        radius = HOVER_RADIUS * self.figure.dpi / 72
+
+        if distances[best] > radius:
+            return None
+
+        return best % lines, columns[best // lines]
+
     def _on_hover(self, event):
 
         if not hasattr(self, "ax"):
             return
 
-        if event.inaxes != self.ax:
-            if self._hover_annotation:
-                self._hover_annotation.set_visible(False)
-                self.canvas.draw_idle()
+        # во время панорамирования график и так перерисовывается
+        if self._pan_start is not None:
             return
 
-        found = False
+        found = None
+        if event.inaxes == self.ax:
+            found = self._find_hover_point(event)
 
-        xlim = self.ax.get_xlim()
-        ylim = self.ax.get_ylim()
+        point = None
+        if found is not None:
+            point = (self._hover_labels[found[0]], found[1])
 
-        for line in self.ax.get_lines():
+        # та же точка (или снова ничего) — рисовать нечего
+        if point == self._hover_point:
+            return
+        self._hover_point = point
 
-            contains, info = line.contains(event)
-            if not contains:
-                continue
+        if point is None:
+            self._hover_annotation.set_visible(False)
+            self._blit_hover()
+            return
 
-            ind = info["ind"][0]
-            x = line.get_xdata()[ind]
-            y = line.get_ydata()[ind]
+        line_no, ind = found
+        label = point[0]
 
-            week_indexes = self._get_filtered_weeks()
-            if not (0 <= ind < len(week_indexes)):
-                return
+        x = ind
+        y = self._hover_values[line_no, ind]
 
-            _, week_key = week_indexes[ind]
-            label = line.get_label()
+        week_key = self._plot_window.period(ind)
 
-            display_name = "Всего" if label == "__total__" else label
+        display_name = "Всего" if label == "__total__" else label
 
-            text = (
-                f"{display_name}\n"
-                f"{week_key}\n"
-                f"Значение: {int(y)}"
-            )
+        text = (
+            f"{display_name}\n"
+            f"{week_key}\n"
+            f"Значение: {int(y)}"
+        )
 
-            # 🔥 Определяем положение точки
-            x_mid = (xlim[0] + xlim[1]) / 2
-            y_mid = (ylim[0] + ylim[1]) / 2
+        # 🔥 Определяем положение точки
+        xlim = self.ax.get_xlim()
+        ylim = self.ax.get_ylim()
 
-            offset_x = 15 if x < x_mid else -120
-            offset_y = 15 if y < y_mid else -60
+        x_mid = (xlim[0] + xlim[1]) / 2
+        y_mid = (ylim[0] + ylim[1]) / 2
 
-            # для тёмной темы корректируем цвет
-            if self._dark_mode:
-                bbox_props = dict(boxstyle="round", fc="#3a3a3a", ec="#aaaaaa")
-                text_color = "#ffffff"
-            else:
-                bbox_props = dict(boxstyle="round", fc="white", ec="black")
-                text_color = "#000000"
-
-            if self._hover_annotation is None:
-                self._hover_annotation = self.ax.annotate(
-                    text,
-                    xy=(x, y),
-                    xytext=(offset_x, offset_y),
-                    textcoords="offset points",
-                    bbox=bbox_props,
-                    arrowprops=dict(arrowstyle="->"),
-                    color=text_color
-                )
-            else:
-                self._hover_annotation.xy = (x, y)
-                self._hover_annotation.set_text(text)
-                self._hover_annotation.set_position((offset_x, offset_y))
-                self._hover_annotation.set_visible(True)
+        offset_x = 15 if x < x_mid else -120
+        offset_y = 15 if y < y_mid else -60
 
-            found = True
-            break
+        # для тёмной темы корректируем цвет
+        if self._dark_mode:
+            bbox_props = dict(boxstyle="round", fc="#3a3a3a", ec="#aaaaaa")
+            text_color = "#ffffff"
+        else:
+            bbox_props = dict(boxstyle="round", fc="white", ec="black")
+            text_color = "#000000"
+
+        if self._hover_annotation is None:
+            self._hover_annotation = self.ax.annotate(
+                text,
+                xy=(x, y),
+                xytext=(offset_x, offset_y),
+                textcoords="offset points",
+                bbox=bbox_props,
+                arrowprops=dict(arrowstyle="->"),
+                color=text_color,
+                animated=True
+            )
+        else:
+            self._hover_annotation.xy = (x, y)
+            self._hover_annotation.set_text(text)
+            self._hover_annotation.set_position((offset_x, offset_y))
+            self._hover_annotation.set_visible(True)
 
-        if not found and self._hover_annotation:
-            self._hover_annotation.set_visible(False)
+        self._blit_hover()
 
-        self.canvas.draw_idle()
+    def _blit_hover(self):
+        # снимка ещё нет (график не успел отрисоваться) — обычная отрисовка
+        if self._hover_background is None:
+            self.canvas.draw_idle()
+            return
+
+        self.canvas.restore_region(self._hover_background)
+
+        if self._hover_annotation is not None and self._hover_annotation.get_visible():
+            self.figure.draw_artist(self._hover_annotation)
+
+        self.canvas.blit(self.figure.bbox)
 
     def _toggle_all_judges(self, state):
 
@@ -428,39 +531,43 @@ class GraphWidget(QWidget):
             widget.checkbox.setChecked(checked)
             widget.checkbox.blockSignals(False)
 
-        self.update_chart()
+        self._update_visibility()
 
     def _on_date_changed(self):
         self._user_range_selected = True
         self._fill_judges()
         self.update_chart()
 
-    def set_data(self, raw_data, processor):
-        self.raw_data = raw_data
+    def set_data(self, counts, processor, weeks=None):
+        """
+        counts — CountCube: графику нужны только количества,
+        строки дел не загружаются
+        weeks — WeekIndex этого pkl (если уже построен)
+        """
+        self.counts = counts
         self.processor = processor
+        self.weeks_index = weeks if weeks is not None else WeekIndex(counts.keys())
 
-        all_weeks = sorted(
-            raw_data.keys(),
-            key=lambda w: datetime.strptime(w.split(" - ")[0], "%d.%m.%Y")
-        )
+        self.weeks = self.weeks_index.sorted_keys
+
+        self._windows = ChartWindows(self.weeks_index)
+        self._series_cache.clear()
+        self._totals_cache.clear()
+        self._point_cache.clear()
 
-        self.weeks = all_weeks
+        # индекс отсортированной недели → позиция недели в кэше
+        self._week_pos = self.weeks_index.sorted_positions
 
         self._parse_week_dates()
 
         # 🚨 СНАЧАЛА создаём список имён
-        judges = set()
-        for week in self.raw_data.values():
-            judges.update(week.keys())
-
-        judges = sorted(judges)
+        judges = sorted(counts.judges)
 
         # 🚨 Назначаем цвета ДО создания виджетов
         self._assign_fixed_colors(judges)
 
         # Теперь создаём UI
         self._fill_categories()
-        self.category_combo.currentIndexChanged.connect(self._fill_judges)
         self._fill_judges()
 
         self.update_chart()
@@ -468,13 +575,8 @@ class GraphWidget(QWidget):
     # ---------------- DATA PREP ----------------
 
     def _parse_week_dates(self):
-        self._week_dates = []
-
-        for w in self.weeks:
-            start_str, end_str = w.split(" - ")
-            start = datetime.strptime(start_str, "%d.%m.%Y")
-            end = datetime.strptime(end_str, "%d.%m.%Y")
-            self._week_dates.append((start, end))
+        # даты уже разобраны в WeekIndex
+        self._week_dates = self.weeks_index.sorted_dates()
 
         if not self._week_dates:
             return
@@ -498,7 +600,7 @@ class GraphWidget(QWidget):
             self.date_to.blockSignals(False)
 
         # print("_parse_week_dates - WEEKS:", len(self.weeks))
-        # print("_parse_week_dates - FILTERED:", len(self._get_filtered_weeks()))
+        # print("_parse_week_dates - FILTERED:", len(self._window().weeks))
 
     def _fill_categories(self):
         # 🔥 сохраняем текущее состояние
@@ -508,8 +610,11 @@ class GraphWidget(QWidget):
             widget = self.categories_list.itemWidget(item)
             previous_state[widget.text_label.text()] = widget.checkbox.isChecked()
 
+        # судьи и график заполняются следом — сигналы смены категории не нужны
+        self.category_combo.blockSignals(True)
         self.category_combo.clear()
         self.category_combo.addItems(self.processor.categories)
+        self.category_combo.blockSignals(False)
 
         self.categories_list.clear()
 
@@ -529,11 +634,10 @@ class GraphWidget(QWidget):
             else:
                 widget.checkbox.setChecked(True)
 
-            widget.checkbox.stateChanged.connect(self.update_chart)
+            widget.checkbox.stateChanged.connect(self._update_visibility)
 
         self._update_select_all_state()
         self._add_bottom_controls(self.categories_list, mode="categories")
-        self.update_chart()
 
     def _fill_judges(self):
 
@@ -548,19 +652,9 @@ class GraphWidget(QWidget):
         self.judges_list.clear()
 
         category = self.category_combo.currentText()
-        judges = set()
-
-        week_indexes = self._get_filtered_weeks()
-
-        for _, week_key in week_indexes:
-            week_data = self.raw_data.get(week_key, {})
-
-            for judge, judge_data in week_data.items():
-                cases = judge_data.get(category, [])
-                if cases:
-                    judges.add(judge)
 
-        judges = sorted(judges)
+        # те же серии потом рисует график — считаются один раз
+        judges = list(self._judge_series(category, self._window()))
 
         for judge in judges:
             color = self.judge_colors.get(judge, (0.5, 0.5, 0.5))
@@ -578,10 +672,9 @@ class GraphWidget(QWidget):
             else:
                 widget.checkbox.setChecked(True)
 
-            widget.checkbox.stateChanged.connect(self.update_chart)
+            widget.checkbox.stateChanged.connect(self._update_visibility)
 
         self._add_bottom_controls(self.judges_list, mode="judges")
-        self.update_chart()
 
     def _update_select_all_state(self):
 
@@ -632,7 +725,8 @@ class GraphWidget(QWidget):
 
     # ---------------- FILTER ----------------
 
-    def _get_filtered_weeks(self):
+    def _window(self):
+        """ChartWindow выбранного диапазона дат (кэш — в ChartWindows)"""
         date_from = self.date_from.date().toPyDate()
         date_to = self.date_to.date().toPyDate()
 
@@ -647,16 +741,30 @@ class GraphWidget(QWidget):
             self.date_from.blockSignals(False)
             self.date_to.blockSignals(False)
 
-        result = []
+            date_from, date_to = date_to, date_from
+
+        return self._windows.get(date_from, date_to, self._max_points())
+
+    def _max_points(self):
+        """Сколько точек помещается по ширине холста"""
+        return max(MIN_POINTS, self.canvas.width() // POINT_WIDTH)
 
-        for i, (start, end) in enumerate(self._week_dates):
-            start_date = start.date()
-            end_date = end.date()
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+
+        # недели / месяцы / кварталы выбирались по прежней ширине —
+        # перестраиваем, только если по новой точки другие
+        window = self._plot_window
+        if window is None or window.key is None:
+            return
 
-            if start_date <= date_to and end_date >= date_from:
-                result.append((i, self.weeks[i]))
+        date_from, date_to, max_points = window.key
+        if max_points == self._max_points():
+            return
 
-        return result
+        resized = self._windows.get(date_from, date_to, self._max_points())
+        if resized.step != window.step or len(resized) != len(window):
+            self.update_chart()
 
     def _get_selected_judges(self):
         judges = []
@@ -670,50 +778,110 @@ class GraphWidget(QWidget):
 
         return judges
 
+    def _get_selected_categories(self):
+        return [
+            self.categories_list.itemWidget(
+                self.categories_list.item(i)
+            ).text_label.text()
+            for i in range(self.categories_list.count())
+            if self.categories_list.itemWidget(
+                self.categories_list.item(i)
+            ).checkbox.isChecked()
+        ]
+
     # ---------------- BUILD SERIES ----------------
 
-    def _build_series(self, category, judges, week_indexes):
-        series = {}
+    def _judge_series(self, category, window):
+        """
+        {судья: значения по точкам окна} — только судьи с делами категории
+        в диапазоне, по алфавиту. Кэш по (категория, окно):
+        галочки, тема и возврат к прежней категории серии не пересчитывают.
+        """
+        key = (category, window.key)
+        series = self._series_cache.get(key)
 
-        for judge in judges:
-            values = []
+        if series is None:
+            judges = sorted(self.counts.judges_in_weeks(window.positions, category))
+            series = self.counts.series(category, judges, window.positions)
+            series = window.aggregate_series(series, category in self.processor.flows)
 
-            for i, week in week_indexes:
-                week_data = self.raw_data[week]
-                judge_data = week_data.get(judge, {})
-                cases = judge_data.get(category, [])
-                values.append(len(cases))
-
-            series[judge] = values
+            self._store(self._series_cache, key, series)
 
         return series
 
+    def _category_totals(self, category, window):
+        """Сумма категории по всем судьям (линия «Всего» и режим сравнения)"""
+        key = (category, window.key)
+        totals = self._totals_cache.get(key)
+
+        if totals is None:
+            totals = self.counts.category_totals(category, window.positions)
+            totals = window.aggregate(totals, category in self.processor.flows)
+
+            self._store(self._totals_cache, key, totals)
+
+        return totals
+
+    @staticmethod
+    def _store(cache, key, value):
+        if len(cache) >= SERIES_CACHE_SIZE:
+            cache.clear()
+        cache[key] = value
+
     # ---------------- CHART ----------------
 
     def update_chart(self):
-
-        if not self.raw_data:
+        """
+        Перестроить график (категория, диапазон дат, режим, тема).
+        Сколько бы сигналов ни пришло за такт цикла событий —
+        перестройка и отрисовка будут одни.
+        """
+        self._rebuild_pending = True
+        self._redraw_timer.start()
+
+    def _update_visibility(self):
+        """Галочки судей / категорий / «Всего» — линии только показываются и скрываются"""
+        self._redraw_timer.start()
+
+    def _flush_chart(self):
+        if not self.counts:
             return
 
+        if self._rebuild_pending:
+            self._rebuild_pending = False
+            self._rebuild_chart()
+        else:
+            self._apply_visibility()
+
+        self.canvas.draw_idle()
+
+    def _rebuild_chart(self):
+
         # очищаем фигуру
         self.figure.clear()
+        self._lines = {}
 
         # создаём новый axes и сохраняем его
         self.ax = self.figure.add_subplot(111)
 
-        if self._dark_mode:
-            self.apply_dark_style()
-        else:
-            self.apply_light_style()
+        self._apply_style()
 
-        # 🔥 ВАЖНО: сбрасываем hover-аннотацию
+        # 🔥 ВАЖНО: сбрасываем hover-аннотацию (и снимок — он от старых осей)
         self._hover_annotation = None
+        self._hover_point = None
+        self._hover_background = None
+
+        window = self._window()
+        self._plot_window = window
+        self._update_hover_index()
 
-        week_indexes = self._get_filtered_weeks()
-        if not week_indexes:
-            self.canvas.draw()
+        if not window:
             return
 
+        # линии строятся для всех судей / категорий сразу,
+        # галочки дальше только меняют их видимость
+        visible = self._visible_keys()
+
         # =========================
         # ОБЫЧНЫЙ РЕЖИМ (СУДЬИ)
         # =========================
@@ -721,66 +889,31 @@ class GraphWidget(QWidget):
 
             category = self.category_combo.currentText()
 
-            # ---- ВСЕ судьи (для totals)
-            all_judges = set()
-            for _, week_key in week_indexes:
-                week_data = self.raw_data.get(week_key, {})
-                all_judges.update(week_data.keys())
-
-            all_judges = sorted(all_judges)
+            # ---- линии судей (судьи без дел в категории в список не попадают)
+            for judge, values in self._judge_series(category, window).items():
 
-            # ---- выбранные судьи (для отображения)
-            selected_judges = self._get_selected_judges()
-
-            # строим серии
-            full_series = self._build_series(category, all_judges, week_indexes)
-            display_series = self._build_series(category, selected_judges, week_indexes)
-
-            # ---- линии судей
-            for judge, values in display_series.items():
-
-                if not any(values):
-                    continue
-
-                self.ax.plot(
+                self._lines[judge] = self.ax.plot(
                     range(len(values)),
                     values,
                     marker="o",
                     label=judge,
                     color=self.judge_colors.get(judge, "gray"),
-                    picker=6
-                )
-
-            # ---- линия "Всего" (НЕ зависит от галочек)
-            if (
-                    not self.compare_mode.isChecked()
-                    and hasattr(self, "_total_item_widget")
-                    and self._total_item_widget.checkbox.isChecked()
-                    and full_series
-            ):
-
-                totals = [
-                    sum(full_series[j][i] for j in full_series)
-                    for i in range(len(week_indexes))
-                ]
-
-                self.ax.plot(
-                    range(len(totals)),
-                    totals,
-                    linestyle="--",
-                    color="black" if not self._dark_mode else 'white',
-                    label="__total__",
-                    picker=6   # ← ВАЖНО
-                )
-
-                # 🔥 если нет выбранных судей — вручную задать Y-лимиты
-                if not selected_judges:
-                    y_min = min(totals)
-                    y_max = max(totals)
-
-                    padding = (y_max - y_min) * 0.05 if y_max != y_min else 1
-
-                    self.ax.set_ylim(y_min - padding, y_max + padding)
+                    picker=6,
+                    visible=judge in visible
+                )[0]
+
+            # ---- линия "Всего" (по всем судьям, НЕ зависит от галочек)
+            totals = self._category_totals(category, window)
+
+            self._lines["__total__"] = self.ax.plot(
+                range(len(totals)),
+                totals,
+                linestyle="--",
+                color="black" if not self._dark_mode else 'white',
+                label="__total__",
+                picker=6,   # ← ВАЖНО
+                visible="__total__" in visible
+            )[0]
 
             self.ax.set_title(category)
 
@@ -789,45 +922,22 @@ class GraphWidget(QWidget):
         # =========================
         else:
 
-            selected_categories = [
-                self.categories_list.itemWidget(
-                    self.categories_list.item(i)
-                ).text_label.text()
-                for i in range(self.categories_list.count())
-                if self.categories_list.itemWidget(
-                    self.categories_list.item(i)
-                ).checkbox.isChecked()
-            ]
-
-            if not selected_categories:
-                self.canvas.draw()
-                return
-
-            for category in selected_categories:
-
-                values = []
-
-                for _, week_key in week_indexes:
-                    total = 0
-                    week_data = self.raw_data.get(week_key, {})
+            for category in self.processor.categories:
 
-                    for judge_data in week_data.values():
-                        cases = judge_data.get(category, [])
-                        total += len(cases)
-
-                    values.append(total)
+                values = self._category_totals(category, window)
 
                 if not any(values):
                     continue
 
-                self.ax.plot(
+                self._lines[category] = self.ax.plot(
                     range(len(values)),
                     values,
                     marker="o",
                     label=category,
                     color=self.category_colors.get(category, "gray"),
-                    picker=6
-                )
+                    picker=6,
+                    visible=category in visible
+                )[0]
 
             self.ax.set_title("Сравнение категорий")
 
@@ -835,15 +945,52 @@ class GraphWidget(QWidget):
         # ОБЩИЕ НАСТРОЙКИ
         # =========================
 
-        self.ax.set_xticks(range(len(week_indexes)))
-        self.ax.set_xticklabels(
-            [w[-10:] for _, w in week_indexes],
-            rotation=90
-        )
+        self.ax.set_xticks(range(len(window)))
+        self.ax.set_xticklabels(window.labels, rotation=90)
 
         self.ax.grid(True)
+        self._autoscale_visible()
+        self._update_hover_index()
         self.figure.tight_layout()
-        self.canvas.draw()
+
+    def _apply_visibility(self):
+        if not self._lines:
+            return
+
+        visible = self._visible_keys()
+
+        for key, line in self._lines.items():
+            line.set_visible(key in visible)
+
+        if self._hover_annotation:
+            self._hover_annotation.set_visible(False)
+        self._hover_point = None
+
+        self._autoscale_visible()
+        self._update_hover_index()
+
+    def _visible_keys(self):
+        """Подписи линий, которые сейчас отмечены галочками"""
+        if self.compare_mode.isChecked():
+            return set(self._get_selected_categories())
+
+        keys = set(self._get_selected_judges())
+
+        if (
+                hasattr(self, "_total_item_widget")
+                and self._total_item_widget.checkbox.isChecked()
+        ):
+            keys.add("__total__")
+
+        return keys
+
+    def _autoscale_visible(self):
+        """Масштаб по видимым линиям (скрытые на пределы осей не влияют)"""
+        if not any(line.get_visible() for line in self._lines.values()):
+            return
+
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
 
     # ---------------- DOUBLE CLICK ----------------
 
@@ -860,12 +1007,11 @@ class GraphWidget(QWidget):
         # 3️⃣ Координата X (индекс точки)
         x = round(event.xdata)
 
-        week_indexes = self._get_filtered_weeks()
+        window = self._plot_window
 
         # 4️⃣ Проверяем что индекс существует
-        if 0 <= x < len(week_indexes):
-            original_index = week_indexes[x][0]
-            week_key = week_indexes[x][1]
+        if window and 0 <= x < len(window):
+            original_index, week_key = window.point_week(x)
 
             category = self.category_combo.currentText()
             judges = self._get_selected_judges()
@@ -884,18 +1030,24 @@ class GraphWidget(QWidget):
         mouse_event = event.mouseevent
         line = event.artist
 
+        # скрытая линия остаётся на осях — matplotlib её тоже «пикает»
+        if not line.get_visible():
+            return
+
         ind = event.ind[0]
-        week_indexes = self._get_filtered_weeks()
+        window = self._plot_window
 
-        if not (0 <= ind < len(week_indexes)):
+        if not window or not (0 <= ind < len(window)):
             return
 
-        _, week_key = week_indexes[ind]
+        # месяц / квартал — переход по последней неделе периода,
+        # детализация — по неделям значения (PointIndex.weeks)
+        _, week_key = window.point_week(ind)
+        period = window.period(ind)
 
         ydata = line.get_ydata()
         clicked_value = int(ydata[ind])
 
-        week_data = self.raw_data.get(week_key, {})
         label = line.get_label()
 
         # ======================================================
@@ -904,54 +1056,39 @@ class GraphWidget(QWidget):
         if self.compare_mode.isChecked():
 
             category = label  # ← берём категорию из линии
-
-            judges_with_counts = []
-
-            for judge, judge_data in week_data.items():
-                cases = judge_data.get(category, [])
-                count = len(cases)
-
-                if count > 0:
-                    judges_with_counts.append(judge)
+            point = self._point_index(category, ind)
 
             data = {
                 "week_key": week_key,
+                "period": period,
                 "category": category,
-                "judges": judges_with_counts,
+                "judges": point.judges,
                 "value": clicked_value,
                 "double_click": mouse_event.dblclick,
-                "is_total": False
+                "is_total": False,
+                "point": point
             }
 
             self.point_clicked.emit(data)
             return
 
+        category = self.category_combo.currentText()
+        point = self._point_index(category, ind)
+
         # ======================================================
         # 🔥 КЛИК ПО "ВСЕГО"
         # ======================================================
-        category = self.category_combo.currentText()
-
         if label == "__total__":
 
-            judges_with_counts = []
-
-            for judge, judge_data in week_data.items():
-                cases = judge_data.get(category, [])
-                count = len(cases)
-
-                if count > 0:
-                    judges_with_counts.append((judge, count))
-
-            judges_with_counts.sort(key=lambda x: x[1], reverse=True)
-            matched_judges = [j[0] for j in judges_with_counts]
-
             data = {
                 "week_key": week_key,
+                "period": period,
                 "category": category,
-                "judges": matched_judges,
+                "judges": point.ranked,
                 "value": clicked_value,
                 "double_click": mouse_event.dblclick,
-                "is_total": True
+                "is_total": True,
+                "point": point
             }
 
             self.point_clicked.emit(data)
@@ -961,24 +1098,47 @@ class GraphWidget(QWidget):
         # 🔥 ОБЫЧНЫЙ РЕЖИМ (СУДЬИ)
         # ======================================================
 
-        matched_judges = []
-
-        for judge, judge_data in week_data.items():
-            cases = judge_data.get(category, [])
-            if len(cases) == clicked_value:
-                matched_judges.append(judge)
-
         data = {
             "week_key": week_key,
+            "period": period,
             "category": category,
-            "judges": matched_judges,
+            "judges": point.judges_with(clicked_value),
             "value": clicked_value,
             "double_click": mouse_event.dblclick,
-            "is_total": False
+            "is_total": False,
+            "point": point
         }
 
         self.point_clicked.emit(data)
 
+    def _point_index(self, category, point):
+        """PointIndex точки окна — кэш рядом с сериями"""
+        key = (category, self._plot_window.key, point)
+        index = self._point_cache.get(key)
+
+        if index is None:
+            weeks = self._plot_window.value_weeks(point, category in self.processor.flows)
+            index = PointIndex(
+                self._point_counts(category, point),
+                [week_key for _, week_key in weeks],
+            )
+            self._store(self._point_cache, key, index)
+
+        return index
+
+    def _point_counts(self, category, point):
+        """{судья: значение} в точке графика (для недели — судьи в порядке pkl)"""
+        window = self._plot_window
+
+        if not window.aggregated:
+            sorted_index, _ = window.point_week(point)
+            return self.counts.category_counts(self._week_pos[sorted_index], category)
+
+        return {
+            judge: values[point]
+            for judge, values in self._judge_series(category, window).items()
+        }
+
     def _assign_fixed_colors(self, judges):
         self.judge_colors.clear()
         self.category_colors.clear()
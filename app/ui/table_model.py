@@ -3,7 +3,11 @@ from PyQt5.QtCore import (
     Qt,
     QModelIndex
 )
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QColor, QFont
+
+
+DELTA_UP = QColor("#2e7d32")    # стало больше
+DELTA_DOWN = QColor("#c62828")  # стало меньше
 
 
 class TableModel(QAbstractTableModel):
@@ -15,6 +19,7 @@ class TableModel(QAbstractTableModel):
         self._total = []
         self.headers = []
         self.tooltips = []
+        self._delta = None  # processor.build_delta — режим «разница с неделей»
 
         if table_data:
             self.set_table_data(table_data)
@@ -28,15 +33,48 @@ class TableModel(QAbstractTableModel):
         self.beginResetModel()
 
         self._columns = table_data.get("columns", [])
-        self._rows = table_data.get("rows", [])
+        # своя копия списка: sort() не должен переставлять строки
+        # таблицы из TableCache / build_all, которую может читать экспорт
+        self._rows = list(table_data.get("rows", []))
         self._total = table_data.get("total", [])
 
         self.headers = table_data["columns"]
         self.tooltips = table_data.get("tooltips", self.headers)
         self._data = table_data["rows"]
 
+        # разница считалась для прежней недели
+        self._delta = None
+
         self.endResetModel()
 
+    def set_delta(self, delta):
+        """
+        delta — processor.build_delta(...) для показанной недели
+        или None (обычный вид). Данные таблицы не меняются —
+        разница только дописывается к числам и красится.
+        """
+        if delta is None and self._delta is None:
+            return
+
+        self._delta = delta
+
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+            )
+
+    def table_data(self):
+        """
+        Снимок таблицы в формате processor.build —
+        строки в текущем порядке сортировки (для экспорта)
+        """
+        return {
+            "columns": list(self._columns),
+            "rows": [list(row) for row in self._rows],
+            "total": list(self._total),
+        }
+
     # ---------- required overrides ----------
 
     def rowCount(self, parent=None):
@@ -68,9 +106,19 @@ class TableModel(QAbstractTableModel):
 
         value = row_data[col]
 
+        delta = self._cell_delta(row_data, col, is_total_row)
+
         if role == Qt.DisplayRole:
+            if delta:
+                return f"{value}  {delta:+d}"
             return value
 
+        if role == Qt.ForegroundRole and delta:
+            return DELTA_UP if delta > 0 else DELTA_DOWN
+
+        if role == Qt.ToolTipRole and delta is not None:
+            return f"К неделе {self._delta['base_week']}: {delta:+d}"
+
         # --- жирный шрифт для итога
         if role == Qt.FontRole and is_total_row:
             font = QFont()
@@ -113,6 +161,19 @@ class TableModel(QAbstractTableModel):
 
     # ---------- helpers ----------
 
+    def _cell_delta(self, row_data, col, is_total_row):
+        if self._delta is None:
+            return None
+
+        if is_total_row:
+            deltas = self._delta["total"]
+        else:
+            deltas = self._delta["rows"].get(row_data[0])
+
+        if deltas is None or col >= len(deltas):
+            return None
+        return deltas[col]
+
     def _is_total_row(self, row):
         return self._total and row == len(self._rows)
 
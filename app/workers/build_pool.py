@@ -0,0 +1,189 @@
+'''
+BuildPool — один фоновый поток вместо QThread на каждый запрос
+
+Каждый запрос имеет вид (kind: "table", "prefetch", ...)
+и номер поколения (generation):
+
+- новый запрос вытесняет ещё не начатый запрос того же вида;
+- выполняющийся запрос того же вида получает отмену
+  (CancelToken.check() внутри задачи прерывает её);
+- результат устаревшего поколения не выдаётся.
+
+Зажатая стрелка недели → десятки запросов, но построится
+и покажется только последняя неделя.
+
+Задачи одного пула идут друг за другом: долгие фоновые
+построения (индексы дел) — в отдельном пуле с низким
+приоритетом потока, чтобы не задерживать таблицу.
+'''
+
+import threading
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+
+class BuildCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def check(self):
+        """Вызывается задачей между шагами — прерывает отменённую задачу"""
+        if self._cancelled:
+            raise BuildCancelled()
+
+
+class _Task:
+    __slots__ = ("kind", "generation", "fn", "token")
+
+    def __init__(self, kind, generation, fn):
+        self.kind = kind
+        self.generation = generation
+        self.fn = fn
+        self.token = CancelToken()
+
+
+class _PoolThread(QThread):
+    task_done = pyqtSignal(str, int, object)
+    task_failed = pyqtSignal(str, int, str)
+
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+
+    def run(self):
+        while True:
+            task = self.pool._take_task()
+            if task is None:
+                return
+
+            try:
+                result = task.fn(task.token)
+            except BuildCancelled:
+                continue
+            except Exception as e:
+                self.task_failed.emit(task.kind, task.generation, str(e))
+                continue
+            finally:
+                self.pool._release_task(task)
+
+            if not task.token.cancelled:
+                self.task_done.emit(task.kind, task.generation, result)
+
+
+class BuildPool(QObject):
+    finished = pyqtSignal(str, int, object)  # kind, generation, result
+    error = pyqtSignal(str, int, str)        # kind, generation, message
+
+    def __init__(self, priorities=("table",), thread_priority=QThread.InheritPriority, parent=None):
+        super().__init__(parent)
+
+        # порядок видов = приоритет при выборе следующей задачи
+        self.priorities = list(priorities)
+
+        self._cond = threading.Condition()
+        self._pending = {}       # kind → последняя ожидающая задача
+        self._running = None
+        self._generations = {}   # kind → номер последнего запроса
+        self._stopped = False
+
+        self._thread = _PoolThread(self)
+        self._thread.task_done.connect(self._on_task_done)
+        self._thread.task_failed.connect(self._on_task_failed)
+        self._thread.start(thread_priority)
+
+    # ---------- public ----------
+
+    def submit(self, kind, fn, supersedes=()):
+        """
+        fn(token) выполняется в фоновом потоке.
+        supersedes — виды задач, которые новый запрос
+        убирает из очереди и прерывает (например, предзагрузку).
+        Возвращает номер поколения запроса.
+        """
+        with self._cond:
+            generation = self._bump(kind)
+
+            for other in supersedes:
+                self._drop(other)
+
+            self._pending[kind] = _Task(kind, generation, fn)
+            self._cond.notify()
+
+        return generation
+
+    def cancel(self, kind):
+        """Отменяет ожидающий и выполняющийся запрос вида kind"""
+        with self._cond:
+            self._bump(kind)
+
+    def is_current(self, kind, generation):
+        return self._generations.get(kind) == generation
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            if self._running is not None:
+                self._running.token.cancel()
+            self._cond.notify_all()
+
+        self._thread.wait()
+
+    # ---------- внутреннее (вызывается под self._cond) ----------
+
+    def _bump(self, kind):
+        generation = self._generations.get(kind, 0) + 1
+        self._generations[kind] = generation
+        self._drop(kind)
+        return generation
+
+    def _drop(self, kind):
+        self._pending.pop(kind, None)
+
+        running = self._running
+        if running is not None and running.kind == kind:
+            running.token.cancel()
+
+    # ---------- фоновый поток ----------
+
+    def _take_task(self):
+        with self._cond:
+            while not self._stopped and not self._pending:
+                self._cond.wait()
+
+            if self._stopped:
+                return None
+
+            kinds = sorted(
+                self._pending,
+                key=lambda k: self.priorities.index(k) if k in self.priorities else len(self.priorities)
+            )
+            task = self._pending.pop(kinds[0])
+            self._running = task
+            return task
+
+    def _release_task(self, task):
+        with self._cond:
+            if self._running is task:
+                self._running = None
+
+    # ---------- GUI-поток ----------
+
+    def _on_task_done(self, kind, generation, result):
+        if self.is_current(kind, generation):
+            self.finished.emit(kind, generation, result)
+
+    def _on_task_failed(self, kind, generation, message):
+        if self.is_current(kind, generation):
+            self.error.emit(kind, generation, message)
@@ -0,0 +1,105 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from app.export.batch_report import generate_reports
+from app.export.excel_exporter import save_all_weeks_to_excel, save_lines_to_excel
+from app.export.word_exporter import save_table_to_word
+
+
+class ExportWorker(QThread):
+    """Сохраняет файл в фоне — окно не замирает"""
+
+    progress = pyqtSignal(int, int)  # готово, всего
+    finished = pyqtSignal(str)       # путь к файлу
+    error = pyqtSignal(str)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        try:
+            self.export(self.progress.emit)
+            self.finished.emit(self.path)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def export(self, progress):
+        raise NotImplementedError
+
+
+class WordExportWorker(ExportWorker):
+    """table_data → .docx (прогресс — по строкам)"""
+
+    def __init__(self, table_data, processor, court, path):
+        super().__init__(path)
+        self.table_data = table_data
+        self.processor = processor
+        self.court = court
+
+    def export(self, progress):
+        save_table_to_word(
+            self.table_data,
+            self.processor,
+            self.court,
+            self.path,
+            progress=progress,
+        )
+
+
+class AllWeeksExcelWorker(ExportWorker):
+    """Все недели pkl → .xlsx, лист на неделю (прогресс — по неделям)"""
+
+    def __init__(self, counts, processor, title, path, tables=None):
+        super().__init__(path)
+        self.counts = counts
+        self.processor = processor
+        self.title = title
+        self.tables = tables  # processor.build_all(...)["tables"], если уже построены
+
+    def export(self, progress):
+        save_all_weeks_to_excel(
+            self.counts,
+            self.processor,
+            self.path,
+            title=self.title,
+            progress=progress,
+            tables=self.tables,
+        )
+
+
+class DetailsExcelWorker(ExportWorker):
+    """Строки детализации → .xlsx, один столбец"""
+
+    def __init__(self, lines, path):
+        super().__init__(path)
+        self.lines = lines
+
+    def export(self, progress):
+        save_lines_to_excel(self.lines, self.path)
+
+
+class BatchExportWorker(ExportWorker):
+    """
+    Пакетный экспорт (app.export.batch_report): суды — в процессах,
+    прогресс — по готовым судам, cancel() — прервать
+    """
+
+    def __init__(self, jobs, out_dir):
+        super().__init__(out_dir)
+        self.jobs = jobs
+        self.results = []  # [ReportResult]
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def export(self, progress):
+        def on_result(result):
+            self.results.append(result)
+            progress(len(self.results), len(self.jobs))
+
+        generate_reports(
+            self.jobs,
+            on_result=on_result,
+            is_cancelled=lambda: self.cancelled,
+        )
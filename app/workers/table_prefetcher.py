@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+
+class TableCache:
+    """
+    Готовые table_data по ключу
+    (pkl path, mtime, week key, класс процессора).
+
+    Хранит не больше max_tables таблиц — самые старые вытесняются.
+    """
+
+    def __init__(self, max_tables=16):
+        self.max_tables = max_tables
+        self._tables = OrderedDict()
+
+    @staticmethod
+    def make_key(pkl_path, mtime, week_key, processor):
+        return pkl_path, mtime, week_key, processor.__class__
+
+    def get(self, key):
+        table_data = self._tables.get(key)
+        if table_data is not None:
+            self._tables.move_to_end(key)
+        return table_data
+
+    def put(self, key, table_data):
+        self._tables[key] = table_data
+        self._tables.move_to_end(key)
+
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._tables
+
+    def clear(self):
+        self._tables.clear()
+
+
+def prefetch_tables(processor, counts, week_indexes, key_prefix, token):
+    """
+    Строит таблицы соседних недель — задача для BuildPool.
+
+    key_prefix = (pkl path, mtime) фиксируется при запуске,
+    чтобы результат не попал в кэш другого суда.
+    Возвращает [(key, table_data), ...].
+    """
+    pkl_path, mtime = key_prefix
+    tables = []
+
+    for week_index in week_indexes:
+        token.check()
+
+        try:
+            table_data = processor.build(counts, week_index)
+        except Exception:
+            # предзагрузка — только оптимизация: ошибку покажет
+            # обычная загрузка, когда пользователь дойдёт до недели
+            continue
+
+        key = TableCache.make_key(pkl_path, mtime, table_data["week"], processor)
+        tables.append((key, table_data))
+
+    return tables
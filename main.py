@@ -14,38 +14,63 @@
 
 import sys
 import os
-import re
+import multiprocessing
 from docx import Document
 from datetime import datetime, date
-from openpyxl import Workbook
 import traceback
 
 from PyQt5.QtWidgets import QFrame, QToolButton, QStackedWidget, QSizePolicy
-from PyQt5.QtCore import Qt, QDate, QEasingCurve, QSettings
+from PyQt5.QtCore import Qt, QDate, QEasingCurve, QSettings, QThread
 from PyQt5.QtWidgets import (
     QApplication, QMenu, QMainWindow, QWidget,
     QVBoxLayout, QComboBox, QMessageBox, QTableView,
     QRadioButton, QGroupBox, QHBoxLayout, QPushButton,
-    QLabel, QHeaderView, QTextEdit, QSplitter,
-    QCalendarWidget, QDialog,
+    QLabel, QHeaderView, QTextEdit, QSplitter, QLineEdit, QListWidget,
+    QListWidgetItem,
+    QCalendarWidget, QDialog, QProgressDialog, QFileDialog,
 )
-from PyQt5.QtGui import QIcon, QFont
+from PyQt5.QtGui import QIcon, QFont, QTextCursor
 from PyQt5.QtCore import QSize, QPropertyAnimation
 from PyQt5.QtWidgets import QGraphicsOpacityEffect
 
-from app.constants.pkl_mapping import PKL_MAPPING
-from app.repository.bases_repository import BasesRepository
-from app.repository.statistics import StatisticsRepository
+from app.constants.pkl_mapping import PKL_MAPPING, get_pkl_info
+from app.repository.bases_repository import ALL_COURTS, BasesRepository
+from app.repository.case_store import CaseStore
+from app.repository.region import RegionRepository
+from app.repository.statistics import StatisticsRepository, MODE_MMAP
 from app.factory.processor_factory import ProcessorFactory
+from app.domain.case_key import extract_case_key
+from app.domain.case_search import CaseTextIndex, search_courts
+from app.domain.case_timeline import SEARCH_LIMIT, CaseTimeline
+from app.domain.context import DataContext
 from app.domain.pkl_selector import select_pkl_for_context
+from app.domain.details_index import WeekDetailsIndex
+from app.domain.point_index import PointIndex, WeekCases, normalize_case_line
+from app.domain.week_delta import WeekCaseDelta
+from app.domain.week_index import WeekIndex
 from app.ui.table_model import TableModel
-from app.workers.data_load_worker import DataLoadWorker
-from app.export.word_exporter import export_model_to_word
+from app.workers.build_pool import BuildPool
+from app.workers.table_prefetcher import TableCache, prefetch_tables
+from app.workers.export_worker import (
+    AllWeeksExcelWorker, BatchExportWorker, DetailsExcelWorker, WordExportWorker,
+)
+from app.export.batch_report import WEEKS_ALL, ReportJob
+from app.export.word_exporter import table_rows, word_file_name
 from app.ui.graph_widget import GraphWidget
 
 
 BASE_DIR = os.path.join(os.path.dirname(__file__), "bases")
 
+# виды задач BuildPool (порядок = приоритет)
+BUILD_REGION = "region"
+BUILD_TABLE = "table"
+BUILD_PREFETCH = "prefetch"
+BUILD_ALL_WEEKS = "all_weeks"
+BUILD_CASES = "cases"    # история дел — case_pool
+BUILD_SEARCH = "search"  # поиск по тексту строк — case_pool
+
+REGION_DETAILS_HINT = "Детализация по делам доступна при выборе отдельного суда."
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -57,21 +82,72 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(QIcon(icon_path))
 
         self.bases_repo = BasesRepository(BASE_DIR)
-        self.stats_repo = StatisticsRepository()
+        # строки дел — через mmap без повторов: память не растёт
+        # ни с историей суда, ни с количеством открытых судов
+        self.stats_repo = StatisticsRepository(mode=MODE_MMAP)
+        # «Все суды»: один тип pkl по всем судам, pkl — в отдельных процессах
+        self.region_repo = RegionRepository(self.bases_repo)
 
         # ====== СОСТОЯНИЕ (ДО UI!) ======
         self.specialization = "GPK"
         self.instance = "first"
 
         self.current_pkl_path = None
-        self.current_raw_data = None
+        self.current_pkl_mtime = None
+        self.current_counts = None      # CountCube — таблица и график
+        self.current_weeks = None       # WeekIndex — недели и их даты
+        self.current_raw_data = None    # строки дел (CaseStore) — только для детализации
         self.current_context = None
+        self.current_processor = None
+        self.current_region = None      # RegionCube — в режиме «Все суды»
+        self._region_requested = None   # путь сводки, которая строится в фоне
 
         self.week_index = 0
         self.max_week_index = 0
         self.current_week_key = None
 
-        self.active_workers = []
+        # один фоновый поток на все построения: новый запрос
+        # вытесняет старый, устаревшие результаты отбрасываются
+        self.build_pool = BuildPool(
+            priorities=(BUILD_REGION, BUILD_TABLE, BUILD_PREFETCH, BUILD_ALL_WEEKS)
+        )
+        self.build_pool.finished.connect(self.on_build_finished)
+        self.build_pool.error.connect(self.on_data_error)
+
+        # индексы дел строятся секундами — свой поток с низким приоритетом,
+        # таблица и смена суда их не ждут
+        self.case_pool = BuildPool(
+            priorities=(BUILD_SEARCH, BUILD_CASES),
+            thread_priority=QThread.LowPriority,
+        )
+        self.case_pool.finished.connect(self.on_build_finished)
+        self.case_pool.error.connect(self.on_data_error)
+
+        # готовые таблицы (в т.ч. соседние недели, построенные заранее)
+        self.table_cache = TableCache(max_tables=24)
+
+        # таблицы всех недель разом (processor.build_all) —
+        # ((pkl path, mtime, класс процессора), результат)
+        self.all_weeks = None
+        self._all_weeks_requested = None
+
+        # детализация текущей недели: (ключ таблицы, WeekDetailsIndex)
+        self._details_index = None
+        self._week_cases = None  # (pkl, недели) → [(неделя, WeekCases)] — детализация кликов по графику
+        self._delta_weeks = None  # (неделя, базовая неделя) — режим «Δ» включён
+        self._case_delta = None   # (pkl, недели) → WeekCaseDelta
+
+        # индексы дел всех недель (case_pool):
+        # история — сразу после загрузки суда, поиск по тексту — при первом поиске
+        self.case_timeline = None          # ((pkl path, mtime), CaseTimeline)
+        self.case_text = None              # ((pkl path, mtime), [CaseTextIndex по судам])
+        self._case_requests = {}           # вид → (pkl path, mtime) строящегося индекса
+        self._case_search_pending = False  # искали, пока индексы строились
+        self._pending_hit = None           # (CaseHit, запрос) — переход после загрузки таблицы
+
+        # экспорт в фоне (ExportWorker + окно прогресса)
+        self._export_worker = None
+        self._export_progress = None
 
         # self.settings = QSettings("CaseAnalysis", "CaseAnalysisApp")
         self.settings = QSettings("settings.ini", QSettings.IniFormat)
@@ -112,6 +188,16 @@ class MainWindow(QMainWindow):
         for btn in (self.prev_week_btn, self.next_week_btn):
             btn.setFixedSize(68, 48)
 
+        # разница с предыдущей неделей прямо в таблице
+        self.delta_btn = QPushButton("Δ к прошлой\nнеделе")
+        self.delta_btn.setCheckable(True)
+        self.delta_btn.setToolTip(
+            "Рядом с числами — изменение к предыдущей неделе,\n"
+            "в детализации — какие дела пришли и ушли"
+        )
+        self.delta_btn.setFixedHeight(48)
+        self.delta_btn.toggled.connect(self.update_delta)
+
         self.header_stack = QStackedWidget()
         self.header_stack.setSizePolicy(
             QSizePolicy.Maximum,
@@ -127,6 +213,7 @@ class MainWindow(QMainWindow):
         week_layout.addWidget(self.prev_week_btn)
         week_layout.addWidget(self.week_label)
         week_layout.addWidget(self.next_week_btn)
+        week_layout.addWidget(self.delta_btn)
         week_layout.addStretch()
 
         self.header_stack.addWidget(self.week_nav_widget)
@@ -239,6 +326,30 @@ class MainWindow(QMainWindow):
 
         top_layout.addWidget(self.word_export_btn)
 
+        self.excel_all_weeks_btn = QPushButton("Все недели\nв Excel")
+        self.excel_all_weeks_btn.setToolTip("Таблицы всех недель — по листу на неделю")
+        self.excel_all_weeks_btn.clicked.connect(self.export_all_weeks_to_excel)
+
+        top_layout.addWidget(self.excel_all_weeks_btn)
+
+        # пакетный экспорт: недели × суды, суды — в отдельных процессах
+        self.batch_export_btn = QPushButton("Пакетный\nэкспорт")
+        batch_menu = QMenu(self.batch_export_btn)
+
+        batch_menu.addAction("Все недели этого суда — один файл Word").triggered.connect(
+            lambda: self.export_batch(all_courts=False, all_weeks=True)
+        )
+        batch_menu.addAction("Эта неделя всех судов — Word").triggered.connect(
+            lambda: self.export_batch(all_courts=True, all_weeks=False)
+        )
+        batch_menu.addAction("Все недели всех судов — файл Word на суд").triggered.connect(
+            lambda: self.export_batch(all_courts=True, all_weeks=True)
+        )
+
+        self.batch_export_btn.setMenu(batch_menu)
+
+        top_layout.addWidget(self.batch_export_btn)
+
         # растяжка, чтобы элементы не слипались
         top_layout.addStretch()
 
@@ -323,6 +434,29 @@ class MainWindow(QMainWindow):
             "Выберите ячейку таблицы, чтобы увидеть детализацию"
         )
 
+        # --- Поиск дела: история по всем неделям ---
+        self.case_search = QLineEdit()
+        self.case_search.setClearButtonEnabled(True)
+        self.case_search.setPlaceholderText(
+            "🔍 Номер дела, сторона, часть строки + Enter — поиск по всем неделям"
+        )
+        self.case_search.returnPressed.connect(self.search_case)
+
+        # совпадения: клик — таблица и детализация переходят к строке
+        self.case_hits = QListWidget()
+        self.case_hits.setMaximumHeight(140)
+        self.case_hits.setVisible(False)
+        self.case_hits.itemClicked.connect(self.on_case_hit_activated)
+        self.case_hits.itemActivated.connect(self.on_case_hit_activated)
+
+        self.details_panel = QWidget()
+        details_layout = QVBoxLayout(self.details_panel)
+        details_layout.setContentsMargins(0, 0, 0, 0)
+        details_layout.setSpacing(4)
+        details_layout.addWidget(self.case_search)
+        details_layout.addWidget(self.case_hits)
+        details_layout.addWidget(self.details_view)
+
         selection_model = self.table_view.selectionModel()
         selection_model.selectionChanged.connect(self.on_table_selection_changed)
 
@@ -377,7 +511,7 @@ class MainWindow(QMainWindow):
 
         # график добавим позже
         self.splitter.addWidget(self.stacked_widget)
-        self.splitter.addWidget(self.details_view)
+        self.splitter.addWidget(self.details_panel)
         self.splitter.setStretchFactor(0, 8)  # таблица
         self.splitter.setStretchFactor(1, 6)  # детализация
         self.splitter.setSizes([700, 300])
@@ -394,6 +528,10 @@ class MainWindow(QMainWindow):
         self.settings.setValue("court", self.court_combo.currentText())
         self.settings.setValue("specialization", self.specialization)
         self.settings.setValue("instance", self.instance)
+        self.build_pool.shutdown()
+        self.case_pool.shutdown()
+        if self._export_worker is not None:
+            self._export_worker.wait()
         event.accept()
 
     def switch_to_table(self):
@@ -489,40 +627,11 @@ class MainWindow(QMainWindow):
         Выбирает неделю, в которую попадает дата.
         Если такой нет — выбирает ближайшую.
         """
-        weeks = list(self.current_raw_data.keys())
-
-        parsed_weeks = []
-
-        for idx, week_str in enumerate(weeks):
-            try:
-                start_str, end_str = week_str.split(" - ")
-                start = datetime.strptime(start_str, "%d.%m.%Y").date()
-                end = datetime.strptime(end_str, "%d.%m.%Y").date()
-                parsed_weeks.append((idx, start, end))
-            except Exception:
-                continue
-
-        if not parsed_weeks:
+        week_index = self.current_weeks.find(selected_date)
+        if week_index is None:
             return
 
-        # 1️⃣ Пытаемся найти точное попадание
-        for idx, start, end in parsed_weeks:
-            if start <= selected_date <= end:
-                self.week_index = idx
-                self.reload_current_court()
-                return
-
-        # 2️⃣ Ищем ближайшую неделю
-        def distance(week):
-            _, start, end = week
-            if selected_date < start:
-                return (start - selected_date).days
-            if selected_date > end:
-                return (selected_date - end).days
-            return 0
-
-        closest = min(parsed_weeks, key=distance)
-        self.week_index = closest[0]
+        self.week_index = week_index
         self.reload_current_court()
 
     def on_calendar_confirmed(self, calendar: QCalendarWidget, dialog: QDialog):
@@ -534,7 +643,7 @@ class MainWindow(QMainWindow):
         dialog.accept()
 
     def on_week_label_clicked(self, event):
-        if not self.current_raw_data:
+        if not self.current_counts:
             return
 
         dialog = QDialog(self)
@@ -567,54 +676,56 @@ class MainWindow(QMainWindow):
         - "Неделя:"
         """
 
+        return list(self.iter_details_blocks())
+
+    def iter_details_blocks(self):
+        """parse_details_blocks по одному блоку — для потоковой выгрузки"""
         text = self.details_view.toPlainText()
-        lines = [l.rstrip() for l in text.splitlines()]
 
-        blocks = []
         current_block = []
 
         def is_block_start(line: str) -> bool:
             return line.startswith("Судья:") or line.startswith("Неделя:")
 
-        for line in lines:
+        for line in text.splitlines():
+            line = line.rstrip()
             if not line.strip():
                 continue
 
             if is_block_start(line) and current_block:
-                blocks.append(current_block)
+                yield current_block
                 current_block = []
 
             current_block.append(line)
 
         if current_block:
-            blocks.append(current_block)
-
-        return blocks
+            yield current_block
 
     def export_details_to_excel(self, only_numbers: bool):
-        blocks = self.parse_details_blocks()
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Детализация"
-
-        row = 1
+        if self._export_worker is not None:
+            return
 
-        for block in blocks:
+        # снимок текста детализации — сама книга пишется в фоне
+        lines = []
+        for block in self.iter_details_blocks():
             for line in block:
                 value = line
 
                 if only_numbers and line.strip().startswith("•"):
                     value = self.extract_case_number(line)
 
-                ws.cell(row=row, column=1, value=value)
-                row += 1
+                lines.append(value)
 
-            row += 2  # пустая строка между блоками
+            # пустые строки между блоками
+            lines += [None, None]
 
-        filename = f"details_{datetime.now():%d.%m.%Y.%H.%M.%S}.xlsx"
-        wb.save(filename)
-        os.startfile(filename)
+        worker = DetailsExcelWorker(
+            lines,
+            f"details_{datetime.now():%d.%m.%Y.%H.%M.%S}.xlsx",
+        )
+
+        # прогресса по строкам нет — окно «занято» без шкалы
+        self._start_export(worker, "Экспорт детализации в Excel…", 0)
 
     def export_details_to_word(self, only_numbers: bool):
         blocks = self.parse_details_blocks()
@@ -679,11 +790,9 @@ class MainWindow(QMainWindow):
 
     def extract_case_number(self, line: str) -> str:
         """
-        Извлекает номер дела до первой запятой
+        Извлекает номер дела до первой запятой (без маркера «•»)
         """
-        if "," in line:
-            return line.split(",", 1)[0].strip().replace('• ', '')
-        return line.strip()
+        return extract_case_key(line.replace("• ", "", 1))
 
     def copy_details_to_clipboard(self):
         blocks = self.parse_details_blocks()
@@ -733,16 +842,6 @@ class MainWindow(QMainWindow):
 
 
     def _format_details_block(self, judge, column, details):
-
-
-        def normalize_case_line(raw: str) -> str:
-            _PREFIX_RE = re.compile(r"\d\.\d{3}-")
-            """
-            Удаляет ТОЛЬКО префикс вида '2.123-' (цифра + точка + 3 цифры + дефис).
-            Если такого шаблона нет — строка возвращается без изменений.
-            """
-            return _PREFIX_RE.sub("", raw, count=1)
-
         column = column.replace('\n', ' ')
         if column != 'Судья':
             lines = [
@@ -766,15 +865,30 @@ class MainWindow(QMainWindow):
 
         return "\n".join(lines)
 
-    def on_table_selection_changed(self, selected, deselected):
-        def normalize_case_line(raw: str) -> str:
-            _PREFIX_RE = re.compile(r"\d\.\d{3}-")
-            """
-            Удаляет ТОЛЬКО префикс вида '2.123-' (цифра + точка + 3 цифры + дефис).
-            Если такого шаблона нет — строка возвращается без изменений.
-            """
-            return _PREFIX_RE.sub("", raw, count=1)
+    def _format_case_changes(self, judge, column):
+        """Режим «Δ»: какие дела ячейки пришли / ушли за неделю"""
+        week_key, base_week_key = self._delta_weeks
+        lines = [f"Изменения к неделе {base_week_key}:"]
 
+        category = self.current_processor.COLUMN_TO_CATEGORY.get(column)
+        if not category:
+            lines.append("Нет данных по делам")
+            return "\n".join(lines)
+
+        changes = self._week_case_delta().cell(judge, category)
+
+        if not changes:
+            lines.append("Без изменений")
+            return "\n".join(lines)
+
+        for title, keys in (("Пришли", changes.added), ("Ушли", changes.removed)):
+            lines.append(f"{title}: {len(keys)}")
+            for key in keys:
+                lines.append(f"  • {key}")
+
+        return "\n".join(lines)
+
+    def on_table_selection_changed(self, selected, deselected):
         if not self.current_context:
             return
 
@@ -783,6 +897,13 @@ class MainWindow(QMainWindow):
             self.details_view.clear()
             return
 
+        if self.current_region is not None:
+            self.details_view.setPlainText(REGION_DETAILS_HINT)
+            return
+
+        self.current_processor.attach_raw_data(self._ensure_raw_data())
+        details_index = self._week_details_index()
+
         blocks = []
 
         for index in indexes:
@@ -795,8 +916,7 @@ class MainWindow(QMainWindow):
             # ---- ЕСЛИ строка "Всего"
             if judge_name == "Всего" and col != 0:
 
-                week_key = list(self.current_raw_data.keys())[self.week_index]
-                week_data = self.current_raw_data.get(week_key, {})
+                week_key = self.current_weeks[self.week_index]
 
                 lines = [
                     f"Неделя: {week_key}",
@@ -805,47 +925,19 @@ class MainWindow(QMainWindow):
                     ""
                 ]
 
-                judges_data = []
-
-                # --- собираем данные по всем судьям
-                for judge in week_data.keys():
-
-                    details = self.current_processor.get_cell_details(
-                        judge=judge,
-                        column=column_name,
-                        week_index=self.week_index,
-                    )
-
-                    def extract_case_key(raw: str) -> str:
-                        raw = raw.strip()
-                        if "," in raw:
-                            return raw.split(",", 1)[0].strip()
-                        return raw
-
-                    unique_cases = set()
-
-                    for _, values in details:
-                        for v in values:
-                            unique_cases.add(extract_case_key(v))
-
-                    total_cases = len(unique_cases)
-
-                    if total_cases > 0:
-                        judges_data.append((judge, total_cases, details))
-
-                # 🔥 сортировка по убыванию количества дел
-                judges_data.sort(key=lambda x: x[1], reverse=True)
+                # судьи с делами — по убыванию количества (из индекса недели)
+                judges_data = details_index.column(column_name)
 
                 if not judges_data:
                     self.details_view.setPlainText("Детализация отсутствует.")
                     return
 
                 # --- вывод
-                for judge, total_cases, details in judges_data:
+                for cell in judges_data:
 
-                    lines.append(f"Судья: {judge} — дел: {total_cases}")
+                    lines.append(f"Судья: {cell.judge} — дел: {cell.case_count}")
 
-                    for title, values in details:
+                    for title, values in cell.details:
                         lines.append(f"{title}: {len(values)}")
 
                         for v in values:
@@ -858,15 +950,14 @@ class MainWindow(QMainWindow):
 
             else:
                 # обычная логика для судьи
-                details = self.current_processor.get_cell_details(
-                    judge=judge_name,
-                    column=column_name,
-                    week_index=self.week_index,
-                )
+                details = details_index.cell(judge_name, column_name).details
+
+                block = self._format_details_block(judge_name, column_name, details)
+
+                if self._delta_weeks is not None:
+                    block += "\n" + self._format_case_changes(judge_name, column_name)
 
-                blocks.append(self._format_details_block(
-                    judge_name, column_name, details
-                ))
+                blocks.append(block)
 
         if blocks:
             self.details_view.setPlainText("\n\n".join(blocks))
@@ -878,7 +969,7 @@ class MainWindow(QMainWindow):
 
         restored = False
 
-        if saved_court and saved_court in courts:
+        if saved_court and (saved_court in courts or saved_court == ALL_COURTS):
             index = self.court_combo.findText(saved_court)
             if index >= 0:
                 self.court_combo.setCurrentIndex(index)
@@ -900,6 +991,11 @@ class MainWindow(QMainWindow):
         self.court_combo.clear()
         self.court_combo.addItems(courts)
 
+        # сводка по всем судам — в конце списка, после разделителя
+        if len(courts) > 1:
+            self.court_combo.insertSeparator(self.court_combo.count())
+            self.court_combo.addItem(ALL_COURTS)
+
         if courts:
             restored = self.restore_last_selection(courts)
 
@@ -1002,31 +1098,98 @@ class MainWindow(QMainWindow):
         # =========================================
         # 4️⃣ Загружаем pkl
         # =========================================
+        if court_name == ALL_COURTS:
+            self._load_region(pkl_name)
+            return
+
+        # сводка, которая ещё строится, больше не нужна
+        if self._region_requested is not None:
+            self.build_pool.cancel(BUILD_REGION)
+            self._region_requested = None
+
         pkl_path = self.bases_repo.get_pkl_path(court_name, pkl_name)
 
         # если тот же файл — просто обновляем таблицу
-        if self.current_pkl_path == pkl_path and self.current_raw_data is not None:
+        if self.current_pkl_path == pkl_path and self.current_counts is not None:
+            self.load_table_async()
+            return
+
+        counts, context = self.stats_repo.load_counts(pkl_path)
+
+        self.current_region = None
+        self._set_counts(counts, context, pkl_path, os.path.getmtime(pkl_path))
+
+    def _load_region(self, pkl_name):
+        """
+        «Все суды»: pkl_name из всех судов складывается в фоне
+        (сами pkl распаковываются в отдельных процессах)
+        """
+        region_path = os.path.join(ALL_COURTS, pkl_name)
+
+        if self.current_pkl_path == region_path and self.current_counts is not None:
             self.load_table_async()
             return
 
-        raw_data, context = self.stats_repo.load(pkl_path)
+        # уже строится (например, переключили неделю во время загрузки)
+        if self._region_requested == region_path:
+            return
+
+        self._region_requested = region_path
+
+        self.table_view.setEnabled(False)
+        self.week_label.setText("Загрузка всех судов…")
+
+        region_repo = self.region_repo
+
+        def build(token):
+            signature = region_repo.signature(pkl_name)
+            return region_path, signature, region_repo.load_counts(pkl_name, token)
+
+        # таблицы прежнего суда больше не нужны
+        for kind in (BUILD_TABLE, BUILD_PREFETCH, BUILD_ALL_WEEKS):
+            self.build_pool.cancel(kind)
+
+        # отменённый проход всех недель можно будет запросить заново
+        self._all_weeks_requested = None
+
+        self.build_pool.submit(BUILD_REGION, build)
+
+    def on_region_loaded(self, result):
+        region_path, signature, region = result
+        pkl_name = os.path.basename(region_path)
+
+        self._region_requested = None
+        self.current_region = region
+
+        # таблица и график — по судам (строки = суды)
+        self._set_counts(
+            region.by_court(),
+            DataContext.from_pkl_info(get_pkl_info(pkl_name)),
+            region_path,
+            signature,
+        )
+
+    def _set_counts(self, counts, context, pkl_path, pkl_mtime):
+        self._release_raw_data()
 
-        self.current_raw_data = raw_data
+        self.current_counts = counts
+        self.current_weeks = WeekIndex(counts.keys())
         self.current_context = context
         self.current_pkl_path = pkl_path
+        self.current_pkl_mtime = pkl_mtime
 
         # обновляем график
         self.graph_widget.set_data(
-            raw_data=self.current_raw_data,
-            processor=ProcessorFactory.get(context)
+            counts=self.current_counts,
+            processor=ProcessorFactory.get(context),
+            weeks=self.current_weeks,
         )
 
-        weeks = list(raw_data.keys())
-        self.max_week_index = max(0, len(weeks) - 1)
+        self.max_week_index = max(0, len(self.current_weeks) - 1)
 
         # пытаемся сохранить текущую неделю
-        if self.current_week_key in weeks:
-            self.week_index = weeks.index(self.current_week_key)
+        if self.current_week_key in self.current_weeks:
+            self.week_index = self.current_weeks.position(self.current_week_key)
         else:
             self.week_index = self.max_week_index
 
@@ -1037,51 +1200,327 @@ class MainWindow(QMainWindow):
 
         self.table_view.resizeColumnsToContents()
 
-    def load_table_async(self):
-        self.table_view.setEnabled(False)
+        # индексы прежнего pkl больше не нужны
+        for kind in (BUILD_CASES, BUILD_SEARCH):
+            if self._case_requests.get(kind) not in (None, self._case_key()):
+                self.case_pool.cancel(kind)
+                del self._case_requests[kind]
+
+        # история дел — в фоне, своим потоком (у сводки «Все суды» её нет)
+        if self.current_region is None:
+            self._request_case_timeline()
+
+    def _release_raw_data(self):
+        """
+        Строки дел прежнего pkl: отцепить от общего процессора
+        и закрыть CaseStore (mmap и файл), а не ждать сборщика мусора
+        """
+        raw_data = self.current_raw_data
+        if raw_data is None:
+            return
+
+        self.current_raw_data = None
+
+        # индексы детализации держат ячейки (представления mmap)
+        self._details_index = None
+        self._week_cases = None
+
+        if self.current_processor is not None and self.current_processor.raw_data is raw_data:
+            self.current_processor.attach_raw_data(None)
+
+        if isinstance(raw_data, CaseStore):
+            raw_data.close()
+
+    def _ensure_raw_data(self):
+        """
+        Строки дел нужны только детализации —
+        .pkl распаковывается при первом обращении
+        """
+        if self.current_raw_data is None:
+            self.current_raw_data, _ = self.stats_repo.load(self.current_pkl_path)
+
+        return self.current_raw_data
+
+    def _graph_week_cases(self, week_keys):
+        """
+        [(неделя, WeekCases)] — строки дел недель точки графика
+        по категориям и судьям; в кэше — одна точка
+        """
+        key = (self.current_pkl_path, self.current_pkl_mtime) + tuple(week_keys)
+
+        if self._week_cases is None or self._week_cases[0] != key:
+            raw_data = self._ensure_raw_data()
+            self._week_cases = (key, [
+                (week_key, WeekCases(raw_data.get(week_key, {})))
+                for week_key in week_keys
+            ])
+
+        return self._week_cases[1]
+
+    def _week_case_delta(self):
+        """Пришедшие / ушедшие дела показанной недели — одна пара недель в кэше"""
+        key = (self.current_pkl_path, self.current_pkl_mtime) + self._delta_weeks
+
+        if self._case_delta is None or self._case_delta[0] != key:
+            raw_data = self._ensure_raw_data()
+            week_key, base_week_key = self._delta_weeks
+
+            self._case_delta = (key, WeekCaseDelta(
+                raw_data.get(week_key, {}),
+                raw_data.get(base_week_key, {}),
+            ))
+
+        return self._case_delta[1]
+
+    def update_delta(self):
+        """
+        Режим «Δ»: разница показанной недели с предыдущей по датам.
+        По CountCube это доли миллисекунды — считается сразу, без пула.
+        """
+        self._delta_weeks = None
+        delta = None
+
+        week_index = None
+        if self.current_week_key is not None:
+            week_index = self.current_weeks.position(self.current_week_key)
+
+        if self.delta_btn.isChecked() and week_index is not None:
+            base_week_index = self.current_weeks.previous(week_index)
 
+            if base_week_index is not None:
+                delta = self.current_processor.build_delta(
+                    self.current_counts, week_index, base_week_index
+                )
+                self._delta_weeks = (delta["week"], delta["base_week"])
+
+        self.model.set_delta(delta)
+
+        # детализация выбранных ячеек — с изменениями или без
+        self.on_table_selection_changed(None, None)
+
+    def _week_details_index(self):
+        """Индекс детализации текущей недели — один на (неделю, процессор)"""
+        key = self._table_key(self.week_index, self.current_processor)
+
+        if self._details_index is None or self._details_index[0] != key:
+            week_key = self.current_weeks[self.week_index]
+            index = WeekDetailsIndex(
+                self.current_processor,
+                self.week_index,
+                self.current_raw_data.get(week_key, {}).keys(),
+            )
+            self._details_index = (key, index)
+
+        return self._details_index[1]
+
+    def _table_key(self, week_index, processor):
+        return TableCache.make_key(
+            self.current_pkl_path,
+            self.current_pkl_mtime,
+            self.current_weeks[week_index],
+            processor,
+        )
+
+    def load_table_async(self):
         # 1. Получаем процессор из фабрики
         processor = ProcessorFactory.get(self.current_context)
 
         # 2. Сохраняем его для детализации
         self.current_processor = processor
 
-        # 3. Запускаем воркер
-        worker = DataLoadWorker(
-            processor=processor,
-            raw_data=self.current_raw_data,
-            week_index=self.week_index
-        )
+        # 3. Таблица уже готова (например, соседняя неделя) — показываем сразу
+        key = self._table_key(self.week_index, processor)
+
+        all_weeks = self._all_weeks_for(processor)
+        if all_weeks is not None:
+            cached = all_weeks["tables"][self.week_index]
+        else:
+            cached = self.table_cache.get(key)
+
+        if cached is not None:
+            # построение предыдущей недели ещё идёт — его результат уже не нужен
+            self.build_pool.cancel(BUILD_TABLE)
+            self.on_data_loaded(cached)
+            return
+
+        self.table_view.setEnabled(False)
+
+        # 4. Отдаём построение в пул (предыдущий запрос отменяется);
+        # свой экземпляр: build() в потоке пула меняет состояние
+        # процессора, а общий (current_processor) нужен GUI для детализации
+        build_processor = ProcessorFactory.create(self.current_context)
+        counts = self.current_counts
+        week_index = self.week_index
+
+        def build(token):
+            token.check()
+            return key, build_processor.build(counts, week_index)
 
-        self.active_workers.append(worker)
+        self.build_pool.submit(BUILD_TABLE, build, supersedes=(BUILD_PREFETCH,))
 
-        worker.finished.connect(
-            lambda table_data, w=worker: self.on_data_loaded(table_data, w)
+    def on_build_finished(self, kind, generation, result):
+        if kind == BUILD_REGION:
+            self.on_region_loaded(result)
+
+        elif kind == BUILD_TABLE:
+            key, table_data = result
+            self.table_cache.put(key, table_data)
+            self.on_data_loaded(table_data)
+
+        elif kind == BUILD_PREFETCH:
+            for key, table_data in result:
+                self.table_cache.put(key, table_data)
+
+        elif kind == BUILD_ALL_WEEKS:
+            self._all_weeks_requested = None
+            self.all_weeks = result
+
+        elif kind in (BUILD_CASES, BUILD_SEARCH):
+            self._case_requests.pop(kind, None)
+
+            if kind == BUILD_CASES:
+                self.case_timeline = result
+            else:
+                self.case_text = result
+
+            if self._case_search_pending:
+                self.search_case()
+
+    def _all_weeks_key(self, processor):
+        return self.current_pkl_path, self.current_pkl_mtime, processor.__class__
+
+    def _all_weeks_for(self, processor):
+        if self.all_weeks is None:
+            return None
+
+        key, all_weeks = self.all_weeks
+        return all_weeks if key == self._all_weeks_key(processor) else None
+
+    def _request_all_weeks(self, processor):
+        """
+        Строит в фоне таблицы всех недель одним проходом —
+        после этого любая неделя открывается без построения
+        """
+        key = self._all_weeks_key(processor)
+        if self._all_weeks_requested == key or self._all_weeks_for(processor) is not None:
+            return
+
+        self._all_weeks_requested = key
+
+        # свой экземпляр: общий (current_processor) нужен GUI для детализации
+        all_weeks_processor = ProcessorFactory.create(self.current_context)
+        counts = self.current_counts
+
+        self.build_pool.submit(
+            BUILD_ALL_WEEKS,
+            lambda token: (key, all_weeks_processor.build_all(counts, token))
         )
-        worker.error.connect(self.on_data_error)
 
-        worker.start()
+    def _case_key(self):
+        return self.current_pkl_path, self.current_pkl_mtime
 
-    def on_graph_point_clicked(self, data):
-        def normalize_case_line(raw: str) -> str:
-            _PREFIX_RE = re.compile(r"\d\.\d{3}-")
-            """
-            Удаляет ТОЛЬКО префикс вида '2.123-' (цифра + точка + 3 цифры + дефис).
-            Если такого шаблона нет — строка возвращается без изменений.
-            """
-            return _PREFIX_RE.sub("", raw, count=1)
+    def _request_case_timeline(self):
+        """История дел открытого суда — в case_pool (свой CaseStore в потоке пула)"""
+        key = self._case_key()
+
+        if self._current_case_timeline() is not None or self._case_requests.get(BUILD_CASES) == key:
+            return
+
+        self._case_requests[BUILD_CASES] = key
+
+        stats_repo = self.stats_repo
+        weeks = self.current_weeks
+
+        def build(token):
+            entries = stats_repo.load_case_entries(key[0])
+            token.check()
+            return key, CaseTimeline.from_case_entries(entries, weeks)
+
+        self.case_pool.submit(BUILD_CASES, build)
+
+    def _request_case_text(self):
+        """
+        Триграммы строк дел — только когда понадобился поиск:
+        открытый суд или, в режиме «Все суды», каждый суд
+        """
+        key = self._case_key()
+
+        if self._current_case_text() is not None or self._case_requests.get(BUILD_SEARCH) == key:
+            return
+
+        self._case_requests[BUILD_SEARCH] = key
+
+        if self.current_region is not None:
+            court_paths = self.region_repo.court_paths(os.path.basename(key[0]))
+        else:
+            court_paths = [(self.court_combo.currentText(), key[0])]
+
+        stats_repo = self.stats_repo
+
+        def build(token):
+            indexes = []
+            for court, path in court_paths:
+                token.check()
+                entries = stats_repo.load_case_entries(path)
+                weeks = WeekIndex(entries.week_keys)
+                indexes.append(CaseTextIndex(entries, weeks, court, token))
+            return key, indexes
+
+        self.case_pool.submit(BUILD_SEARCH, build)
+
+    def _current_case_timeline(self):
+        """CaseTimeline открытого pkl; None — ещё строится (или «Все суды»)"""
+        if self.case_timeline is None or self.case_timeline[0] != self._case_key():
+            return None
+        return self.case_timeline[1]
+
+    def _current_case_text(self):
+        """[CaseTextIndex] открытого pkl; None — ещё не строился"""
+        if self.case_text is None or self.case_text[0] != self._case_key():
+            return None
+        return self.case_text[1]
+
+    def _prefetch_adjacent_weeks(self):
+        """
+        Строит в фоне таблицы недель N-1 и N+1,
+        чтобы ◀ / ▶ переключали таблицу мгновенно
+        """
+        processor = self.current_processor
+
+        self._request_all_weeks(processor)
+        if self._all_weeks_for(processor) is not None:
+            return
+
+        week_indexes = [
+            i for i in (self.week_index - 1, self.week_index + 1)
+            if 0 <= i <= self.max_week_index
+            and self._table_key(i, processor) not in self.table_cache
+        ]
+
+        if not week_indexes:
+            return
 
+        # свой экземпляр: общий (current_processor) нужен GUI для детализации
+        prefetch_processor = ProcessorFactory.create(self.current_context)
+        counts = self.current_counts
+        key_prefix = (self.current_pkl_path, self.current_pkl_mtime)
+
+        self.build_pool.submit(
+            BUILD_PREFETCH,
+            lambda token: prefetch_tables(
+                prefetch_processor, counts, week_indexes, key_prefix, token
+            )
+        )
+
+    def on_graph_point_clicked(self, data):
         week_key = data["week_key"]
         category = data["category"]
         is_double = data["double_click"]
 
-        weeks = list(self.current_raw_data.keys())
-
-        if week_key not in weeks:
+        real_week_index = self.current_weeks.position(week_key)
+        if real_week_index is None:
             return
 
-        real_week_index = weeks.index(week_key)
-
         # двойной клик → перейти к таблице
         if is_double:
             self.week_index = real_week_index
@@ -1089,10 +1528,22 @@ class MainWindow(QMainWindow):
             self.reload_current_court()
             return
 
-        week_data = self.current_raw_data.get(week_key, {})
+        # судьи точки уже разобраны графиком (PointIndex); месяц / квартал —
+        # значение сложено из недель point.weeks, их дела и показываем
+        point = data.get("point") or PointIndex.from_week(
+            self.current_counts, real_week_index, category, week_key
+        )
+        period = data.get("period", week_key)
+
+        if len(point.weeks) > 1:
+            title = f"Период: {period} (недель: {len(point.weeks)})"
+        elif period != point.weeks[0]:
+            title = f"Неделя: {point.weeks[0]} (конец периода {period})"
+        else:
+            title = f"Неделя: {point.weeks[0]}"
 
         lines = [
-            f"Неделя: {week_key}",
+            title,
             f"Показатель: {category}",
             ""
         ]
@@ -1102,24 +1553,13 @@ class MainWindow(QMainWindow):
         # ===================================================
         if self.graph_widget.compare_mode.isChecked():
 
-            judges_with_counts = []
-
-            for judge, judge_data in week_data.items():
-                cases = judge_data.get(category, [])
-                count = len(cases)
-
-                if count > 0:
-                    judges_with_counts.append((judge, count))
-
-            # сортировка по убыванию
-            judges_with_counts.sort(key=lambda x: x[1], reverse=True)
-
-            if not judges_with_counts:
+            if not point.ranked:
                 self.details_view.setPlainText("Детализация отсутствует.")
                 return
 
-            for judge, count in judges_with_counts:
-                lines.append(f"Судья: {judge} — дел: {count}")
+            # по убыванию
+            for judge in point.ranked:
+                lines.append(f"Судья: {judge} — дел: {point.counts[judge]}")
 
             self.details_view.setPlainText("\n".join(lines))
             return
@@ -1128,23 +1568,39 @@ class MainWindow(QMainWindow):
         # 🔥 ОБЫЧНЫЙ РЕЖИМ (СУДЬИ)
         # ===================================================
 
+        if self.current_region is not None:
+            self.details_view.setPlainText(REGION_DETAILS_HINT)
+            return
+
         judges = data["judges"]
 
+        week_cases = self._graph_week_cases(point.weeks)
+
         has_data = False
 
         for judge in judges:
-            judge_data = week_data.get(judge, {})
-            cases = judge_data.get(category, [])
+            by_week = [
+                (week, cases.lines(category, judge))
+                for week, cases in week_cases
+            ]
+            count = sum(len(cases) for _, cases in by_week)
 
-            if not cases:
+            if not count:
                 continue
 
             has_data = True
 
-            lines.append(f"Судья: {judge} — дел: {len(cases)}")
+            lines.append(f"Судья: {judge} — дел: {count}")
+
+            for week, cases in by_week:
+                if not cases:
+                    continue
+
+                if len(by_week) > 1:
+                    lines.append(f"  Неделя {week}: {len(cases)}")
 
-            for case in cases:
-                lines.append(f"  • {normalize_case_line(case)}")
+                for case in cases:
+                    lines.append(f"  • {case}")
 
             lines.append("-" * 40)
             lines.append("")
@@ -1154,7 +1610,178 @@ class MainWindow(QMainWindow):
         else:
             self.details_view.setPlainText("\n".join(lines))
 
-    def on_data_loaded(self, table_data, worker):
+    # ---------- поиск дела ----------
+
+    def search_case(self):
+        """
+        Enter в поиске: совпадения по тексту строк дел — в список,
+        в детализацию — история дела (номер найден) или сводка
+        """
+        self._case_search_pending = False
+
+        text = self.case_search.text().strip()
+        if not text:
+            self.case_hits.clear()
+            self.case_hits.setVisible(False)
+            return
+
+        if self.current_pkl_path is None:
+            return
+
+        timeline = self._current_case_timeline()
+        text_indexes = self._current_case_text()
+
+        if text_indexes is None or (timeline is None and self.current_region is None):
+            # покажем, как только индексы достроятся
+            self._case_search_pending = True
+            self._request_case_text()
+            if self.current_region is None:
+                self._request_case_timeline()
+            self.details_view.setPlainText("Поиск по делам строится — результат появится здесь.")
+            return
+
+        hits, total = search_courts(text_indexes, text)
+        self._show_case_hits(hits)
+
+        found = timeline.search(text) if timeline is not None else []
+
+        if found and (found[0] == extract_case_key(text) or len(found) == 1):
+            self.details_view.setPlainText(self._format_case_history(timeline, found[0]))
+            return
+
+        if not total:
+            self.details_view.setPlainText(f"«{text}» не найдено ни в одной неделе.")
+            return
+
+        shown = f" (в списке — {len(hits)})" if total > len(hits) else ""
+        lines = [
+            f"«{text}»: совпадений — {total}{shown}",
+            "Выберите совпадение в списке — таблица и детализация перейдут к нему.",
+        ]
+
+        if found:
+            more = " (показаны первые)" if len(found) == SEARCH_LIMIT else ""
+            lines += ["", f"Дел с номером на «{text}»: {len(found)}{more}", ""]
+            lines += [f"  • {key}" for key in found]
+
+        self.details_view.setPlainText("\n".join(lines))
+
+    def _show_case_hits(self, hits):
+        self.case_hits.clear()
+
+        many_courts = len({hit.court for hit in hits}) > 1 or self.current_region is not None
+
+        for hit in hits:
+            parts = [hit.week, hit.judge, hit.category, normalize_case_line(hit.case)]
+            if many_courts:
+                parts.insert(0, hit.court)
+
+            item = QListWidgetItem(" · ".join(parts))
+            item.setData(Qt.UserRole, hit)
+            self.case_hits.addItem(item)
+
+        self.case_hits.setVisible(bool(hits))
+
+    def on_case_hit_activated(self, item):
+        """Переход к совпадению: суд → неделя → ячейка (судья, категория)"""
+        hit = item.data(Qt.UserRole)
+        self._pending_hit = (hit, self.case_search.text().strip())
+
+        self.switch_to_table()
+
+        if hit.court != self.court_combo.currentText():
+            # _set_counts откроет неделю current_week_key
+            self.current_week_key = hit.week
+            self.court_combo.setCurrentText(hit.court)
+            return
+
+        week_index = self.current_weeks.position(hit.week)
+        if week_index is None:
+            self._pending_hit = None
+            return
+
+        self.week_index = week_index
+        self.reload_current_court()
+
+    def _apply_pending_hit(self):
+        """Таблица недели совпадения загружена — выделяем ячейку и строку дела"""
+        if self._pending_hit is None:
+            return
+
+        hit, query = self._pending_hit
+        if self.current_week_key != hit.week or self.court_combo.currentText() != hit.court:
+            return
+
+        self._pending_hit = None
+
+        row = next(
+            (r for r in range(self.model.rowCount())
+             if self.model.data(self.model.index(r, 0)) == hit.judge),
+            None,
+        )
+        column = self._column_for_category(hit.category)
+
+        if row is None or column is None:
+            # категории нет среди столбцов таблицы — показываем саму строку
+            self.table_view.clearSelection()
+            self.details_view.setPlainText("\n".join([
+                f"Неделя: {hit.week}",
+                f"Судья: {hit.judge}",
+                f"Категория: {hit.category}",
+                "",
+                f"  • {normalize_case_line(hit.case)}",
+            ]))
+        else:
+            index = self.model.index(row, column)
+            self.table_view.setCurrentIndex(index)
+            self.table_view.scrollTo(index)
+
+        self.details_view.moveCursor(QTextCursor.Start)
+        self.details_view.find(query)
+
+    def _column_for_category(self, category):
+        processor = self.current_processor
+
+        for column in range(1, self.model.columnCount()):
+            header = self.model.headerData(column, Qt.Horizontal)
+            if category in (
+                processor.COLUMN_TO_CATEGORY.get(header),
+                processor.COLUMN_TO_INCLUDED_CATEGORY.get(header),
+            ):
+                return column
+
+        return None
+
+    def _format_case_history(self, timeline, case_key):
+        """Когда дело входило в категории и выходило из них — по судьям"""
+        weeks = timeline.week_keys
+
+        by_judge = {}
+        for span in timeline.spans(case_key):
+            by_judge.setdefault(span.judge, []).append(span)
+
+        history = timeline.history(case_key)
+        first_week, last_week = weeks[history[0][0]], weeks[history[-1][0]]
+
+        lines = [
+            f"Дело: {case_key}",
+            f"В картотеке: {_period_text(first_week, last_week)}",
+            "",
+        ]
+
+        for judge, spans in by_judge.items():
+            lines.append(f"Судья: {judge}")
+
+            for span in spans:
+                period = _period_text(weeks[span.first_week], weeks[span.last_week])
+                lines.append(f"  • {span.category}: {period} (недель: {span.weeks})")
+
+            lines.append("-" * 40)
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def on_data_loaded(self, table_data):
         def apply():
             self.model.set_table_data(table_data)
 
@@ -1169,18 +1796,37 @@ class MainWindow(QMainWindow):
 
             self.current_week_key = table_data.get("week")
 
+            self.update_delta()
+
+            # переход к совпадению поиска
+            self._apply_pending_hit()
+
         self.animate_table_update(apply)
 
-        if worker in self.active_workers:
-            self.active_workers.remove(worker)
+        self._prefetch_adjacent_weeks()
+
+    def on_data_error(self, kind, generation, message):
+        if kind in (BUILD_CASES, BUILD_SEARCH):
+            self._case_requests.pop(kind, None)
+
+            if self._case_search_pending:
+                self._case_search_pending = False
+                self.details_view.setPlainText(f"Поиск по делам не построен: {message}")
+
+        # не вышло одним проходом — недели строятся по одной,
+        # следующая загрузка таблицы попробует проход снова
+        if kind == BUILD_ALL_WEEKS:
+            self._all_weeks_requested = None
+
+        if kind not in (BUILD_TABLE, BUILD_REGION):
+            return
+
+        if kind == BUILD_REGION:
+            self._region_requested = None
 
-    def on_data_error(self, message, worker):
         QMessageBox.critical(self, "Ошибка загрузки", message)
         self.table_view.setEnabled(True)
 
-        if worker in self.active_workers:
-            self.active_workers.remove(worker)
-
     def prev_week(self):
         if self.week_index > 0:
             self.week_index -= 1
@@ -1196,13 +1842,155 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Нет данных", "Таблица пуста")
             return
 
-        export_model_to_word(
-            model=self.model,
-            processor=self.current_processor,
-            court=self.court_combo.currentText(),
-            week=self.week_label.text()
+        # уже сохраняется — второй файл параллельно не строим
+        if self._export_worker is not None:
+            return
+
+        # снимок таблицы (в текущей сортировке) — дальше GUI не нужен
+        table_data = self.model.table_data()
+        table_data["week"] = self.week_label.text()
+
+        worker = WordExportWorker(
+            table_data,
+            self.current_processor,
+            self.court_combo.currentText(),
+            word_file_name(),
+        )
+
+        self._start_export(worker, "Экспорт в Word…", len(table_rows(table_data)))
+
+    def export_all_weeks_to_excel(self):
+        """Все недели текущего pkl — по листу на неделю"""
+        if self.current_counts is None or not len(self.current_counts):
+            QMessageBox.information(self, "Нет данных", "Таблица пуста")
+            return
+
+        if self._export_worker is not None:
+            return
+
+        court = self.court_combo.currentText()
+        specialization = self.current_processor.get_specialization()
+
+        # таблицы всех недель уже построены в фоне — лист не строится заново
+        all_weeks = self._all_weeks_for(self.current_processor)
+
+        worker = AllWeeksExcelWorker(
+            self.current_counts,
+            # свой экземпляр: общий процессор нужен GUI
+            ProcessorFactory.create(self.current_context),
+            f"{court} ({specialization})",
+            f"all_weeks_{datetime.now():%d.%m.%Y.%H.%M.%S}.xlsx",
+            tables=all_weeks["tables"] if all_weeks is not None else None,
         )
 
+        self._start_export(worker, "Экспорт всех недель в Excel…", len(self.current_counts))
+
+    def export_batch(self, all_courts, all_weeks):
+        """
+        Пакетный экспорт в Word по текущей специализации и инстанции:
+        один файл на суд (все недели — разделами) или файл на неделю
+        """
+        if self.current_context is None or self._export_worker is not None:
+            return
+
+        court = self.court_combo.currentText()
+
+        if all_courts or court == ALL_COURTS:
+            courts = self.bases_repo.get_courts_with_any_pkls()
+        else:
+            courts = [court]
+
+        if all_weeks:
+            weeks = [WEEKS_ALL]
+        elif self.current_week_key:
+            # та же неделя в каждом суде — по точному ключу
+            weeks = [self.current_week_key]
+        else:
+            return
+
+        out_dir = QFileDialog.getExistingDirectory(self, "Папка для отчётов")
+        if not out_dir:
+            return
+
+        context = (self.current_context.specialization, self.current_context.instance)
+
+        jobs = [
+            ReportJob(self.bases_repo.base_dir, c, [context], weeks, ["docx"], out_dir,
+                      combine=all_weeks)
+            for c in courts
+        ]
+
+        self._start_export(
+            BatchExportWorker(jobs, out_dir), "Пакетный экспорт…", len(jobs),
+            on_finished=self.on_batch_exported, cancellable=True,
+        )
+
+    def on_batch_exported(self, out_dir):
+        worker = self._export_worker
+        self._finish_export()
+
+        files = sum(len(result.files) for result in worker.results)
+        errors = [
+            f"{result.court}: {what} — {message}"
+            for result in worker.results
+            for what, message in result.errors
+        ]
+
+        if worker.cancelled:
+            QMessageBox.information(
+                self, "Экспорт прерван",
+                f"Готово судов: {len(worker.results)} из {len(worker.jobs)}, файлов: {files}"
+            )
+        elif errors:
+            QMessageBox.warning(
+                self, "Экспорт с ошибками",
+                f"Файлов: {files}\n\n" + "\n".join(errors[:10])
+            )
+
+        if files:
+            os.startfile(out_dir)
+
+    def _start_export(self, worker, label, total, on_finished=None, cancellable=False):
+        progress = QProgressDialog(label, "Отмена" if cancellable else None, 0, total, self)
+        progress.setWindowTitle("Экспорт")
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setValue(0)
+
+        if cancellable:
+            progress.canceled.connect(worker.cancel)
+
+        worker.progress.connect(lambda done, total: progress.setValue(done))
+        worker.finished.connect(on_finished or self.on_exported)
+        worker.error.connect(self.on_export_error)
+
+        self._export_worker = worker
+        self._export_progress = progress
+        self._set_export_buttons_enabled(False)
+
+        worker.start()
+
+    def _finish_export(self):
+        # не close(): closeEvent окна прогресса сигналит canceled
+        self._export_progress.hide()
+        self._export_progress.deleteLater()
+        self._export_progress = None
+        self._export_worker.wait()
+        self._export_worker = None
+        self._set_export_buttons_enabled(True)
+
+    def _set_export_buttons_enabled(self, enabled):
+        for btn in (self.word_export_btn, self.excel_all_weeks_btn, self.batch_export_btn):
+            btn.setEnabled(enabled)
+
+    def on_exported(self, path):
+        self._finish_export()
+        os.startfile(path)
+
+    def on_export_error(self, message):
+        self._finish_export()
+        QMessageBox.critical(self, "Ошибка экспорта", message)
+
 LIGHT_STYLE = """
 QWidget {
     font-family: "Segoe UI";
@@ -1583,11 +2371,21 @@ QDateEdit::down-arrow {
 """
 
 
+def _period_text(first_week, last_week):
+    """«01.01.2025 - 21.01.2025» — от начала первой недели до конца последней"""
+    if first_week == last_week:
+        return first_week
+    return f"{first_week.split(' - ')[0]} - {last_week.split(' - ')[-1]}"
+
+
 def excepthook(type, value, tb):
     print("UNCAUGHT EXCEPTION:")
     traceback.print_exception(type, value, tb)
 
 def main():
+    # процессы RegionRepository в собранном .exe
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
 
     script_dir = os.path.dirname(os.path.abspath(__file__))
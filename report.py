@@ -0,0 +1,85 @@
+'''
+Отчёты без окна (например, понедельничный отчёт на сервере):
+
+python report.py --bases D:\\bases --out reports
+python report.py --bases D:\\bases --courts "Суд А" "Суд Б" --spec GPK KAS --weeks last -2
+python report.py --bases D:\\bases --instance appeal --weeks 05.03.2024 --format xlsx
+python report.py --bases D:\\bases --weeks all --combine   (год недель — одним файлом на суд)
+
+--weeks: last (по умолчанию) | all | номер недели (-1 — последняя) | дата дд.мм.гггг
+'''
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from app.export.batch_report import (
+    FORMATS,
+    WEEKS_LAST,
+    ReportJob,
+    all_contexts,
+    generate_reports,
+)
+from app.repository.bases_repository import BasesRepository
+
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bases")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Таблицы по судам в .docx / .xlsx")
+
+    parser.add_argument("--bases", default=BASE_DIR, help="папка с судами")
+    parser.add_argument("--courts", nargs="+", help="суды (по умолчанию — все)")
+    parser.add_argument("--spec", nargs="+", help="специализации: GPK KAS AP ... (по умолчанию — все)")
+    parser.add_argument("--instance", nargs="+", choices=("first", "appeal"),
+                        help="инстанции (по умолчанию — все)")
+    parser.add_argument("--weeks", nargs="+", default=[WEEKS_LAST], help="недели")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=list(FORMATS),
+                        dest="formats", help="форматы файлов")
+    parser.add_argument("--out", default="reports", help="папка для отчётов")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--combine", action="store_true",
+                        help="все недели суда — в один файл (раздел / лист на неделю)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    bases_repo = BasesRepository(args.bases)
+    available = bases_repo.get_courts_with_any_pkls()
+
+    courts = args.courts or available
+    unknown = [court for court in courts if court not in available]
+    if unknown:
+        print("Нет таких судов (или в них нет .pkl):", ", ".join(unknown), file=sys.stderr)
+        return 2
+
+    contexts = [
+        (spec, inst) for spec, inst in all_contexts()
+        if (not args.spec or spec in args.spec)
+        and (not args.instance or inst in args.instance)
+    ]
+
+    jobs = [
+        ReportJob(args.bases, court, contexts, args.weeks, args.formats, args.out,
+                  combine=args.combine)
+        for court in courts
+    ]
+
+    def on_result(result):
+        print(f"{result.court}: файлов {len(result.files)}")
+        for what, message in result.errors:
+            print(f"  ! {what}: {message}", file=sys.stderr)
+
+    results = generate_reports(jobs, max_workers=args.workers, on_result=on_result)
+
+    return 1 if any(result.errors for result in results) else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,84 @@
+from app.domain.case_entries import CaseEntries
+from app.domain.case_search import CaseTextIndex, search_courts
+from app.domain.week_index import WeekIndex
+
+
+W1 = "01.01.2024 - 07.01.2024"
+W2 = "08.01.2024 - 14.01.2024"
+W3 = "15.01.2024 - 21.01.2024"
+
+# недели в pkl не по датам — порядок задаёт WeekIndex
+RAW_DATA = {
+    W2: {
+        "Судья А": {"Остаток": ["2-1/2024, истец Иванов", "2-2/2024, истец Петров"]},
+    },
+    W1: {
+        "Судья А": {"Остаток": ["2-1/2024, истец Иванов"]},
+        "Судья Б": {"Поступило": ["2-3/2024, ответчик ООО Ива"]},
+    },
+    W3: {
+        "Судья Б": {"Остаток": ["2-3/2024, ответчик ООО Ива"]},
+    },
+}
+
+
+def make_index(raw_data=RAW_DATA, court=None):
+    return CaseTextIndex(
+        CaseEntries.from_raw_data(raw_data),
+        WeekIndex(raw_data.keys()),
+        court=court,
+    )
+
+
+def found(hits):
+    return [(hit.week, hit.judge, hit.category, hit.case) for hit in hits]
+
+
+def test_search_newest_weeks_first():
+    hits, total = make_index().search("ИВАНОВ")
+
+    assert total == 2
+    assert found(hits) == [
+        (W2, "Судья А", "Остаток", "2-1/2024, истец Иванов"),
+        (W1, "Судья А", "Остаток", "2-1/2024, истец Иванов"),
+    ]
+
+
+def test_all_trigrams_but_not_substring():
+    index = make_index()
+
+    # у «оооо» одна триграмма «ооо» — она есть, а подстроки нет
+    assert index.search("оооо") == ([], 0)
+    assert index.search("ооо ива")[1] == 2
+
+
+def test_short_query_scans_all_strings():
+    hits, total = make_index().search("-3")
+
+    assert total == 2
+    assert [hit.week for hit in hits] == [W3, W1]
+
+
+def test_limit_and_empty_query():
+    index = make_index()
+
+    hits, total = index.search("2024", limit=2)
+    assert total == 5
+    assert [hit.week for hit in hits] == [W3, W2]
+
+    assert index.search("   ") == ([], 0)
+    assert index.search("нет такого") == ([], 0)
+
+
+def test_search_courts_merges_by_week_dates():
+    other = {W3: {"Судья В": {"Остаток": ["2-9/2024, истец Иванова"]}}}
+
+    hits, total = search_courts(
+        [make_index(court="Суд А"), make_index(other, court="Суд Б")],
+        "иванов",
+    )
+
+    assert total == 3
+    assert [(hit.court, hit.week) for hit in hits] == [
+        ("Суд Б", W3), ("Суд А", W2), ("Суд А", W1),
+    ]
@@ -0,0 +1,130 @@
+import pickle
+
+import pytest
+
+from app.domain.case_entries import CaseEntries
+from app.repository import case_store
+from app.repository.case_store import (
+    CaseStore,
+    load_case_store,
+    store_path_for,
+    write_case_store,
+)
+from app.repository.count_cache import source_signature
+
+
+RAW_DATA = {
+    "01.01.2024 - 07.01.2024": {
+        "Судья Б": {"Остаток": ["2-1/2024, истец Иванов", "2-2/2024"], "Поступило": []},
+        "Судья А": {"Остаток": ["2-2/2024"]},
+    },
+    "08.01.2024 - 14.01.2024": {
+        "Судья А": {"Поступило": ["2-3/2024, ответчик Петров"], "Рассмотрено": 2},
+    },
+}
+
+
+def make_pkl(tmp_path):
+    pkl_path = str(tmp_path / "result4_with_2.pkl")
+    with open(pkl_path, "wb") as f:
+        pickle.dump(RAW_DATA, f)
+    return pkl_path
+
+
+def as_dict(raw_data):
+    return {
+        week_key: {
+            judge: {category: list(cases) for category, cases in judge_cases.items()}
+            for judge, judge_cases in raw_data[week_key].items()
+        }
+        for week_key in raw_data
+    }
+
+
+def entry_set(entries):
+    return sorted(
+        (
+            entries.week_keys[w],
+            entries.judge_names[j],
+            entries.category_names[c],
+            entries.strings[s],
+        )
+        for s, w, j, c in zip(
+            entries.string_ids.tolist(),
+            entries.weeks.tolist(),
+            entries.judges.tolist(),
+            entries.categories.tolist(),
+        )
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = store_path_for(pkl_path)
+
+    write_case_store(RAW_DATA, path, signature)
+    store = CaseStore.open(path, signature)
+    yield store
+    store.close()
+
+
+def test_write_read_round_trip(store):
+    assert list(store.keys()) == list(RAW_DATA)
+    assert [list(store[week_key]) for week_key in store] == [
+        list(week_data) for week_data in RAW_DATA.values()
+    ]
+
+    # не список дел (старые pkl) — как отсутствующая категория
+    expected = dict(RAW_DATA)
+    expected["08.01.2024 - 14.01.2024"] = {
+        "Судья А": {"Поступило": ["2-3/2024, ответчик Петров"]},
+    }
+    assert as_dict(store) == expected
+
+
+def test_case_entries_match_raw_data(store):
+    assert entry_set(store.case_entries()) == entry_set(CaseEntries.from_raw_data(RAW_DATA))
+
+
+def test_stale_store_is_not_opened(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = store_path_for(pkl_path)
+
+    write_case_store(RAW_DATA, path, signature)
+    assert CaseStore.open(path, (signature[0] + 1, signature[1])) is None
+
+
+def test_failed_write_leaves_no_files(tmp_path, monkeypatch):
+    pkl_path = make_pkl(tmp_path)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("запись прервана")
+
+    monkeypatch.setattr(case_store.pickle, "dumps", fail)
+
+    with pytest.raises(RuntimeError):
+        write_case_store(RAW_DATA, store_path_for(pkl_path), source_signature(pkl_path))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["result4_with_2.pkl"]
+
+
+def test_load_case_store_reads_pkl_once(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    calls = []
+
+    def load_raw_data():
+        calls.append(1)
+        return RAW_DATA
+
+    load_case_store(pkl_path, load_raw_data).close()
+    store = load_case_store(pkl_path, load_raw_data)
+
+    try:
+        assert len(calls) == 1
+        assert isinstance(store, CaseStore)
+        assert list(store["01.01.2024 - 07.01.2024"]["Судья А"]["Остаток"]) == ["2-2/2024"]
+    finally:
+        store.close()
@@ -0,0 +1,75 @@
+from app.domain.case_timeline import CaseTimeline
+from app.domain.week_index import WeekIndex
+
+
+W1 = "01.01.2024 - 07.01.2024"
+W2 = "08.01.2024 - 14.01.2024"
+W3 = "15.01.2024 - 21.01.2024"
+W4 = "22.01.2024 - 28.01.2024"
+
+# недели в pkl не по датам — порядок задаёт WeekIndex
+RAW_DATA = {
+    W3: {
+        "Судья А": {"Остаток": ["2-10/2024, истец Иванов"]},
+    },
+    W1: {
+        "Судья А": {
+            "Остаток": ["2-10/2024, истец Иванов", "2-1/2024"],
+            "Поступило": ["2-10/2024, истец Иванов"],
+        },
+    },
+    W2: {
+        "Судья Б": {"Остаток": ["2-100/2024", "2-10/2024, истец Иванов (уточн.)"]},
+    },
+    W4: {
+        "Судья А": {"Остаток": ["2-10/2024, истец Иванов"]},
+    },
+}
+
+POSITION = {week_key: w for w, week_key in enumerate(RAW_DATA)}
+
+
+def make_timeline():
+    return CaseTimeline.from_raw_data(RAW_DATA, WeekIndex(RAW_DATA.keys()))
+
+
+def test_search_exact_first_then_prefix():
+    timeline = make_timeline()
+
+    assert len(timeline) == 3
+    assert timeline.search("2-10/2024") == ["2-10/2024"]
+    assert timeline.search("2-1") == ["2-1/2024", "2-10/2024", "2-100/2024"]
+    assert timeline.search("2-1/2024, истец") == ["2-1/2024"]
+    assert timeline.search("2-1", limit=2) == ["2-1/2024", "2-10/2024"]
+    assert timeline.search("3-") == []
+    assert timeline.search("  ") == []
+
+
+def test_history_by_week_dates():
+    timeline = make_timeline()
+
+    assert timeline.history("2-10/2024") == [
+        (POSITION[W1], "Судья А", "Остаток"),
+        (POSITION[W1], "Судья А", "Поступило"),
+        (POSITION[W2], "Судья Б", "Остаток"),
+        (POSITION[W3], "Судья А", "Остаток"),
+        (POSITION[W4], "Судья А", "Остаток"),
+    ]
+    assert timeline.history("2-999/2024") == []
+
+
+def test_spans_join_consecutive_weeks():
+    timeline = make_timeline()
+
+    spans = [
+        (span.judge, span.category, span.first_week, span.last_week, span.weeks)
+        for span in timeline.spans("2-10/2024")
+    ]
+
+    # у судьи А в остатке — неделя 1, перерыв, недели 3–4
+    assert spans == [
+        ("Судья А", "Остаток", POSITION[W1], POSITION[W1], 1),
+        ("Судья А", "Поступило", POSITION[W1], POSITION[W1], 1),
+        ("Судья Б", "Остаток", POSITION[W2], POSITION[W2], 1),
+        ("Судья А", "Остаток", POSITION[W3], POSITION[W4], 2),
+    ]
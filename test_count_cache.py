@@ -0,0 +1,93 @@
+import pickle
+
+from app.domain.count_cube import CountCube
+from app.repository.count_cache import (
+    cache_path_for,
+    load_count_cache,
+    read_count_cube,
+    source_signature,
+    write_count_cube,
+)
+
+
+RAW_DATA = {
+    "01.01.2024 - 07.01.2024": {
+        "Судья Б": {"Остаток": ["2-1/2024", "2-2/2024"], "Поступило": ["2-3/2024"]},
+        "Судья А": {"Остаток": []},
+    },
+    "08.01.2024 - 14.01.2024": {
+        "Судья А": {"Остаток": ["2-4/2024"], "Поступило": 3, "Рассмотрено": None},
+    },
+}
+
+
+def make_pkl(tmp_path):
+    pkl_path = str(tmp_path / "result4_with_2.pkl")
+    with open(pkl_path, "wb") as f:
+        pickle.dump(RAW_DATA, f)
+    return pkl_path
+
+
+def test_count_cube_from_raw_data():
+    cube = CountCube.from_raw_data(RAW_DATA)
+
+    week_key, judges, matrix = cube.week_matrix(0, ["Остаток", "Поступило", "Нет такой"])
+    assert week_key == "01.01.2024 - 07.01.2024"
+    assert judges == ["Судья Б", "Судья А"]
+    assert matrix.tolist() == [[2, 1, 0], [0, 0, 0]]
+
+    # не списки дел (старые pkl) — не дела
+    _, judges, matrix = cube.week_matrix(1, ["Остаток", "Поступило", "Рассмотрено"])
+    assert judges == ["Судья А"]
+    assert matrix.tolist() == [[1, 0, 0]]
+
+
+def test_write_read_round_trip(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = cache_path_for(pkl_path)
+
+    cube = CountCube.from_raw_data(RAW_DATA)
+    write_count_cube(cube, path, signature)
+
+    loaded = read_count_cube(path, signature)
+    assert loaded.weeks == cube.weeks
+    assert loaded.judges == cube.judges
+    assert loaded.categories == cube.categories
+    assert loaded.counts.tolist() == cube.counts.tolist()
+    assert [loaded.week_judges(w) for w in range(len(loaded))] == [
+        list(week_data) for week_data in RAW_DATA.values()
+    ]
+
+    # временных файлов рядом с .pkl не остаётся
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "result4_with_2.pkl", "result4_with_2.pkl.counts.npz",
+    ]
+
+
+def test_stale_or_broken_cache_is_ignored(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = cache_path_for(pkl_path)
+
+    write_count_cube(CountCube.from_raw_data(RAW_DATA), path, signature)
+    assert read_count_cube(path, (signature[0] + 1, signature[1])) is None
+
+    with open(path, "wb") as f:
+        f.write(b"not a cache")
+    assert read_count_cube(path, signature) is None
+
+
+def test_load_count_cache_reads_pkl_once(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    calls = []
+
+    def load_raw_data():
+        calls.append(1)
+        return RAW_DATA
+
+    first = load_count_cache(pkl_path, load_raw_data)
+    second = load_count_cache(pkl_path, load_raw_data)
+
+    assert len(calls) == 1
+    assert second.counts.tolist() == first.counts.tolist()
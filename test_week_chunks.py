@@ -0,0 +1,89 @@
+import pickle
+
+from app.repository.count_cache import source_signature
+from app.repository.week_chunks import (
+    WeekChunkStore,
+    chunks_path_for,
+    load_week_chunks,
+    read_week_index,
+    write_week_chunks,
+)
+
+
+RAW_DATA = {
+    "01.01.2024 - 07.01.2024": {
+        "Судья А": {"Остаток": ["2-1/2024", "2-2/2024"]},
+    },
+    "08.01.2024 - 14.01.2024": {
+        "Судья Б": {"Остаток": ["2-3/2024"], "Поступило": []},
+    },
+    "15.01.2024 - 21.01.2024": {
+        "Судья А": {"Поступило": ["2-4/2024"]},
+        "Судья Б": {},
+    },
+}
+
+
+def make_pkl(tmp_path):
+    pkl_path = str(tmp_path / "result4_with_2.pkl")
+    with open(pkl_path, "wb") as f:
+        pickle.dump(RAW_DATA, f)
+    return pkl_path
+
+
+def test_write_read_round_trip(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = chunks_path_for(pkl_path)
+
+    write_week_chunks(RAW_DATA, path, signature)
+
+    week_index = read_week_index(path, signature)
+    assert [week_key for week_key, _, _ in week_index] == list(RAW_DATA)
+
+    store = WeekChunkStore(path, week_index)
+    assert list(store.keys()) == list(RAW_DATA)
+    assert {week_key: store[week_key] for week_key in store} == RAW_DATA
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "result4_with_2.pkl", "result4_with_2.pkl.weeks",
+    ]
+
+
+def test_lru_keeps_max_weeks(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = chunks_path_for(pkl_path)
+
+    write_week_chunks(RAW_DATA, path, signature)
+    store = WeekChunkStore(path, read_week_index(path, signature), max_weeks=2)
+
+    for week_key in RAW_DATA:
+        store[week_key]
+
+    assert list(store._loaded) == list(RAW_DATA)[-2:]
+
+
+def test_stale_index_is_ignored(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    signature = source_signature(pkl_path)
+    path = chunks_path_for(pkl_path)
+
+    write_week_chunks(RAW_DATA, path, signature)
+    assert read_week_index(path, (signature[0], signature[1] + 1)) is None
+
+
+def test_load_week_chunks_reads_pkl_once(tmp_path):
+    pkl_path = make_pkl(tmp_path)
+    calls = []
+
+    def load_raw_data():
+        calls.append(1)
+        return RAW_DATA
+
+    load_week_chunks(pkl_path, load_raw_data)
+    store = load_week_chunks(pkl_path, load_raw_data)
+
+    assert len(calls) == 1
+    assert isinstance(store, WeekChunkStore)
+    assert store["08.01.2024 - 14.01.2024"] == RAW_DATA["08.01.2024 - 14.01.2024"]